@@ -0,0 +1,7 @@
+"""
+    Algorithm submodule.
+    Holds the pure python logic of the reorder task.
+
+    Important: Do not import third party modules (pycatia, pywinauto, ...) here.
+    This module must work on its own, so it can be tested without CATIA.
+"""
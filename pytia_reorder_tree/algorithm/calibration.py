@@ -0,0 +1,99 @@
+"""
+    Calibration submodule.
+    Measures how fast the list box reflects selections and clicks.
+"""
+
+from dataclasses import dataclass
+from time import perf_counter
+from time import sleep
+from typing import Callable
+
+from protocols.move_backend_protocol import MoveBackendProtocol
+
+
+@dataclass(slots=True, frozen=True)
+class Latency:
+    """Dataclass for the worst measured latencies in seconds."""
+
+    select: float
+    click: float
+
+
+def measure_latency(
+    backend: MoveBackendProtocol,
+    samples: int = 3,
+    timeout: float = 2.0,
+    poll: float = 0.001,
+) -> Latency | None:
+    """Moves the first row down and up again, and measures the time until the list
+    box shows the selection and the new order. Leaves the list box in its original
+    order.
+
+    Args:
+        backend (MoveBackendProtocol): The backend to measure, its waits must be \
+            disabled.
+        samples (int, optional): The number of down and up moves. Defaults to 3.
+        timeout (float, optional): The maximum time in seconds for a single click. \
+            Defaults to 2.
+        poll (float, optional): The time in seconds between two reads of the list \
+            box. Defaults to 0.001.
+
+    Raises:
+        TimeoutError: Raised when a selection or a click isn't reflected within \
+            the timeout.
+
+    Returns:
+        Latency | None: The worst latencies, None if the list box has less than two \
+            rows.
+    """
+    items = backend.item_texts()
+    if len(items) < 2:
+        return None
+
+    select = click = 0.0
+    for _ in range(samples):
+        for row, down in ((0, True), (1, False)):
+            start = perf_counter()
+            backend.select(row)
+            _wait(
+                lambda row=row: backend.selected_rows() == [row],
+                start,
+                timeout,
+                poll,
+                "selection",
+            )
+            select = max(select, perf_counter() - start)
+
+            start = perf_counter()
+            if down:
+                backend.move_down()
+            else:
+                backend.move_up()
+            target = 1 if down else 0
+            _wait(
+                lambda target=target: backend.item_texts()[target] == items[0],
+                start,
+                timeout,
+                poll,
+                "click",
+            )
+            click = max(click, perf_counter() - start)
+
+    return Latency(select=select, click=click)
+
+
+def _wait(
+    shown: Callable[[], bool], start: float, timeout: float, poll: float, action: str
+) -> None:
+    """Polls the list box until it shows the result of the action.
+
+    Raises:
+        TimeoutError: Raised when the list box doesn't show the result within the \
+            timeout.
+    """
+    while not shown():
+        if perf_counter() - start > timeout:
+            raise TimeoutError(
+                f"The list box didn't reflect a {action} within {timeout}s."
+            )
+        sleep(poll)
@@ -0,0 +1,137 @@
+"""
+    Collation submodule.
+    Turns text values into keys for a natural or locale aware sort order.
+"""
+
+import locale
+import re
+import threading
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Tuple
+
+COLLATION_PLAIN = "plain"
+COLLATION_NATURAL = "natural"
+COLLATION_LOCALE = "locale"
+COLLATION_NATURAL_LOCALE = "natural_locale"
+COLLATIONS = (
+    COLLATION_PLAIN,
+    COLLATION_NATURAL,
+    COLLATION_LOCALE,
+    COLLATION_NATURAL_LOCALE,
+)
+
+NUMBERS = re.compile(r"(\d+)")
+
+_LOCALE_LOCK = threading.Lock()
+_collation_locale: str | None = None
+
+
+def set_collation_locale(locale_name: str | None = None) -> None:
+    """Sets the collation locale of the process. The locale is process-wide state,
+    which also affects the GUI and all threads, so it's set once at startup,
+    before any thread reads collation keys, and never per sort.
+
+    Args:
+        locale_name (str | None, optional): The locale, e.g. `de_DE.UTF-8` or \
+            `German_Germany.1252`. Uses the locale of the user if None. Defaults to \
+            None.
+
+    Raises:
+        ValueError: Raised when the locale is invalid, or another locale has \
+            already been set.
+    """
+    global _collation_locale  # pylint: disable=W0603
+    name = locale_name or ""
+    with _LOCALE_LOCK:
+        if _collation_locale == name:
+            return
+        if _collation_locale is not None:
+            raise ValueError(
+                f"The collation locale is already set to {_collation_locale!r}, "
+                f"the locale {locale_name!r} requires a restart of the app."
+            )
+        try:
+            locale.setlocale(locale.LC_COLLATE, name)
+        except locale.Error as e:
+            raise ValueError(f"The locale {locale_name!r} is not available.") from e
+        _collation_locale = name
+
+
+class Collator:
+    """
+    Computes the collation key of text values. The key of each value is computed
+    once and cached, because the same part numbers and property values appear many
+    times in a large assembly.
+
+    - plain: Code point order, the value itself is the key.
+    - natural: Numbers within the text are compared by their value (P-9 < P-10).
+    - locale: Text is compared by the rules of the locale (e.g. German umlauts).
+    - natural_locale: Both of the above.
+    """
+
+    def __init__(self, mode: str = COLLATION_PLAIN, locale_name: str | None = None):
+        """Inits the class.
+
+        Args:
+            mode (str, optional): The collation mode. Defaults to `plain`.
+            locale_name (str | None, optional): The locale for the locale aware \
+                modes, e.g. `de_DE.UTF-8` or `German_Germany.1252`. Uses the locale \
+                of the user if None. Must be the locale set at startup with \
+                `set_collation_locale`, which is done here if none has been set. \
+                Defaults to None.
+
+        Raises:
+            ValueError: Raised when the mode or the locale is invalid.
+        """
+        if mode not in COLLATIONS:
+            raise ValueError(
+                f"Unknown collation {mode!r}, must be one of {COLLATIONS}."
+            )
+        self._mode = mode
+        self._cache: Dict[str, Any] = {}
+
+        transform: Callable[[str], str] = str
+        if mode in (COLLATION_LOCALE, COLLATION_NATURAL_LOCALE):
+            set_collation_locale(locale_name)
+            transform = locale.strxfrm
+
+        if mode in (COLLATION_NATURAL, COLLATION_NATURAL_LOCALE):
+            self._compute = lambda value: (_natural(value, transform), value)
+        elif mode == COLLATION_LOCALE:
+            self._compute = lambda value: (transform(value), value)
+        else:
+            self._compute = None
+
+    @property
+    def mode(self) -> str:
+        """Returns the collation mode."""
+        return self._mode
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def key(self, value: str) -> Any:
+        """Returns the collation key of the value.
+
+        Args:
+            value (str): The text.
+
+        Returns:
+            Any: The key. Keys of the same collator can be compared with each other.
+        """
+        if self._compute is None:
+            return value
+        if (key := self._cache.get(value)) is None:
+            key = self._cache[value] = self._compute(value)
+        return key
+
+
+def _natural(value: str, transform: Callable[[str], str]) -> Tuple[Any, ...]:
+    """Splits the text into text and number parts. Text parts are at even, numbers
+    at odd positions, so the parts of two keys are always of the same type."""
+    parts = NUMBERS.split(value)
+    return tuple(
+        int(part) if index % 2 else transform(part) for index, part in enumerate(parts)
+    )
@@ -0,0 +1,108 @@
+"""
+    Cost model submodule.
+    Estimates the duration of the reorder engines, to choose the fastest one.
+"""
+
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Callable
+from typing import List
+from typing import Sequence
+
+from algorithm.planner import MovePlan
+from algorithm.planner import plan_block_moves
+from algorithm.planner import plan_moves
+from algorithm.planner import readded_rows
+from algorithm.planner import stable_prefix
+from const import COST_API_COMPONENT
+from const import COST_CLICK
+from const import COST_SELECT
+from const import COST_WINDOW_CONNECT
+
+ENGINE_AUTO = "auto"
+ENGINE_WINDOW = "window"
+ENGINE_API = "api"
+ENGINES = (ENGINE_AUTO, ENGINE_WINDOW, ENGINE_API)
+
+
+@dataclass(slots=True, frozen=True)
+class EngineCost:
+    """Dataclass for the estimated cost of a reorder engine. The cost of the window
+    engine keeps its plan, so the moves aren't planned twice."""
+
+    engine: str
+    operations: int
+    seconds: float
+    plan: MovePlan | None = field(default=None, repr=False, compare=False)
+
+    def __str__(self) -> str:
+        return f"{self.engine} ({self.operations} operations, ~{self.seconds:.1f}s)"
+
+
+def window_cost(
+    order: Sequence[int],
+    block_moves: bool = True,
+    click: float = COST_CLICK,
+    select: float = COST_SELECT,
+    connect: float = COST_WINDOW_CONNECT,
+) -> EngineCost:
+    """Estimates the cost of the reorder window.
+
+    Args:
+        order (Sequence[int]): The target index of each item in tree order.
+        block_moves (bool, optional): Wether contiguous rows are moved at once. \
+            Defaults to True.
+        click (float, optional): The seconds per click. Defaults to COST_CLICK.
+        select (float, optional): The seconds per selection. Defaults to \
+            COST_SELECT.
+        connect (float, optional): The seconds to open and close the window. \
+            Defaults to COST_WINDOW_CONNECT.
+
+    Returns:
+        EngineCost: The estimated cost, operations are the clicks. Keeps the plan \
+            of the moves.
+    """
+    plan = plan_block_moves(order) if block_moves else plan_moves(order)
+    return EngineCost(
+        engine=ENGINE_WINDOW,
+        operations=plan.clicks,
+        seconds=connect + plan.clicks * click + len(plan.moves) * select,
+        plan=plan,
+    )
+
+
+def api_cost(order: Sequence[int], component: float = COST_API_COMPONENT) -> EngineCost:
+    """Estimates the cost of the API engine, which re-adds all components behind
+    the stable prefix.
+
+    Args:
+        order (Sequence[int]): The target index of each item in tree order.
+        component (float, optional): The seconds to re-add a single component. \
+            Defaults to COST_API_COMPONENT.
+
+    Returns:
+        EngineCost: The estimated cost, operations are the re-added components.
+    """
+    count = len(order) - stable_prefix(order)
+    return EngineCost(engine=ENGINE_API, operations=count, seconds=count * component)
+
+
+def api_conflicts(order: Sequence[int], pinned: Callable[[int], bool]) -> List[int]:
+    """Returns the rows of the pinned items, which the API engine would re-add. A
+    re-added component is a new instance, which loses the data of the old instance
+    (e.g. the BOM exclusion of a group identifier).
+
+    Args:
+        order (Sequence[int]): The target index of the item in each row.
+        pinned (Callable[[int], bool]): Returns wether the item in the row must \
+            keep its instance. Only called for the re-added rows.
+
+    Returns:
+        List[int]: The rows of the pinned items that would be re-added.
+    """
+    return [row for row in readded_rows(order) if pinned(row)]
+
+
+def choose_engine(*costs: EngineCost) -> EngineCost:
+    """Returns the cheapest engine. The first one wins a tie."""
+    return min(costs, key=lambda cost: cost.seconds)
@@ -0,0 +1,93 @@
+"""
+    Insertion submodule.
+    Plans the target order of a few selected nodes in an otherwise sorted tree,
+    without computing the sort key of every node.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+from typing import Callable
+from typing import Collection
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+
+@dataclass(slots=True, frozen=True)
+class InsertionPlan:
+    """Dataclass for the target order of the selected nodes."""
+
+    order: List[int]
+    window: range
+    keys: int
+
+    @property
+    def affected(self) -> int:
+        """Returns the number of rows in the affected window."""
+        return len(self.window)
+
+
+def plan_insertion(
+    count: int, selected: Collection[int], key: Callable[[int], Any]
+) -> InsertionPlan:
+    """Plans the target order, if only the selected nodes are out of place.
+
+    The nodes that are not selected are expected to be sorted already. Each selected
+    node is inserted between them with a binary search, so only the keys of the
+    selected nodes and their probed neighbours are computed. Ties are broken by the
+    tree index, which gives the same result as a stable sort of all nodes.
+
+    Args:
+        count (int): The number of nodes.
+        selected (Collection[int]): The tree indices of the selected nodes.
+        key (Callable[[int], Any]): Returns the sort key of the node at the given \
+            tree index. Called at most once per node.
+
+    Raises:
+        ValueError: Raised when the probed nodes that are not selected are out of \
+            order, which means the tree isn't sorted outside the selection.
+
+    Returns:
+        InsertionPlan: The target index of each node in tree order, the rows that \
+            change, and the number of computed keys.
+    """
+    keys: Dict[int, Tuple[Any, int]] = {}
+
+    def _key(index: int) -> Tuple[Any, int]:
+        if index not in keys:
+            keys[index] = (key(index), index)
+        return keys[index]
+
+    chosen = set(selected)
+    others = [index for index in range(count) if index not in chosen]
+    positions: Dict[int, List[int]] = {}
+
+    # The selected nodes are inserted in ascending order, so each search starts at
+    # the position of the previous one.
+    low = 0
+    for index in sorted(chosen, key=_key):
+        high = len(others)
+        while low < high:
+            middle = (low + high) // 2
+            if _key(others[middle]) < _key(index):
+                low = middle + 1
+            else:
+                high = middle
+        positions.setdefault(low, []).append(index)
+
+    probed = [_key(index) for index in others if index in keys]
+    if any(a >= b for a, b in zip(probed, probed[1:])):
+        raise ValueError("The nodes outside the selection are not sorted.")
+
+    target: List[int] = []
+    for position, index in enumerate(others):
+        target += positions.get(position, [])
+        target.append(index)
+    target += positions.get(len(others), [])
+
+    order = [0] * count
+    for target_index, index in enumerate(target):
+        order[index] = target_index
+    changed = [index for index in range(count) if order[index] != index]
+    window = range(changed[0], changed[-1] + 1) if changed else range(0)
+    return InsertionPlan(order=order, window=window, keys=len(keys))
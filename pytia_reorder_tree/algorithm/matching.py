@@ -0,0 +1,169 @@
+"""
+    Matching submodule.
+    Assigns the nodes of the product to the rows of the reorder list box.
+"""
+
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Callable
+from typing import Dict
+from typing import Hashable
+from typing import List
+from typing import Sequence
+
+RowKey = Callable[[str], Hashable | None]
+
+
+@dataclass(slots=True, kw_only=True)
+class MatchResult:
+    """Dataclass for the result of the matching of nodes and list box rows."""
+
+    rows: List[int | None]
+    missing: List[Hashable] = field(default_factory=list)
+    duplicates: Dict[Hashable, List[int]] = field(default_factory=dict)
+    ambiguous: Dict[Hashable, List[int]] = field(default_factory=dict)
+    unassigned: List[int] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """Returns wether every node has exactly one row and every row a node."""
+        return not (
+            self.missing or self.duplicates or self.ambiguous or self.unassigned
+        )
+
+    def describe(self, texts: Sequence[str], limit: int = 5) -> str:
+        """Returns a readable description of all matching errors.
+
+        Args:
+            texts (Sequence[str]): The rows of the list box.
+            limit (int, optional): Max number of examples per error. Defaults to 5.
+
+        Returns:
+            str: The description, one error per line.
+        """
+
+        def _names(values: Sequence[Hashable]) -> str:
+            names = ", ".join(repr(v) for v in values[:limit])
+            return names + (
+                f" and {len(values) - limit} more" if len(values) > limit else ""
+            )
+
+        messages: List[str] = []
+        if self.missing:
+            messages.append(f"No row found for {_names(self.missing)}.")
+        if self.duplicates:
+            messages.append(
+                "Instance name shared by multiple rows: "
+                f"{_names([f'{k} (rows {v})' for k, v in self.duplicates.items()])}."
+            )
+        if self.ambiguous:
+            messages.append(
+                "Instance name found in multiple rows: "
+                f"{_names([f'{k} (rows {v})' for k, v in self.ambiguous.items()])}."
+            )
+        if self.unassigned:
+            messages.append(
+                f"No node found for row {_names([texts[r] for r in self.unassigned])}."
+            )
+        return "\n".join(messages)
+
+
+def delimiter_key(delimiter: str, position: int) -> RowKey:
+    """Returns a function that reads the instance name from a row of the list box.
+
+    Args:
+        delimiter (str): The delimiter that separates the fields of the row.
+        position (int): The position of the instance name.
+
+    Returns:
+        RowKey: The function. Returns None for rows with too few fields.
+    """
+
+    def _key(text: str) -> str | None:
+        fields = text.split(delimiter)
+        return fields[position] if -len(fields) <= position < len(fields) else None
+
+    return _key
+
+
+def match_items(
+    names: Sequence[Hashable], texts: Sequence[str], key: RowKey | None
+) -> MatchResult:
+    """Assigns every node to the row of the list box that shows it.
+
+    All rows are parsed once into an index (row key -> row), so the matching is
+    linear in the number of rows. A node is identified by its instance name, or by a
+    tuple of fields (e.g. instance name and part number), and the key function must
+    return the same from the row. Without a key function the whole row must equal
+    the instance name. Names without an exact match are searched as substring
+    in the remaining rows, which must be unique. This fallback is quadratic, but
+    only for the names without an exact match.
+
+    Args:
+        names (Sequence[Hashable]): The identifiers of the nodes.
+        texts (Sequence[str]): The rows of the list box.
+        key (RowKey | None): The function that reads the identifier from a row.
+
+    Returns:
+        MatchResult: The row for every name (in the order of the names) and all \
+            errors found.
+    """
+    index: Dict[Hashable, int] = {}
+    duplicates: Dict[Hashable, List[int]] = {}
+    for row, text in enumerate(texts):
+        row_key = key(text) if key else text
+        if row_key is None:
+            continue
+        if row_key in index:
+            duplicates.setdefault(row_key, [index[row_key]]).append(row)
+        else:
+            index[row_key] = row
+
+    known = set(names)
+    result = MatchResult(rows=[None] * len(names))
+    result.duplicates = {k: v for k, v in duplicates.items() if k in known}
+    assigned: set[int] = set()
+    unresolved: List[int] = []
+    for name_index, name in enumerate(names):
+        if name in duplicates:
+            continue
+        if (row := index.get(name)) is not None and row not in assigned:
+            result.rows[name_index] = row
+            assigned.add(row)
+        else:
+            unresolved.append(name_index)
+
+    if key is None and unresolved:
+        # Rows claimed by a unique match are no candidates for other names, so
+        # repeat until no more names can be resolved.
+        remaining = {row for row in range(len(texts)) if row not in assigned}
+        candidates: Dict[int, List[int]] = {}
+        while unresolved:
+            candidates = {
+                i: [row for row in sorted(remaining) if str(names[i]) in texts[row]]
+                for i in unresolved
+            }
+            resolved = [i for i, rows in candidates.items() if len(rows) == 1]
+            if not resolved:
+                break
+            for name_index in resolved:
+                row = candidates[name_index][0]
+                if row in remaining:
+                    result.rows[name_index] = row
+                    assigned.add(row)
+                    remaining.discard(row)
+                    unresolved.remove(name_index)
+
+        for name_index in list(unresolved):
+            if len(candidates.get(name_index, [])) > 1:
+                result.ambiguous[names[name_index]] = candidates[name_index]
+                unresolved.remove(name_index)
+
+    result.missing = [names[i] for i in unresolved]
+    result.unassigned = [row for row in range(len(texts)) if row not in assigned]
+    if result.duplicates or result.ambiguous:
+        # Rows of duplicate or ambiguous names are reported there, not as unassigned.
+        reported = {r for rows in result.duplicates.values() for r in rows}
+        reported.update(r for rows in result.ambiguous.values() for r in rows)
+        result.unassigned = [row for row in result.unassigned if row not in reported]
+    return result
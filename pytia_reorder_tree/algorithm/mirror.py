@@ -0,0 +1,127 @@
+"""
+    Mirror submodule.
+    Local model of the rows of the reorder list box.
+"""
+
+from typing import Dict
+from typing import List
+from typing import Sequence
+
+
+class ListBoxMirror:
+    """
+    Keeps a copy of the list box rows in memory, so that the rows don't have to be
+    read from the window for every move. Must be updated after every click.
+    """
+
+    def __init__(self, items: Sequence[str]) -> None:
+        """Inits the class.
+
+        Args:
+            items (Sequence[str]): The rows of the list box, as read from the window.
+        """
+        self._items: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self.reset(items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def items(self) -> List[str]:
+        """Returns a copy of the rows."""
+        return list(self._items)
+
+    def reset(self, items: Sequence[str]) -> None:
+        """Replaces all rows, e.g. with the rows read from the window.
+
+        Args:
+            items (Sequence[str]): The new rows.
+
+        Raises:
+            ValueError: Raised when the rows are not unique.
+        """
+        rows = {item: row for row, item in enumerate(items)}
+        if len(rows) != len(items):
+            raise ValueError("The rows of the list box are not unique.")
+        self._items = list(items)
+        self._rows = rows
+
+    def row(self, item: str) -> int:
+        """Returns the row of the item.
+
+        Args:
+            item (str): The text of the row.
+
+        Returns:
+            int: The index of the row.
+        """
+        return self._rows[item]
+
+    def item(self, row: int) -> str:
+        """Returns the text of the row.
+
+        Args:
+            row (int): The index of the row.
+
+        Returns:
+            str: The text of the row.
+        """
+        return self._items[row]
+
+    def move_up(self, row: int, count: int = 1) -> int:
+        """Applies one click on the `move up` button to the selected rows.
+
+        Args:
+            row (int): The first selected row.
+            count (int, optional): The number of selected rows. Defaults to 1.
+
+        Returns:
+            int: The first row of the selection after the click.
+        """
+        if row > 0:
+            self._rotate(start=row - 1, end=row + count, up=True)
+            return row - 1
+        return row
+
+    def move_down(self, row: int, count: int = 1) -> int:
+        """Applies one click on the `move down` button to the selected rows.
+
+        Args:
+            row (int): The first selected row.
+            count (int, optional): The number of selected rows. Defaults to 1.
+
+        Returns:
+            int: The first row of the selection after the click.
+        """
+        if row + count < len(self._items):
+            self._rotate(start=row, end=row + count + 1, up=False)
+            return row + 1
+        return row
+
+    def mismatches(self, items: Sequence[str]) -> List[int]:
+        """Compares the mirror with the rows read from the window.
+
+        Args:
+            items (Sequence[str]): The rows read from the window.
+
+        Returns:
+            List[int]: All rows that differ. Empty if the mirror is in sync.
+        """
+        if len(items) != len(self._items):
+            return list(range(max(len(items), len(self._items))))
+        return [
+            row
+            for row, (mirrored, actual) in enumerate(zip(self._items, items))
+            if mirrored != actual
+        ]
+
+    def _rotate(self, start: int, end: int, up: bool) -> None:
+        """Rotates the rows between start and end (exclusive) by one."""
+        items = self._items
+        if up:
+            items.insert(end - 1, items.pop(start))
+        else:
+            items.insert(start, items.pop(end - 1))
+        for row in range(start, end):
+            self._rows[items[row]] = row
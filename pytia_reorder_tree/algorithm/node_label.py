@@ -0,0 +1,116 @@
+"""
+    Node label submodule.
+    Parses the rows of the reorder list box by the node label template of CATIA.
+"""
+
+import re
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Sequence
+from typing import Tuple
+
+FIELD_PATTERN = re.compile(r"#([A-Z]+)#")
+
+FIELD_INSTANCE_NAME = "IN"
+FIELD_PART_NUMBER = "PN"
+FIELD_SOURCE = "SO"
+
+
+class NodeLabelTemplate:
+    """
+    Compiled node label template, e.g. `#PN# | #IN# | #SO#`, as set in the
+    Infrastructure/Product Structure/Nodes options of CATIA.
+    """
+
+    def __init__(self, template: str) -> None:
+        """Inits the class. Compiles the template into a regular expression.
+
+        Args:
+            template (str): The node label template.
+
+        Raises:
+            ValueError: Raised when the template has no field, or a field twice.
+        """
+        self._template = template
+        self._fields: Tuple[str, ...] = tuple(FIELD_PATTERN.findall(template))
+        if not self._fields:
+            raise ValueError(f"The node label template {template!r} has no field.")
+        if len(set(self._fields)) != len(self._fields):
+            raise ValueError(
+                f"The node label template {template!r} has duplicate fields."
+            )
+
+        literals = FIELD_PATTERN.split(template)[::2]
+        pattern = re.escape(literals[0])
+        for index, name in enumerate(self._fields):
+            # The last field takes the rest of the row, all others stop at the
+            # next separator.
+            value = ".*" if index == len(self._fields) - 1 else ".*?"
+            pattern += f"(?P<{name}>{value})" + re.escape(literals[index + 1])
+        self._pattern = re.compile(pattern, re.DOTALL)
+
+    @property
+    def template(self) -> str:
+        """Returns the template string."""
+        return self._template
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        """Returns the names of all fields in the order of the template."""
+        return self._fields
+
+    def parse(self, text: str) -> Dict[str, str] | None:
+        """Parses a single row of the list box.
+
+        Args:
+            text (str): The row.
+
+        Returns:
+            Dict[str, str] | None: The value of each field. None if the row doesn't \
+                match the template.
+        """
+        match = self._pattern.fullmatch(text)
+        return match.groupdict() if match else None
+
+    def parse_all(
+        self, texts: Sequence[str], fields: Sequence[str]
+    ) -> List[Tuple[str, ...] | None]:
+        """Parses all rows of the list box in one pass.
+
+        Args:
+            texts (Sequence[str]): The rows.
+            fields (Sequence[str]): The fields to return for each row.
+
+        Returns:
+            List[Tuple[str, ...] | None]: The values of the requested fields for each \
+                row. None for rows that don't match the template.
+        """
+        row_key = self.row_key(fields)
+        return [row_key(text) for text in texts]
+
+    def row_key(self, fields: Sequence[str]) -> Callable[[str], Tuple[str, ...] | None]:
+        """Returns a function that reads the given fields from a row.
+
+        Args:
+            fields (Sequence[str]): The fields to read.
+
+        Raises:
+            ValueError: Raised when a field is not part of the template.
+
+        Returns:
+            Callable[[str], Tuple[str, ...] | None]: The function. Returns None for \
+                rows that don't match the template.
+        """
+        if missing := [f for f in fields if f not in self._fields]:
+            raise ValueError(
+                f"The node label template {self._template!r} has no field {missing}."
+            )
+        fullmatch = self._pattern.fullmatch
+        names = tuple(fields)
+
+        def _key(text: str) -> Tuple[str, ...] | None:
+            match = fullmatch(text)
+            return tuple(match.group(name) for name in names) if match else None
+
+        return _key
@@ -0,0 +1,140 @@
+"""
+    Plan submodule.
+    Builds the plan of a dry run: What a run would do, without doing it.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Mapping
+from typing import Sequence
+from typing import Tuple
+
+from algorithm.cost_model import EngineCost
+from algorithm.planner import MovePlan
+from algorithm.renumbering import instance_names
+
+
+@dataclass(slots=True, kw_only=True, frozen=True)
+class PlanNode:
+    """Dataclass for a node of the tree, as seen by the dry run."""
+
+    name: str
+    part_number: str
+    source: int | None
+    properties: Mapping[str, str] = field(default_factory=dict)
+    identifier: bool = False
+    virtual: bool = False
+
+
+def build_plan(
+    nodes: Sequence[PlanNode],
+    order: Sequence[int],
+    moves: MovePlan,
+    costs: Sequence[EngineCost],
+    engine: str,
+    removed: Sequence[str] = (),
+    renamed: Sequence[Tuple[str, str]] = (),
+    renumber: bool = True,
+    start_index: int = 1,
+) -> Dict[str, Any]:
+    """Builds the plan of a dry run.
+
+    Args:
+        nodes (Sequence[PlanNode]): All nodes in tree order, after the groups have \
+            been created (virtual nodes are created at the end of the tree).
+        order (Sequence[int]): The target index of each node.
+        moves (MovePlan): The planned moves of the reorder window.
+        costs (Sequence[EngineCost]): The estimated cost of each engine.
+        engine (str): The engine that would be used.
+        removed (Sequence[str], optional): The names of the group identifiers that \
+            would be removed. Defaults to ().
+        renamed (Sequence[Tuple[str, str]], optional): The name and the new name of \
+            the group identifiers that would be renamed. Defaults to ().
+        renumber (bool, optional): Wether the nodes would be renumbered. Defaults \
+            to True.
+        start_index (int, optional): The start index of the renumbering. Defaults \
+            to 1.
+
+    Raises:
+        ValueError: Raised when there's no cost for the engine.
+
+    Returns:
+        Dict[str, Any]: The plan, ready to be written as JSON.
+    """
+    target: List[PlanNode] = [None] * len(nodes)  # type: ignore
+    for index, position in enumerate(order):
+        target[position] = nodes[index]
+
+    renames: List[Dict[str, str]] = []
+    if renumber:
+        names = instance_names(
+            part_numbers=[node.part_number for node in target],
+            skip=[node.identifier for node in target],
+            start_index=start_index,
+        )
+        renames = [
+            {"name": node.name, "new_name": name}
+            for node, name in zip(target, names)
+            if name is not None and name != node.name
+        ]
+
+    chosen = next((cost for cost in costs if cost.engine == engine), None)
+    if chosen is None:
+        raise ValueError(f"No cost has been estimated for the engine {engine!r}.")
+    return {
+        "groups": {
+            "remove": list(removed),
+            "create": [node.name for node in nodes if node.virtual],
+            "rename": [{"name": name, "new_name": new} for name, new in renamed],
+        },
+        "target_order": [
+            {
+                "name": node.name,
+                "part_number": node.part_number,
+                "source": node.source,
+                "group_identifier": node.identifier,
+            }
+            for node in target
+        ],
+        "moves": [
+            {
+                "name": target[move.item].name,
+                "source": move.source,
+                "target": move.target,
+                "count": move.count,
+            }
+            for move in moves.moves
+        ],
+        "clicks": moves.clicks,
+        "stable": moves.stable,
+        "renames": renames,
+        "engines": [
+            {
+                "engine": cost.engine,
+                "operations": cost.operations,
+                "seconds": round(cost.seconds, 1),
+            }
+            for cost in costs
+        ],
+        "engine": engine,
+        "estimated_seconds": round(chosen.seconds, 1),
+    }
+
+
+def write_plan(plan: Mapping[str, Any], path: Path) -> None:
+    """Writes the plan as JSON file. Keys are written in a stable order, so plans of
+    two revisions can be compared with a diff.
+
+    Args:
+        plan (Mapping[str, Any]): The plan.
+        path (Path): The path of the JSON file.
+    """
+    os.makedirs(path.parent, exist_ok=True)
+    with open(path, "w", encoding="utf8") as f:
+        json.dump(plan, f, indent=2)
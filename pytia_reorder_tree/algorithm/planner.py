@@ -0,0 +1,402 @@
+"""
+    Planner submodule.
+    Computes the moves that bring the rows of the reorder list box into the target
+    order with as few button clicks as possible.
+"""
+
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import List
+from typing import Sequence
+from typing import Tuple
+
+
+@dataclass(slots=True, frozen=True)
+class Move:
+    """
+    Dataclass for a move in the reorder list box. A move shifts a block of `count`
+    rows, that starts with the target index `item`, from the row `source` to the
+    row `target`.
+    """
+
+    item: int
+    source: int
+    target: int
+    count: int = 1
+
+    @property
+    def clicks(self) -> int:
+        """Returns the number of up or down clicks required for this move."""
+        return abs(self.source - self.target)
+
+    @property
+    def up(self) -> bool:
+        """Returns wether the move is done with the `move up` button."""
+        return self.target < self.source
+
+    def expand(self) -> List["Move"]:
+        """Splits a block move into single row moves, for list boxes that don't
+        allow to select multiple rows.
+
+        Returns:
+            List[Move]: The single row moves. Same result, but `count` times the \
+                clicks of the block move.
+        """
+        offsets = range(self.count) if self.up else reversed(range(self.count))
+        return [
+            Move(
+                item=self.item + offset,
+                source=self.source + offset,
+                target=self.target + offset,
+            )
+            for offset in offsets
+        ]
+
+
+@dataclass(slots=True, frozen=True)
+class MovePlan:
+    """Dataclass for all moves required to reorder the list box. `blocks` tells
+    wether the moves have been planned as block moves."""
+
+    moves: List[Move]
+    stable: int
+    blocks: bool = False
+
+    @property
+    def clicks(self) -> int:
+        """Returns the predicted number of clicks of the plan."""
+        return sum(move.clicks for move in self.moves)
+
+    def expand(self) -> "MovePlan":
+        """Returns the same plan with all block moves split into single row moves."""
+        return MovePlan(
+            moves=[single for move in self.moves for single in move.expand()],
+            stable=self.stable,
+        )
+
+
+def longest_increasing_subsequence(values: Sequence[int]) -> List[int]:
+    """Returns the positions of one longest strictly increasing subsequence.
+
+    Args:
+        values (Sequence[int]): The values to analyze.
+
+    Returns:
+        List[int]: The positions (not the values) of the subsequence, ascending.
+    """
+    tails: List[int] = []
+    tail_positions: List[int] = []
+    predecessors: List[int] = [-1] * len(values)
+
+    for position, value in enumerate(values):
+        index = bisect_left(tails, value)
+        if index > 0:
+            predecessors[position] = tail_positions[index - 1]
+        if index == len(tails):
+            tails.append(value)
+            tail_positions.append(position)
+        else:
+            tails[index] = value
+            tail_positions[index] = position
+
+    result: List[int] = []
+    position = tail_positions[-1] if tail_positions else -1
+    while position != -1:
+        result.append(position)
+        position = predecessors[position]
+    result.reverse()
+    return result
+
+
+def plan_block_moves(order: Sequence[int]) -> MovePlan:
+    """Plans the moves for the reorder list box, moving runs of rows as one block.
+
+    Rows that are adjacent and already in the correct order relative to each other
+    (consecutive target indices) form a block. The blocks are planned like single
+    rows with `plan_moves`. A block of k rows that is moved by d rows costs d
+    clicks instead of k * d, if the list box allows to select multiple rows.
+
+    Args:
+        order (Sequence[int]): The target index of the item in each row of the list \
+            box. Must be a permutation of `range(len(order))`.
+
+    Returns:
+        MovePlan: The planned block moves.
+    """
+    _validate(order)
+
+    starts = [
+        row for row in range(len(order)) if row == 0 or order[row] != order[row - 1] + 1
+    ]
+    sizes = {
+        order[start]: end - start
+        for start, end in zip(starts, starts[1:] + [len(order)])
+    }
+    firsts = sorted(sizes)
+    unit_of = {first: unit for unit, first in enumerate(firsts)}
+
+    units = [unit_of[order[start]] for start in starts]
+    moves = [
+        Move(item=firsts[unit], source=source, target=target, count=sizes[firsts[unit]])
+        for unit, source, target in _plan(units, [sizes[first] for first in firsts])
+    ]
+    return MovePlan(
+        moves=moves, stable=len(order) - sum(move.count for move in moves), blocks=True
+    )
+
+
+def plan_moves(order: Sequence[int]) -> MovePlan:
+    """Plans the moves for the reorder list box.
+
+    The rows that form the longest increasing subsequence of the target indices
+    stay where they are, every other row is moved exactly once. Each row is moved
+    to the nearest position between its already placed neighbours, so every move
+    takes the shorter direction.
+
+    Rows are placed in ascending target order first and in descending target order
+    afterwards. A row is only moved in a pass if it passes rows that are in the
+    wrong order relative to it. This way no pair of rows is swapped twice and the
+    number of clicks equals the number of inversions, which is the minimum for
+    single step moves. Rows left over after both passes (if any) are placed without
+    this restriction.
+
+    Args:
+        order (Sequence[int]): The target index of the item in each row of the list \
+            box. Must be a permutation of `range(len(order))`.
+
+    Returns:
+        MovePlan: The planned moves. Rows of each move refer to the state of the \
+            list box right before that move is done.
+    """
+    _validate(order)
+    moves = [
+        Move(item=item, source=source, target=target)
+        for item, source, target in _plan(order, [1] * len(order))
+    ]
+    return MovePlan(moves=moves, stable=len(order) - len(moves))
+
+
+def stable_prefix(order: Sequence[int]) -> int:
+    """Returns how many items of the target order can stay, if all other items are
+    removed and appended at the end in target order (like re-adding components to
+    a product). These are the items `0..k-1`, if their rows are ascending.
+
+    Args:
+        order (Sequence[int]): The target index of the item in each row. Must be a \
+            permutation of `range(len(order))`.
+
+    Returns:
+        int: The number of items that can stay.
+    """
+    _validate(order)
+    rows = [0] * len(order)
+    for row, item in enumerate(order):
+        rows[item] = row
+
+    count = min(len(order), 1)
+    while count < len(order) and rows[count] > rows[count - 1]:
+        count += 1
+    return count
+
+
+def readded_rows(order: Sequence[int]) -> List[int]:
+    """Returns the rows of the items behind the stable prefix, which are removed
+    and appended at the end, in target order.
+
+    Args:
+        order (Sequence[int]): The target index of the item in each row. Must be a \
+            permutation of `range(len(order))`.
+
+    Returns:
+        List[int]: The rows of the re-added items, sorted by their target index.
+    """
+    keep = stable_prefix(order)
+    return sorted(
+        (row for row, target in enumerate(order) if target >= keep),
+        key=order.__getitem__,
+    )
+
+
+def _validate(order: Sequence[int]) -> None:
+    """Raises a ValueError if the order isn't a permutation of all row indices."""
+    if sorted(order) != list(range(len(order))):
+        raise ValueError("The order must be a permutation of all row indices.")
+
+
+def _plan(order: Sequence[int], weights: Sequence[int]) -> List[Tuple[int, int, int]]:
+    """Plans the moves of `plan_moves`, for items that span `weights[item]` rows.
+
+    Every placed item is next to a placed neighbour, or at its initial row. Hence
+    the list box always consists of the unplaced items in their initial order, and
+    the placed items in target order, which are anchored to the initial row of the
+    item they are next to. The row of an item is counted from the items that are
+    before its initial row or anchor, without searching the list box.
+
+    Args:
+        order (Sequence[int]): The target index of the item in each row.
+        weights (Sequence[int]): The number of rows of each item.
+
+    Returns:
+        List[Tuple[int, int, int]]: The item, the source row and the target row of \
+            each move.
+    """
+    count = len(order)
+    initial = [0] * count
+    for row, item in enumerate(order):
+        initial[item] = row
+
+    placed = sorted(order[row] for row in longest_increasing_subsequence(order))
+    anchors = [-1] * count
+    unplaced_rows = _Fenwick(count)
+    placed_items = _Fenwick(count)
+    placed_anchors = _Fenwick(count)
+    extremes = _Extremes(list(order))
+    for item in placed:
+        anchors[item] = initial[item]
+        placed_items.add(item, weights[item])
+        placed_anchors.add(initial[item], weights[item])
+        extremes.clear(initial[item])
+    pending = sorted(set(order).difference(placed))
+    for item in pending:
+        unplaced_rows.add(initial[item], weights[item])
+
+    def placed_row(item: int) -> int:
+        return unplaced_rows.prefix(anchors[item]) + placed_items.prefix(item)
+
+    moves: List[Tuple[int, int, int]] = []
+    for strict, descending in ((True, False), (True, True), (False, False)):
+        deferred: List[int] = []
+        for item in reversed(pending) if descending else pending:
+            row = initial[item]
+            index = bisect_left(placed, item)
+            source = unplaced_rows.prefix(row) + placed_anchors.prefix(row)
+            lower = placed[index - 1] if index > 0 else None
+            upper = placed[index] if index < len(placed) else None
+
+            if lower is not None and source < (lower_row := placed_row(lower)):
+                # Passes the unplaced items between the item and its lower neighbour.
+                if strict and extremes.largest(row + 1, anchors[lower]) > item:
+                    deferred.append(item)
+                    continue
+                target = lower_row + weights[lower] - weights[item]
+                anchor = anchors[lower]
+            elif upper is not None and source > (upper_row := placed_row(upper)):
+                if strict and extremes.smallest(anchors[upper] + 1, row) < item:
+                    deferred.append(item)
+                    continue
+                target = upper_row
+                anchor = anchors[upper]
+            else:
+                target = source
+                anchor = row
+
+            placed.insert(index, item)
+            anchors[item] = anchor
+            unplaced_rows.add(row, -weights[item])
+            placed_items.add(item, weights[item])
+            placed_anchors.add(anchor, weights[item])
+            extremes.clear(row)
+            if target != source:
+                moves.append((item, source, target))
+        pending = sorted(deferred)
+    return moves
+
+
+class _Fenwick:
+    """Prefix sums over a fixed number of slots, with point updates."""
+
+    __slots__ = ("_tree",)
+
+    def __init__(self, size: int) -> None:
+        self._tree = [0] * (size + 1)
+
+    def add(self, index: int, value: int) -> None:
+        """Adds the value to the slot."""
+        tree = self._tree
+        index += 1
+        while index < len(tree):
+            tree[index] += value
+            index += index & -index
+
+    def prefix(self, index: int) -> int:
+        """Returns the sum of the slots before the index."""
+        tree = self._tree
+        total = 0
+        while index > 0:
+            total += tree[index]
+            index -= index & -index
+        return total
+
+
+class _Extremes:
+    """Smallest and largest value over ranges of slots, slots can be cleared."""
+
+    __slots__ = ("_size", "_empty", "_smallest", "_largest")
+
+    def __init__(self, values: List[int]) -> None:
+        size = 1
+        while size < len(values):
+            size *= 2
+        self._size = size
+        # Cleared slots hold values outside the range of all values.
+        self._empty = len(values)
+        self._smallest = [self._empty] * (2 * size)
+        self._largest = [-1] * (2 * size)
+        self._smallest[size : size + len(values)] = values
+        self._largest[size : size + len(values)] = values
+        for node in range(size - 1, 0, -1):
+            self._smallest[node] = min(
+                self._smallest[2 * node], self._smallest[2 * node + 1]
+            )
+            self._largest[node] = max(
+                self._largest[2 * node], self._largest[2 * node + 1]
+            )
+
+    def clear(self, index: int) -> None:
+        """Removes the value of the slot."""
+        node = index + self._size
+        self._smallest[node] = self._empty
+        self._largest[node] = -1
+        node //= 2
+        while node:
+            self._smallest[node] = min(
+                self._smallest[2 * node], self._smallest[2 * node + 1]
+            )
+            self._largest[node] = max(
+                self._largest[2 * node], self._largest[2 * node + 1]
+            )
+            node //= 2
+
+    def smallest(self, start: int, stop: int) -> int:
+        """Returns the smallest value of the slots `start..stop-1`, a value above
+        all values if they are cleared."""
+        result = self._empty
+        start += self._size
+        stop += self._size
+        while start < stop:
+            if start & 1:
+                result = min(result, self._smallest[start])
+                start += 1
+            if stop & 1:
+                stop -= 1
+                result = min(result, self._smallest[stop])
+            start //= 2
+            stop //= 2
+        return result
+
+    def largest(self, start: int, stop: int) -> int:
+        """Returns the largest value of the slots `start..stop-1`, -1 if they are
+        cleared."""
+        result = -1
+        start += self._size
+        stop += self._size
+        while start < stop:
+            if start & 1:
+                result = max(result, self._largest[start])
+                start += 1
+            if stop & 1:
+                stop -= 1
+                result = max(result, self._largest[stop])
+            start //= 2
+            stop //= 2
+        return result
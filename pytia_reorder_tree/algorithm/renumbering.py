@@ -0,0 +1,30 @@
+"""
+    Renumbering submodule.
+    Computes the instance names of the nodes in tree order.
+"""
+
+from typing import Dict
+from typing import List
+from typing import Sequence
+
+
+def instance_names(
+    part_numbers: Sequence[str], skip: Sequence[bool], start_index: int
+) -> List[str | None]:
+    """Returns the instance name of each node: The part number and the index of the
+    node among all nodes of the same part number, e.g. `Part.1`, `Part.2`.
+
+    Args:
+        part_numbers (Sequence[str]): The part number of each node in tree order.
+        skip (Sequence[bool]): Wether a node keeps its name (e.g. group identifiers).
+        start_index (int): The index of the first node of each part number.
+
+    Returns:
+        List[str | None]: The new name of each node, None for skipped nodes.
+    """
+    node_index: Dict[str, int] = {}
+    names: List[str | None] = []
+    for part_number, skipped in zip(part_numbers, skip):
+        node_index[part_number] = node_index.get(part_number, start_index - 1) + 1
+        names.append(None if skipped else f"{part_number}.{node_index[part_number]}")
+    return names
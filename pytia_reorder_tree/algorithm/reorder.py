@@ -0,0 +1,272 @@
+"""
+    Reorder submodule.
+    Executes the planned moves on a move backend (the reorder window or a
+    simulated list box).
+"""
+
+from collections import deque
+from time import perf_counter
+from typing import Callable
+from typing import Deque
+from typing import Dict
+from typing import List
+from typing import Sequence
+from typing import Tuple
+
+from algorithm.mirror import ListBoxMirror
+from algorithm.planner import Move
+from algorithm.planner import MovePlan
+from algorithm.planner import plan_block_moves
+from algorithm.planner import plan_moves
+from protocols.move_backend_protocol import MoveBackendProtocol
+
+
+class OutOfSyncError(Exception):
+    """Raised when the rows of the list box differ from the mirrored rows."""
+
+
+# A move and the text of its first row.
+Step = Tuple[str, Move]
+
+
+class Reorder:
+    """
+    Brings the rows of the list box into the target order. The rows are tracked in
+    a mirror, so the list box is only read at the checkpoints. If the list box is
+    out of sync at a checkpoint (e.g. after a missed click), the remaining moves are
+    replanned from the actual rows, instead of aborting the whole run.
+
+    If sections are given, the rows are brought into section order first, and into
+    the order within the sections afterwards. This costs more clicks, but a run
+    that is stopped early (time budget) leaves the most valuable order behind.
+    """
+
+    def __init__(
+        self,
+        backend: MoveBackendProtocol,
+        items: Sequence[str],
+        target: Sequence[str],
+        verify_interval: int = 100,
+        block_moves: bool = True,
+        repair_attempts: int = 3,
+        checkpoint_interval: int = 0,
+        on_checkpoint: Callable[[List[str]], None] | None = None,
+        sections: Sequence[int] | None = None,
+        estimate: Tuple[Sequence[int], MovePlan] | None = None,
+    ) -> None:
+        """Inits the class and plans the moves.
+
+        Args:
+            backend (MoveBackendProtocol): The backend that moves the rows.
+            items (Sequence[str]): The rows of the list box, as read from the backend.
+            target (Sequence[str]): The same rows in the target order.
+            verify_interval (int, optional): Compares the mirror with the list box \
+                after this many moves. 0 compares only at the end. Defaults to 100.
+            block_moves (bool, optional): Wether to move contiguous rows at once, if \
+                the list box allows to select multiple rows. Defaults to True.
+            repair_attempts (int, optional): How often the moves are replanned \
+                when the list box is out of sync. Defaults to 3.
+            checkpoint_interval (int, optional): Verifies the list box after this \
+                many moves and calls `on_checkpoint` if it is in sync. 0 disables \
+                the checkpoints. Defaults to 0.
+            on_checkpoint (Callable[[List[str]], None] | None, optional): Called \
+                with the verified rows of the list box. Defaults to None.
+            sections (Sequence[int] | None, optional): The section of each row of \
+                the target order, ascending. Defaults to None.
+            estimate (Tuple[Sequence[int], MovePlan] | None, optional): The order \
+                and the plan of the cost estimate (see `window_cost`). Used instead \
+                of planning again, if it has been planned for the same order and \
+                kind of moves. Defaults to None.
+
+        Raises:
+            ValueError: Raised when the target is not a permutation of the rows.
+        """
+        if len(target) != len(items) or set(target) != set(items):
+            raise ValueError("The target order must contain all rows of the list box.")
+
+        self._backend = backend
+        self._verify_interval = verify_interval
+        self._repair_attempts = repair_attempts
+        self._checkpoint_interval = checkpoint_interval if on_checkpoint else 0
+        self._on_checkpoint = on_checkpoint
+        self._target_index: Dict[str, int] = {
+            value: index for index, value in enumerate(target)
+        }
+        self._target = list(target)
+        self._sections = list(sections) if sections is not None else None
+        self._mirror = ListBoxMirror(items)
+        self._block_moves = block_moves and backend.multi_selection
+        self._steps = self._replan(
+            items, block_moves=self._block_moves, estimate=estimate
+        )
+        moved = {text for text, _ in self._steps}
+        self._plan = MovePlan(
+            moves=[move for _, move in self._steps], stable=len(items) - len(moved)
+        )
+
+        self.moves = 0
+        self.clicks = 0
+        self.repairs = 0
+        self.remaining = 0
+        self.cancelled = False
+
+    @property
+    def plan(self) -> MovePlan:
+        """Returns the planned moves."""
+        return self._plan
+
+    @property
+    def block_moves(self) -> bool:
+        """Returns wether block moves are used. Turns False if the first block move
+        shows that the list box moves only single rows."""
+        return self._block_moves
+
+    @property
+    def finished(self) -> bool:
+        """Returns wether all moves have been done."""
+        return self.remaining == 0
+
+    def run(
+        self,
+        deadline: float | None = None,
+        cancel: Callable[[], bool] | None = None,
+    ) -> None:
+        """Executes the planned moves.
+
+        Args:
+            deadline (float | None, optional): Stops before the next move, if the \
+                `perf_counter` has passed the deadline. The list box is left in a \
+                consistent, but unfinished order, see `remaining`. Defaults to None.
+            cancel (Callable[[], bool] | None, optional): Called before every \
+                click, stops if it returns True. Stops within the current move, \
+                the list box is left in a consistent order like with the deadline, \
+                see `cancelled`. Defaults to None.
+
+        Raises:
+            OutOfSyncError: Raised when the list box is still out of sync after all \
+                repair attempts.
+        """
+        pending: Deque[Step] | None = deque(self._steps)
+        check_block_move = self._block_moves
+        while pending is not None:
+            if not pending:
+                # Reads the list box once more after the last move. The repair moves
+                # are verified the same way.
+                pending = self._verify()
+                continue
+
+            if cancel is not None and cancel():
+                self.cancelled = True
+                self.remaining = len(pending)
+                return
+            if deadline is not None and perf_counter() > deadline:
+                self.remaining = len(pending)
+                return
+
+            text, move = pending.popleft()
+            if not self._move(text, move, cancel=cancel):
+                # Cancelled within the move, the rest of it is left to a new plan.
+                self.cancelled = True
+                self.remaining = len(pending) + 1
+                return
+            self.moves += 1
+
+            if move.count > 1 and check_block_move:
+                # The first block move shows if the window really moves all selected
+                # rows. If not, continue with single row moves from the actual state.
+                check_block_move = False
+                actual = self._backend.item_texts()
+                if self._mirror.mismatches(actual):
+                    self._block_moves = False
+                    self._mirror.reset(actual)
+                    pending = deque(self._replan(actual, block_moves=False))
+                    continue
+
+            verify = self._verify_interval and self.moves % self._verify_interval == 0
+            checkpoint = (
+                self._checkpoint_interval
+                and self.moves % self._checkpoint_interval == 0
+            )
+            if pending and (verify or checkpoint):
+                if (repair := self._verify()) is not None:
+                    pending = repair
+                elif checkpoint and self._on_checkpoint is not None:
+                    self._on_checkpoint(self._mirror.items)
+
+    def _replan(
+        self,
+        items: Sequence[str],
+        block_moves: bool,
+        estimate: Tuple[Sequence[int], MovePlan] | None = None,
+    ) -> List[Step]:
+        """Plans the moves from the given rows to the target order. Plans the moves
+        into section order first, if the rows are not in section order yet. Takes
+        the moves of the estimate, if it has been planned for the same order."""
+        plan = plan_block_moves if block_moves else plan_moves
+        order = [self._target_index[value] for value in items]
+        if self._sections is not None:
+            sections = self._sections
+            # Stable, so the order within the sections doesn't get worse.
+            rows = sorted(range(len(order)), key=lambda row: sections[order[row]])
+            if rows != list(range(len(order))):
+                intermediate = [items[row] for row in rows]
+                index = {value: i for i, value in enumerate(intermediate)}
+                first = plan([index[value] for value in items])
+                return [
+                    (intermediate[move.item], move) for move in first.moves
+                ] + self._replan(intermediate, block_moves=block_moves)
+
+        if (
+            estimate is not None
+            and estimate[1].blocks == block_moves
+            and list(estimate[0]) == order
+        ):
+            moves = estimate[1].moves
+        else:
+            moves = plan(order).moves
+        return [(self._target[move.item], move) for move in moves]
+
+    def _move(
+        self, text: str, move: Move, cancel: Callable[[], bool] | None = None
+    ) -> bool:
+        """Selects the rows of the move and clicks the up or down button. Returns
+        False if the move has been cancelled before its last click."""
+        row = self._mirror.row(text)
+        self._backend.select(row, move.count)
+        for click in range(move.clicks):
+            if click and cancel is not None and cancel():
+                return False
+            if move.up:
+                self._backend.move_up()
+                row = self._mirror.move_up(row, move.count)
+            else:
+                self._backend.move_down()
+                row = self._mirror.move_down(row, move.count)
+            self.clicks += 1
+        return True
+
+    def _verify(self) -> Deque[Step] | None:
+        """Compares the mirrored rows with the rows of the list box.
+
+        Returns:
+            Deque[Step] | None: The moves that bring the actual rows into the target \
+                order, None if the list box is in sync.
+        """
+        actual = self._backend.item_texts()
+        mismatches: List[int] = self._mirror.mismatches(actual)
+        if not mismatches:
+            return None
+
+        self._backend.out_of_sync()
+        msg = (
+            f"The reorder window is out of sync in {len(mismatches)} rows, "
+            f"first at row {mismatches[0]}"
+        )
+        if len(actual) != len(self._target) or set(actual) != self._target_index.keys():
+            raise OutOfSyncError(f"{msg}, the rows of the list box have changed.")
+        if self.repairs >= self._repair_attempts:
+            raise OutOfSyncError(f"{msg}, after {self.repairs} repairs.")
+
+        self.repairs += 1
+        self._mirror.reset(actual)
+        return deque(self._replan(actual, block_moves=self._block_moves))
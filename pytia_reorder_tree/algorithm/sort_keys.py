@@ -0,0 +1,252 @@
+"""
+    Sort keys submodule.
+    Compiles the sort key specification (settings.json) into a key function.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import FrozenSet
+from typing import Literal
+from typing import Mapping
+from typing import Sequence
+from typing import Tuple
+
+from algorithm.collation import COLLATION_PLAIN
+from algorithm.collation import Collator
+from const import PROP_GROUP_IDENTIFIER
+
+FIELD_SOURCE = "source"
+FIELD_PART_NUMBER = "part_number"
+FIELD_NAME = "name"
+FIELD_PROPERTY = "property"
+FIELDS = (FIELD_SOURCE, FIELD_PART_NUMBER, FIELD_NAME, FIELD_PROPERTY)
+
+MISSING_EMPTY = "empty"
+MISSING_FIRST = "first"
+MISSING_LAST = "last"
+MISSING = (MISSING_EMPTY, MISSING_FIRST, MISSING_LAST)
+
+
+@dataclass(slots=True, kw_only=True, frozen=True)
+class SortKeyColumn:
+    """Dataclass for a single column of the sort key."""
+
+    field: Literal["source", "part_number", "name", "property"]
+    property: str | None = None
+    sources: Tuple[int, ...] | None = None
+    descending: bool = False
+    missing: Literal["empty", "first", "last"] = MISSING_EMPTY
+    collation: str | None = None
+    section: bool = False
+
+
+# The default ordering: Source, group, group identifier, the filter property for
+# bought items, part number and instance name. The source and the groups (with their
+# group identifiers as header) form the sections of the tree.
+DEFAULT_SORT_KEYS = (
+    SortKeyColumn(field=FIELD_SOURCE, section=True),
+    SortKeyColumn(
+        field=FIELD_PROPERTY, property="group", missing=MISSING_LAST, section=True
+    ),
+    SortKeyColumn(
+        field=FIELD_PROPERTY,
+        property=PROP_GROUP_IDENTIFIER,
+        missing=MISSING_LAST,
+        section=True,
+    ),
+    SortKeyColumn(field=FIELD_PROPERTY, property="filter", sources=(2,)),
+    SortKeyColumn(field=FIELD_PART_NUMBER),
+    SortKeyColumn(field=FIELD_NAME),
+)
+
+
+class Descending:
+    """Wrapper that reverses the order of a value in a sort key."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Descending) and self.value == other.value
+
+    def __lt__(self, other: "Descending") -> bool:
+        return other.value < self.value
+
+    def __hash__(self) -> int:
+        return hash(self.value)
+
+    def __repr__(self) -> str:
+        return f"Descending({self.value!r})"
+
+
+Extractor = Callable[[int, str, str, Mapping[str, str]], Tuple[Any, ...]]
+
+
+class SortKey:
+    """Compiled sort key. Builds the key of a node in a single call."""
+
+    def __init__(
+        self,
+        columns: Sequence[SortKeyColumn],
+        aliases: Mapping[str, str] | None = None,
+        collation: str = COLLATION_PLAIN,
+        locale_name: str | None = None,
+    ) -> None:
+        """Inits the class. Compiles the columns into one key function.
+
+        Args:
+            columns (Sequence[SortKeyColumn]): The columns of the sort key.
+            aliases (Mapping[str, str] | None, optional): Maps property aliases \
+                (e.g. `group` from the properties.json) to the property name. \
+                Defaults to None.
+            collation (str, optional): The collation of all text columns without \
+                their own collation. Defaults to `plain`.
+            locale_name (str | None, optional): The locale for the locale aware \
+                collations. Defaults to None (locale of the user).
+
+        Raises:
+            ValueError: Raised when a column is invalid.
+        """
+        aliases = aliases or {}
+        self._collation = collation
+        self._locale_name = locale_name
+        self._collators: Dict[str, Collator] = {}
+        self._columns = tuple(columns)
+        self._properties: FrozenSet[str] = frozenset(
+            aliases.get(c.property, c.property)
+            for c in self._columns
+            if c.field == FIELD_PROPERTY and c.property
+        )
+        self._needs_source = any(
+            c.field == FIELD_SOURCE or c.sources is not None for c in self._columns
+        )
+        extractors = [self._compile(c, aliases) for c in self._columns]
+        self._key = _join(extractors)
+        self._section = _join(
+            [e for c, e in zip(self._columns, extractors) if c.section]
+        )
+
+    @property
+    def columns(self) -> Tuple[SortKeyColumn, ...]:
+        """Returns the columns of the sort key."""
+        return self._columns
+
+    @property
+    def properties(self) -> FrozenSet[str]:
+        """Returns the names of all properties the sort key needs."""
+        return self._properties
+
+    @property
+    def needs_source(self) -> bool:
+        """Returns wether the sort key needs the source of the nodes."""
+        return self._needs_source
+
+    def key(
+        self,
+        source: int,
+        part_number: str,
+        name: str,
+        properties: Mapping[str, str] | None = None,
+    ) -> Tuple[Any, ...]:
+        """Returns the sort key of a node.
+
+        Args:
+            source (int): The source of the node (0 = unknown, 1 = made, 2 = bought).
+            part_number (str): The part number of the node.
+            name (str): The instance name of the node.
+            properties (Mapping[str, str] | None, optional): The user properties of \
+                the node. Only the properties of `SortKey.properties` are required. \
+                Defaults to None.
+
+        Returns:
+            Tuple[Any, ...]: The sort key.
+        """
+        return self._key(source, part_number, name, properties or {})
+
+    def section(
+        self,
+        source: int,
+        part_number: str,
+        name: str,
+        properties: Mapping[str, str] | None = None,
+    ) -> Tuple[Any, ...]:
+        """Returns the section of a node: The key of the section columns only.
+        Nodes of the same section are adjacent in the sorted tree. Same arguments
+        as `key`.
+
+        Returns:
+            Tuple[Any, ...]: The section key, empty if no column is a section.
+        """
+        return self._section(source, part_number, name, properties or {})
+
+    @property
+    def has_sections(self) -> bool:
+        """Returns wether any column is a section."""
+        return any(c.section for c in self._columns)
+
+    def _collator(self, column: SortKeyColumn) -> Collator:
+        """Returns the collator of the column. Collators are shared between columns
+        of the same collation, so are their caches."""
+        mode = column.collation or self._collation
+        if mode not in self._collators:
+            self._collators[mode] = Collator(mode=mode, locale_name=self._locale_name)
+        return self._collators[mode]
+
+    def _compile(self, column: SortKeyColumn, aliases: Mapping[str, str]) -> Extractor:
+        """Compiles a single column into a function that returns its key values."""
+        if column.field not in FIELDS:
+            raise ValueError(
+                f"Unknown sort key field {column.field!r}, must be one of {FIELDS}."
+            )
+        if column.missing not in MISSING:
+            raise ValueError(
+                f"Unknown sort key option {column.missing!r}, must be one of {MISSING}."
+            )
+        if column.field == FIELD_PROPERTY and not column.property:
+            raise ValueError("A sort key of the field 'property' requires a property.")
+
+        sources = frozenset(column.sources) if column.sources is not None else None
+        wrap: Callable[[Any], Any] = Descending if column.descending else lambda v: v
+
+        if column.field == FIELD_SOURCE:
+            return lambda so, pn, na, pr: (wrap(so),)
+
+        collate = self._collator(column).key
+        if column.field == FIELD_PART_NUMBER:
+            return lambda so, pn, na, pr: (wrap(collate(pn)),)
+        if column.field == FIELD_NAME:
+            return lambda so, pn, na, pr: (wrap(collate(na)),)
+
+        name = aliases.get(column.property, column.property)  # type: ignore
+        present, absent = (2, 1) if column.missing == MISSING_FIRST else (1, 2)
+
+        def _property(
+            so: int, pn: str, na: str, pr: Mapping[str, str]
+        ) -> Tuple[Any, ...]:
+            value = pr.get(name) if sources is None or so in sources else None
+            if column.missing == MISSING_EMPTY:
+                return (wrap(collate(value or "")),)
+            return (
+                present if value is not None else absent,
+                wrap(collate(value or "")),
+            )
+
+        return _property
+
+
+def _join(extractors: Sequence[Extractor]) -> Extractor:
+    """Joins the extractors into a single key function."""
+
+    def _key(
+        source: int, part_number: str, name: str, properties: Mapping[str, str]
+    ) -> Tuple[Any, ...]:
+        key: Tuple[Any, ...] = ()
+        for extractor in extractors:
+            key += extractor(source, part_number, name, properties)
+        return key
+
+    return _key
@@ -8,6 +8,7 @@ from app.frames import Frames
 from app.vars import Variables
 from const import STEPS
 from PIL import Image
+from ttkbootstrap import Button
 from ttkbootstrap import Label
 from ttkbootstrap import Meter
 
@@ -60,8 +61,24 @@ class Layout:
         lbl_status_value = Label(frames.infrastructure, textvariable=variables.status)
         lbl_status_value.grid(row=1, column=1, padx=(5, 5), pady=(1, 15), sticky="nsw")
 
+        self._btn_cancel = Button(
+            frames.infrastructure,
+            text="Cancel",
+            bootstyle="secondary",
+            width=8,
+            takefocus=False,
+        )
+        self._btn_cancel.grid(
+            row=0, column=2, padx=(5, 10), pady=(10, 10), sticky="e", rowspan=2
+        )
+        frames.infrastructure.grid_columnconfigure(1, weight=1)
+
         # endregion
 
     @property
     def task_meter(self) -> Meter:
         return self._task_meter
+
+    @property
+    def btn_cancel(self) -> Button:
+        return self._btn_cancel
@@ -43,3 +43,24 @@ LOG_FORMAT = "%(message)s"
 
 STEPS = 5
 ISO_VIEW = "* iso"
+
+TIMING_MARGIN = 2.0
+TIMING_MIN_WAIT = 0.005
+TIMING_MAX_WAIT = 1.0
+
+JOURNALS = Path(APPDATA, "journals")
+JOURNAL_MAX_AGE = 24 * 60 * 60
+
+PROPERTY_CACHE = Path(APPDATA, "properties.sqlite")
+PROPERTY_CACHE_MAX_AGE = 30 * 24 * 60 * 60
+
+COST_WINDOW_CONNECT = 3.0
+COST_CLICK = 0.1
+COST_SELECT = 0.05
+COST_MESSAGE = 0.005
+COST_API_COMPONENT = 0.25
+
+CANCEL_POLL_INTERVAL = 0.05
+
+READER_PROBE_SIZE = 16
+READER_MIN_SPEEDUP = 1.3
@@ -15,6 +15,7 @@ from const import APP_VERSION
 from const import LOG
 from const import LOGS
 from exceptions import WarningError
+from handler.cancel import CancelToken
 from pytia.exceptions import PytiaBodyEmptyError
 from pytia.exceptions import PytiaDifferentDocumentError
 from pytia.exceptions import PytiaDocumentNotSavedError
@@ -32,12 +33,22 @@ from task import Task
 class GUI(tk.Tk):
     """The user interface of the app."""
 
-    WIDTH = 360
+    WIDTH = 440
     HEIGHT = 75
 
-    def __init__(self) -> None:
-        """Inits the main window."""
+    def __init__(self, dry_run: str | None = None, selection: bool = False) -> None:
+        """Inits the main window.
+
+        Args:
+            dry_run (str | None, optional): Plans the task instead of running it, and \
+                writes the plan to this JSON file (to the export folder if empty). \
+                Defaults to None.
+            selection (bool, optional): Sorts only the selected nodes into the \
+                otherwise sorted tree. Defaults to False.
+        """
         ttk.tk.Tk.__init__(self)
+        self.dry_run = dry_run
+        self.selection = selection
         self.style = ttk.Style(theme="darkly")
 
         # CLASS VARS ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -49,6 +60,8 @@ class GUI(tk.Tk):
             variables=self.vars,
         )
 
+        self.cancel_token = CancelToken(poll=self.update)
+
         self.readonly = bool(
             not resource.logon_exists()
             and not resource.settings.restrictions.allow_all_users
@@ -81,6 +94,8 @@ class GUI(tk.Tk):
             f"{resource.settings.title} "
             f"{'(DEBUG MODE)' if resource.settings.debug else APP_VERSION}"
             f"{' (READ ONLY)' if self.readonly else ''}"
+            f"{' (DRY RUN)' if self.dry_run is not None else ''}"
+            f"{' (SELECTION)' if self.selection else ''}"
         )
         self.overrideredirect(True)
         self.attributes("-topmost", True)
@@ -107,10 +122,28 @@ class GUI(tk.Tk):
     def run_controller(self) -> None:
         """Runs all controllers. Initializes all lazy loaders, bindings and traces."""
         self.traces()
+        self.bindings()
 
-        task = Task(root=self, vars=self.vars)
+        task = Task(
+            root=self,
+            vars=self.vars,
+            dry_run=self.dry_run,
+            selection=self.selection,
+            cancel=self.cancel_token,
+        )
         task.run()
 
+    def bindings(self) -> None:
+        """Binds the cancel button and the escape key to the cancel token."""
+        self.layout.btn_cancel.configure(command=self.cancel)
+        self.bind("<Escape>", self.cancel)
+
+    def cancel(self, *_) -> None:
+        """Cancels the task at its next checkpoint."""
+        self.cancel_token.cancel()
+        self.layout.btn_cancel.configure(state="disabled")
+        self.vars.status.set("Cancelling...")
+
     def traces(self) -> None:
         """Instantiates the traces class."""
         Traces(
@@ -0,0 +1,149 @@
+"""
+    Cancel submodule.
+    Cooperative cancellation of the running task.
+"""
+
+import os
+import sys
+from time import perf_counter
+from typing import Callable
+from typing import Set
+from typing import Tuple
+
+from const import CANCEL_POLL_INTERVAL
+
+ON_CANCEL_ABORT = "abort"
+ON_CANCEL_APPLY = "apply"
+ON_CANCEL = (ON_CANCEL_ABORT, ON_CANCEL_APPLY)
+
+VK_ESCAPE = 0x1B
+VK_PAUSE = 0x13
+
+
+class Cancelled(Exception):
+    """Raised at a checkpoint after the user has cancelled the task."""
+
+
+class CancelToken:
+    """
+    Flag that is set by the cancel button or the cancel keys, and checked by the
+    task at its checkpoints (between stages and between the clicks of the reorder
+    window). The task runs in the thread of the UI, so every check also processes
+    the pending UI events, at most once per poll interval.
+
+    The keys are read with GetAsyncKeyState on Windows, because the reorder window
+    and not the app has the focus while the rows are moved. The escape key only
+    cancels the task if a window of the app is in the foreground. Watched windows
+    (e.g. the reorder window) handle the escape key themselves and close, so the
+    pause key, which dialogs ignore, cancels the task while they're in the
+    foreground. No key counts if it's pressed in any other application.
+    """
+
+    def __init__(
+        self,
+        poll: Callable[[], None] | None = None,
+        interval: float = CANCEL_POLL_INTERVAL,
+    ) -> None:
+        """Inits the class.
+
+        Args:
+            poll (Callable[[], None] | None, optional): Processes the pending UI \
+                events, e.g. `Tk.update`. Defaults to None.
+            interval (float, optional): The minimum seconds between two polls. \
+                Defaults to CANCEL_POLL_INTERVAL.
+        """
+        self._poll = poll
+        self._interval = interval
+        self._last = perf_counter()
+        self._cancelled = False
+        self._key_state = _key_state_function()
+        self._foreground = _foreground_function()
+        self._windows: Set[int] = set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Returns wether the task has been cancelled."""
+        return self._cancelled
+
+    def cancel(self) -> None:
+        """Cancels the task at its next checkpoint."""
+        self._cancelled = True
+
+    def watch(self, handle: int) -> None:
+        """Cancels the task with the pause key also while the window is in the
+        foreground.
+
+        Args:
+            handle (int): The handle of the window, e.g. of the reorder window.
+        """
+        self._windows.add(handle)
+
+    def check(self) -> bool:
+        """Polls the UI and the cancel keys, if the poll interval has passed.
+
+        Returns:
+            bool: Wether the task has been cancelled.
+        """
+        if not self._cancelled and perf_counter() - self._last >= self._interval:
+            self._last = perf_counter()
+            if self._poll is not None:
+                self._poll()
+            # The low bit is set if the key has been pressed since the last call.
+            # The key states are read in any case, so a key press in another
+            # application doesn't count once the app is in the foreground again.
+            if self._key_state is not None:
+                escape = self._key_state(VK_ESCAPE) & 0x8001
+                pause = self._key_state(VK_PAUSE) & 0x8001
+                app, watched = self._in_foreground()
+                if (app and (escape or pause)) or (watched and pause):
+                    self._cancelled = True
+        return self._cancelled
+
+    def _in_foreground(self) -> Tuple[bool, bool]:
+        """Returns wether a window of the app, and wether a watched window is in the
+        foreground."""
+        if self._foreground is None:
+            return True, False
+        handle, process = self._foreground()
+        return process == os.getpid(), handle in self._windows
+
+    def raise_if_cancelled(self) -> None:
+        """Raises Cancelled if the task has been cancelled.
+
+        Raises:
+            Cancelled: Raised when the task has been cancelled.
+        """
+        if self.check():
+            raise Cancelled("The task has been cancelled.")
+
+
+def _key_state_function() -> Callable[[int], int] | None:
+    """Returns GetAsyncKeyState, None if not on Windows."""
+    if sys.platform != "win32":
+        return None
+    import ctypes  # pylint: disable=C0415
+
+    key_state = ctypes.windll.user32.GetAsyncKeyState  # type: ignore
+    # Resets the pressed flag of earlier key presses.
+    key_state(VK_ESCAPE)
+    key_state(VK_PAUSE)
+    return key_state
+
+
+def _foreground_function() -> Callable[[], Tuple[int, int]] | None:
+    """Returns a function that returns the handle and the process id of the
+    foreground window, None if not on Windows."""
+    if sys.platform != "win32":
+        return None
+    import ctypes  # pylint: disable=C0415
+    from ctypes import wintypes  # pylint: disable=C0415
+
+    user32 = ctypes.windll.user32  # type: ignore
+
+    def foreground() -> Tuple[int, int]:
+        handle = user32.GetForegroundWindow()
+        process = wintypes.DWORD()
+        user32.GetWindowThreadProcessId(handle, ctypes.byref(process))
+        return handle or 0, process.value
+
+    return foreground
@@ -0,0 +1,199 @@
+"""
+    Concurrent reader submodule.
+    Reads items of an object model with a pool of threads, each thread in its own
+    COM apartment.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from time import perf_counter
+from typing import Any
+from typing import Callable
+from typing import List
+from typing import Sequence
+from typing import TypeVar
+
+from const import READER_MIN_SPEEDUP
+from const import READER_PROBE_SIZE
+
+T = TypeVar("T")
+
+# Reads the item at the index from the root object, in the thread of the caller.
+ReadItem = Callable[[Any, int], T]
+
+
+class Apartment:
+    """
+    Threading model of a pure python object model: The objects are shared between
+    the threads as they are. Base class of the COM apartment.
+    """
+
+    def initialize(self) -> None:
+        """Prepares the current thread for the object model."""
+
+    def uninitialize(self) -> None:
+        """Releases the object model in the current thread."""
+
+    def marshal(self, obj: Any) -> Any:
+        """Returns a token of the object, which can be unmarshalled once in another
+        thread. Must be called in the thread that owns the object."""
+        return obj
+
+    def unmarshal(self, token: Any) -> Any:
+        """Returns the object of the token, usable in the current thread."""
+        return token
+
+
+class ComApartment(Apartment):
+    """
+    Every worker thread initializes its own single threaded COM apartment. The
+    interfaces are marshalled into a stream by the thread that owns them, and
+    unmarshalled by the worker, so all calls of the worker go through its own
+    proxy.
+    """
+
+    def initialize(self) -> None:
+        import pythoncom  # pylint: disable=C0415
+
+        pythoncom.CoInitialize()
+
+    def uninitialize(self) -> None:
+        import pythoncom  # pylint: disable=C0415
+
+        pythoncom.CoUninitialize()
+
+    def marshal(self, obj: Any) -> Any:
+        import pythoncom  # pylint: disable=C0415
+
+        return pythoncom.CoMarshalInterThreadInterfaceInStream(
+            pythoncom.IID_IDispatch, getattr(obj, "_oleobj_", obj)
+        )
+
+    def unmarshal(self, token: Any) -> Any:
+        import pythoncom  # pylint: disable=C0415
+        from win32com.client import Dispatch  # pylint: disable=C0415
+
+        return Dispatch(
+            pythoncom.CoGetInterfaceAndReleaseStream(token, pythoncom.IID_IDispatch)
+        )
+
+
+class ConcurrentReader:
+    """
+    Reads items with a pool of threads. The items are split into one contiguous
+    chunk per thread, the results are returned in the order of the items.
+
+    Whether concurrent reads are faster depends on the host: A COM server with a
+    single thread (like CATIA) may serialize all calls. Hence the first items are
+    read sequentially and concurrently, and the remaining items are read
+    sequentially if the concurrent reads aren't faster by `min_speedup`. The
+    reader also falls back to sequential reads if a concurrent read fails, the
+    error is kept in `error`.
+    """
+
+    def __init__(
+        self,
+        threads: int,
+        apartment: Apartment | None = None,
+        probe: int = READER_PROBE_SIZE,
+        min_speedup: float = READER_MIN_SPEEDUP,
+    ) -> None:
+        """Inits the class.
+
+        Args:
+            threads (int): The number of threads. Reads sequentially if less than 2.
+            apartment (Apartment | None, optional): The threading model of the \
+                object model. Defaults to None (pure python objects).
+            probe (int, optional): The number of items per thread to measure the \
+                throughput. Defaults to READER_PROBE_SIZE.
+            min_speedup (float, optional): The speedup of the concurrent reads, \
+                below which the reader falls back to sequential reads. Defaults to \
+                READER_MIN_SPEEDUP.
+        """
+        self._threads = threads
+        self._apartment = apartment or Apartment()
+        self._probe = probe
+        self._min_speedup = min_speedup
+        self.concurrent = False
+        self.speedup: float | None = None
+        self.error: str | None = None
+
+    @property
+    def threads(self) -> int:
+        """Returns the number of threads."""
+        return self._threads
+
+    def read(self, root: Any, indices: Sequence[int], read: ReadItem[T]) -> List[T]:
+        """Reads the items.
+
+        Args:
+            root (Any): The object from which the items are read (e.g. a COM \
+                collection), owned by the calling thread.
+            indices (Sequence[int]): The indices of the items.
+            read (ReadItem[T]): Reads a single item from the root, in any thread.
+
+        Returns:
+            List[T]: The items, in the order of the indices.
+        """
+        self.concurrent = False
+        self.speedup = None
+        probe = self._probe
+        batch = probe * (self._threads + 1)
+        if self._threads < 2 or len(indices) <= batch:
+            return [read(root, index) for index in indices]
+
+        start = perf_counter()
+        results = [read(root, index) for index in indices[:probe]]
+        sequential = (perf_counter() - start) / probe
+
+        start = perf_counter()
+        try:
+            results += self._read_concurrently(root, indices[probe:batch], read)
+        except Exception as e:  # pylint: disable=W0703
+            self.error = str(e)
+            return results + [read(root, index) for index in indices[probe:]]
+        concurrent = (perf_counter() - start) / (batch - probe)
+
+        self.speedup = sequential / max(concurrent, 1e-9)
+        if self.speedup < self._min_speedup:
+            return results + [read(root, index) for index in indices[batch:]]
+
+        try:
+            results += self._read_concurrently(root, indices[batch:], read)
+        except Exception as e:  # pylint: disable=W0703
+            self.error = str(e)
+            return results + [read(root, index) for index in indices[batch:]]
+        self.concurrent = True
+        return results
+
+    def _read_concurrently(
+        self, root: Any, indices: Sequence[int], read: ReadItem[T]
+    ) -> List[T]:
+        """Reads the items with the pool, one chunk per thread."""
+        size = -(-len(indices) // self._threads)
+        chunks = [indices[i : i + size] for i in range(0, len(indices), size)]
+        # The interfaces must be marshalled by the thread that owns them.
+        tokens = [self._apartment.marshal(root) for _ in chunks]
+        with ThreadPoolExecutor(max_workers=self._threads) as executor:
+            return [
+                result
+                for results in executor.map(
+                    self._read_chunk, tokens, chunks, repeat(read)
+                )
+                for result in results
+            ]
+
+    def _read_chunk(
+        self, token: Any, indices: Sequence[int], read: ReadItem[T]
+    ) -> List[T]:
+        """Reads a chunk of items in a worker thread."""
+        self._apartment.initialize()
+        try:
+            root = self._apartment.unmarshal(token)
+            results = [read(root, index) for index in indices]
+            # All references to the object model must be released before the
+            # apartment is uninitialized.
+            del root
+            return results
+        finally:
+            self._apartment.uninitialize()
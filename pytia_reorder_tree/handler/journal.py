@@ -0,0 +1,241 @@
+"""
+    Journal submodule.
+    Records the progress of the task, so an interrupted run can be resumed.
+"""
+
+import json
+import os
+import time
+from hashlib import sha1
+from json import JSONDecodeError
+from pathlib import Path
+from typing import Iterable
+from typing import List
+from typing import Sequence
+from typing import Tuple
+
+from const import APP_VERSION
+from const import JOURNAL_MAX_AGE
+
+STAGE_GROUPS = "groups"
+STAGE_SORT = "sort"
+STAGE_RENUMBER = "renumber"
+STAGE_VIEW = "view"
+
+
+def tree_fingerprint(nodes: Iterable[Tuple[str, str]], spec: str = "") -> str:
+    """Returns the fingerprint of the children of a product. Doesn't depend on the
+    order of the children, so a sorted tree has the same fingerprint.
+
+    Args:
+        nodes (Iterable[Tuple[str, str]]): The instance name and the part number of \
+            each child.
+        spec (str, optional): The settings that define the target order (e.g. the \
+            sort keys), so the target order of a run with other settings isn't \
+            resumed. Defaults to "".
+
+    Returns:
+        str: The fingerprint.
+    """
+    lines = sorted(f"{name}\t{part_number}" for name, part_number in nodes)
+    return sha1("\n".join([spec, *lines]).encode("utf8")).hexdigest()
+
+
+class Journal:
+    """
+    Small JSON file per document, that records which stages of the task have
+    finished, the target order of the reorder list box and how many rows of the
+    target order are confirmed. A new run on the same document reads the journal
+    and resumes from the last confirmed point. The journal is deleted when the task
+    has finished.
+
+    The fingerprint of the tree is recorded with every finished stage. The finished
+    stages only count, if the tree still has the same fingerprint, see `check`.
+    """
+
+    def __init__(
+        self, folder: Path, document: str, max_age: float = JOURNAL_MAX_AGE
+    ) -> None:
+        """Inits the class. Reads the journal of the document, if it exists.
+
+        Args:
+            folder (Path): The folder of all journals.
+            document (str): The full path of the document.
+            max_age (float, optional): Journals older than this (in seconds) are \
+                discarded. Defaults to JOURNAL_MAX_AGE.
+        """
+        digest = sha1(document.lower().encode("utf8")).hexdigest()[:16]
+        self._path = Path(folder, f"{digest}.json")
+        self._document = document
+        self._max_age = max_age
+
+        self._stages: List[str] = []
+        self._fingerprint: str | None = None
+        self._target: List[str] | None = None
+        self._sections: List[int] | None = None
+        self._confirmed = 0
+        self._resumed = self._read()
+
+    @property
+    def path(self) -> Path:
+        """Returns the path of the journal file."""
+        return self._path
+
+    @property
+    def resumed(self) -> bool:
+        """Returns wether the journal of a previous run has been found."""
+        return self._resumed
+
+    @property
+    def stages(self) -> List[str]:
+        """Returns the finished stages."""
+        return list(self._stages)
+
+    @property
+    def target(self) -> List[str] | None:
+        """Returns the target order of the list box rows, None if not set."""
+        return list(self._target) if self._target is not None else None
+
+    @property
+    def sections(self) -> List[int] | None:
+        """Returns the section of each row of the target order, None if not set."""
+        return list(self._sections) if self._sections is not None else None
+
+    @property
+    def confirmed(self) -> int:
+        """Returns the number of leading rows that are confirmed in target order."""
+        return self._confirmed
+
+    def resume(self, texts: Sequence[str]) -> Tuple[List[str], List[int] | None] | None:
+        """Returns the target order and the sections of the interrupted run, if the
+        target order contains the same rows as the list box.
+
+        Args:
+            texts (Sequence[str]): The rows of the list box.
+
+        Returns:
+            Tuple[List[str], List[int] | None] | None: The rows in target order and \
+                their sections, None if there's no target order or the rows have \
+                changed (e.g. by renaming the instances).
+        """
+        if self._target is None:
+            return None
+        if len(self._target) != len(texts) or set(self._target) != set(texts):
+            return None
+        return list(self._target), self.sections
+
+    def check(self, fingerprint: str) -> bool:
+        """Forgets the progress of the interrupted run, if the tree has changed
+        since (e.g. parts have been added). The fingerprint is recorded with the
+        progress of this run.
+
+        Args:
+            fingerprint (str): The fingerprint of the tree, see `tree_fingerprint`.
+
+        Returns:
+            bool: Wether the progress is kept.
+        """
+        if fingerprint == self._fingerprint:
+            return True
+        self._fingerprint = fingerprint
+        self._stages = []
+        self._target = None
+        self._sections = None
+        self._confirmed = 0
+        return False
+
+    def finished(self, stage: str) -> bool:
+        """Returns wether the stage has finished."""
+        return stage in self._stages
+
+    def finish(self, stage: str, fingerprint: str) -> None:
+        """Records the stage as finished.
+
+        Args:
+            stage (str): The stage.
+            fingerprint (str): The fingerprint of the tree after the stage.
+        """
+        if stage not in self._stages:
+            self._stages.append(stage)
+        self._fingerprint = fingerprint
+        self._write()
+
+    def set_target(
+        self, target: Sequence[str], sections: Sequence[int] | None = None
+    ) -> None:
+        """Records the target order of the list box rows, and optionally the section
+        of each row. Resets the confirmed rows."""
+        self._target = list(target)
+        self._sections = list(sections) if sections is not None else None
+        self._confirmed = 0
+        self._write()
+
+    def confirm(self, rows: Sequence[str]) -> None:
+        """Records the rows of the list box, after they have been applied.
+
+        Args:
+            rows (Sequence[str]): The applied rows of the list box.
+        """
+        assert self._target is not None
+        confirmed = 0
+        for actual, target in zip(rows, self._target):
+            if actual != target:
+                break
+            confirmed += 1
+        self._confirmed = confirmed
+        self._write()
+
+    def delete(self) -> None:
+        """Deletes the journal file."""
+        if self._path.exists():
+            os.remove(self._path)
+        self._stages = []
+        self._fingerprint = None
+        self._target = None
+        self._sections = None
+        self._confirmed = 0
+
+    def _read(self) -> bool:
+        """Reads the journal file. Discards journals of other app versions and
+        journals that are too old."""
+        if not self._path.exists():
+            return False
+        try:
+            with open(self._path, "r", encoding="utf8") as f:
+                data = json.load(f)
+        except (OSError, JSONDecodeError):
+            return False
+        if (
+            data.get("version") != APP_VERSION
+            or data.get("document") != self._document
+            or time.time() - data.get("timestamp", 0) > self._max_age
+        ):
+            return False
+
+        self._stages = list(data.get("stages", []))
+        self._fingerprint = data.get("fingerprint")
+        self._target = data.get("target")
+        self._sections = data.get("sections")
+        self._confirmed = data.get("confirmed", 0)
+        return True
+
+    def _write(self) -> None:
+        """Writes the journal file. Replaces the file at once, so an interruption
+        never leaves a broken journal."""
+        os.makedirs(self._path.parent, exist_ok=True)
+        temp = self._path.with_suffix(".tmp")
+        with open(temp, "w", encoding="utf8") as f:
+            json.dump(
+                {
+                    "version": APP_VERSION,
+                    "document": self._document,
+                    "timestamp": time.time(),
+                    "stages": self._stages,
+                    "fingerprint": self._fingerprint,
+                    "target": self._target,
+                    "sections": self._sections,
+                    "confirmed": self._confirmed,
+                },
+                f,
+            )
+        os.replace(temp, self._path)
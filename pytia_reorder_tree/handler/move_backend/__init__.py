@@ -0,0 +1,7 @@
+"""
+    Move backend submodule.
+    Backends that move rows in the reorder list box, see `MoveBackendProtocol`.
+
+    Important: Keep this file free of imports. The simulated backend must work
+    without pywinauto.
+"""
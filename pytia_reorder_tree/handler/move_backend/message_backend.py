@@ -0,0 +1,102 @@
+"""
+    Message move backend.
+    Moves the rows by sending the window messages of the clicks and selections
+    directly to the reorder window.
+"""
+
+from typing import List
+
+from pywinauto import win32defines
+from pywinauto.controls.win32_controls import ButtonWrapper
+from pywinauto.controls.win32_controls import ListBoxWrapper
+
+
+class MessageBackend:
+    """
+    Fast path of the pywinauto backend. Instead of simulating the mouse, the list
+    box selection is set with LB_SETSEL (LB_SETCURSEL for single selection list
+    boxes) and the dialog is notified with LBN_SELCHANGE. Clicks are sent as
+    BN_CLICKED notifications. Messages are sent synchronously, so the window has
+    handled each click before the next one is sent, without any waiting time.
+    """
+
+    def __init__(
+        self,
+        list_box: ListBoxWrapper,
+        btn_up: ButtonWrapper,
+        btn_down: ButtonWrapper,
+        btn_apply: ButtonWrapper,
+    ) -> None:
+        """Inits the class.
+
+        Args:
+            list_box (ListBoxWrapper): The list box of the reorder window.
+            btn_up (ButtonWrapper): The `move up` button.
+            btn_down (ButtonWrapper): The `move down` button.
+            btn_apply (ButtonWrapper): The `apply` button.
+        """
+        self._list_box = list_box
+        self._dialog = list_box.parent()
+        self._multi_selection = not list_box.is_single_selection()
+
+        self._selchange = _make_wparam(
+            list_box.control_id(), win32defines.LBN_SELCHANGE
+        )
+        self._up = _make_wparam(btn_up.control_id(), win32defines.BN_CLICKED)
+        self._up_handle = btn_up.handle
+        self._down = _make_wparam(btn_down.control_id(), win32defines.BN_CLICKED)
+        self._down_handle = btn_down.handle
+        # Apply is rare, it's clicked like a user would do.
+        self._btn_apply = btn_apply
+
+    @property
+    def multi_selection(self) -> bool:
+        """Returns wether the list box allows to select multiple rows."""
+        return self._multi_selection
+
+    def item_texts(self) -> List[str]:
+        """Returns the text of all rows of the list box."""
+        return list(self._list_box.item_texts())
+
+    def select(self, row: int, count: int = 1) -> None:
+        """Selects `count` rows, starting at `row`. Deselects all other rows."""
+        if self._multi_selection:
+            rows = range(row, row + count)
+            for selected in self._list_box.selected_indices():
+                if selected not in rows:
+                    self._list_box.send_message(win32defines.LB_SETSEL, False, selected)
+            for selected in rows:
+                self._list_box.send_message(win32defines.LB_SETSEL, True, selected)
+        else:
+            self._list_box.send_message(win32defines.LB_SETCURSEL, row, 0)
+
+        # Selections set by message are not notified by the list box itself.
+        self._dialog.send_message(
+            win32defines.WM_COMMAND, self._selchange, self._list_box.handle
+        )
+
+    def selected_rows(self) -> List[int]:
+        """Returns the rows the list box shows as selected."""
+        return list(self._list_box.selected_indices())
+
+    def move_up(self) -> None:
+        """Clicks the `move up` button once."""
+        self._dialog.send_message(win32defines.WM_COMMAND, self._up, self._up_handle)
+
+    def move_down(self) -> None:
+        """Clicks the `move down` button once."""
+        self._dialog.send_message(
+            win32defines.WM_COMMAND, self._down, self._down_handle
+        )
+
+    def apply(self) -> None:
+        """Clicks the `apply` button."""
+        self._btn_apply.click()
+
+    def out_of_sync(self) -> None:
+        """Messages are sent synchronously, there are no waits to raise."""
+
+
+def _make_wparam(low: int, high: int) -> int:
+    """Returns the WPARAM of a WM_COMMAND notification."""
+    return (high & 0xFFFF) << 16 | (low & 0xFFFF)
@@ -0,0 +1,85 @@
+"""
+    Pywinauto move backend.
+    Moves the rows with the pywinauto wrappers of the reorder window.
+"""
+
+from typing import List
+
+from handler.move_backend.timings import AutomationTimings
+from pywinauto.controls.win32_controls import ButtonWrapper
+from pywinauto.controls.win32_controls import ListBoxWrapper
+
+
+class PywinautoBackend:
+    """
+    Selects rows and clicks the buttons with the pywinauto wrappers. Each action
+    waits for the pywinauto timings, which makes this the slowest, but the most
+    robust backend.
+    """
+
+    def __init__(
+        self,
+        list_box: ListBoxWrapper,
+        btn_up: ButtonWrapper,
+        btn_down: ButtonWrapper,
+        btn_apply: ButtonWrapper,
+        timings: AutomationTimings | None = None,
+    ) -> None:
+        """Inits the class.
+
+        Args:
+            list_box (ListBoxWrapper): The list box of the reorder window.
+            btn_up (ButtonWrapper): The `move up` button.
+            btn_down (ButtonWrapper): The `move down` button.
+            btn_apply (ButtonWrapper): The `apply` button.
+            timings (AutomationTimings | None, optional): The calibrated waits, \
+                raised after a missed click. Keeps the pywinauto defaults if None. \
+                Defaults to None.
+        """
+        self._list_box = list_box
+        self._btn_up = btn_up
+        self._btn_down = btn_down
+        self._btn_apply = btn_apply
+        self._timings = timings
+        self._multi_selection = not list_box.is_single_selection()
+
+    @property
+    def multi_selection(self) -> bool:
+        """Returns wether the list box allows to select multiple rows."""
+        return self._multi_selection
+
+    def item_texts(self) -> List[str]:
+        """Returns the text of all rows of the list box."""
+        return list(self._list_box.item_texts())
+
+    def select(self, row: int, count: int = 1) -> None:
+        """Selects `count` rows, starting at `row`. Deselects all other rows."""
+        if not self._multi_selection:
+            self._list_box.select(row)
+            return
+
+        for selected in self._list_box.selected_indices():
+            self._list_box.select(selected, select=False)
+        for selected in range(row, row + count):
+            self._list_box.select(selected)
+
+    def selected_rows(self) -> List[int]:
+        """Returns the rows the list box shows as selected."""
+        return list(self._list_box.selected_indices())
+
+    def move_up(self) -> None:
+        """Clicks the `move up` button once."""
+        self._btn_up.click()
+
+    def move_down(self) -> None:
+        """Clicks the `move down` button once."""
+        self._btn_down.click()
+
+    def apply(self) -> None:
+        """Clicks the `apply` button."""
+        self._btn_apply.click()
+
+    def out_of_sync(self) -> None:
+        """Raises the waits, a click was probably faster than the window."""
+        if self._timings is not None:
+            self._timings.raise_waits()
@@ -0,0 +1,122 @@
+"""
+    Simulated move backend.
+    Pure python model of the reorder list box, for tests and benchmarks.
+"""
+
+from time import sleep
+from typing import List
+from typing import Sequence
+
+
+class SimulatedBackend:
+    """
+    Simulates the list box and the `move up` and `move down` buttons of the reorder
+    window. Counts all clicks, selections and reads, so the cost of a sort run can
+    be measured without CATIA.
+    """
+
+    def __init__(
+        self,
+        items: Sequence[str],
+        multi_selection: bool = True,
+        block_moves: bool = True,
+        latency: float = 0.0,
+    ) -> None:
+        """Inits the class.
+
+        Args:
+            items (Sequence[str]): The rows of the list box.
+            multi_selection (bool, optional): Wether the list box allows to select \
+                multiple rows. Defaults to True.
+            block_moves (bool, optional): Wether a click moves all selected rows. If \
+                False, only the first selected row is moved, like a window that \
+                allows multiple selections but ignores them. Defaults to True.
+            latency (float, optional): The time in seconds each click takes. \
+                Defaults to 0.
+        """
+        self._items = list(items)
+        self._multi_selection = multi_selection
+        self._block_moves = block_moves
+        self._latency = latency
+        self._selected: List[int] = []
+
+        self.clicks = 0
+        self.selections = 0
+        self.reads = 0
+        self.out_of_syncs = 0
+        self.applied: List[str] = list(items)
+
+    @property
+    def multi_selection(self) -> bool:
+        """Returns wether the list box allows to select multiple rows."""
+        return self._multi_selection
+
+    @property
+    def items(self) -> List[str]:
+        """Returns the rows of the list box without counting a read."""
+        return list(self._items)
+
+    @property
+    def selected(self) -> List[int]:
+        """Returns the selected rows."""
+        return list(self._selected)
+
+    def item_texts(self) -> List[str]:
+        """Returns the text of all rows of the list box."""
+        self.reads += 1
+        return list(self._items)
+
+    def select(self, row: int, count: int = 1) -> None:
+        """Selects `count` rows, starting at `row`.
+
+        Raises:
+            ValueError: Raised when the selection is out of range, or when multiple \
+                rows are selected in a single selection list box.
+        """
+        if count > 1 and not self._multi_selection:
+            raise ValueError("The list box doesn't allow to select multiple rows.")
+        if row < 0 or count < 1 or row + count > len(self._items):
+            raise ValueError(f"Cannot select {count} rows at row {row}.")
+        self.selections += 1
+        self._selected = list(range(row, row + count))
+
+    def selected_rows(self) -> List[int]:
+        """Returns the selected rows, counts a read."""
+        self.reads += 1
+        return list(self._selected)
+
+    def move_up(self) -> None:
+        """Clicks the `move up` button once."""
+        self._click()
+        rows = self._moving_rows()
+        if rows and rows[0] > 0:
+            first, last = rows[0], rows[-1]
+            self._items.insert(last, self._items.pop(first - 1))
+            self._selected = [row - 1 for row in rows]
+
+    def move_down(self) -> None:
+        """Clicks the `move down` button once."""
+        self._click()
+        rows = self._moving_rows()
+        if rows and rows[-1] < len(self._items) - 1:
+            first, last = rows[0], rows[-1]
+            self._items.insert(first, self._items.pop(last + 1))
+            self._selected = [row + 1 for row in rows]
+
+    def apply(self) -> None:
+        """Stores the current order of the list box as applied order."""
+        self.applied = list(self._items)
+
+    def out_of_sync(self) -> None:
+        """Counts the missed clicks."""
+        self.out_of_syncs += 1
+
+    def _click(self) -> None:
+        """Counts the click and waits for the latency."""
+        self.clicks += 1
+        if self._latency:
+            sleep(self._latency)
+
+    def _moving_rows(self) -> List[int]:
+        """Returns the rows that are moved by a click."""
+        return self._selected if self._block_moves else self._selected[:1]
@@ -0,0 +1,107 @@
+"""
+    Automation timings.
+    Calibrates the wait times of pywinauto for this workstation.
+"""
+
+from typing import Dict
+
+from algorithm.calibration import measure_latency
+from const import TIMING_MARGIN
+from const import TIMING_MAX_WAIT
+from const import TIMING_MIN_WAIT
+from protocols.move_backend_protocol import MoveBackendProtocol
+from pytia.log import log
+from pywinauto.timings import Timings
+
+WAIT_CLICK = "after_click_wait"
+WAIT_BUTTON_CLICK = "after_button_click_wait"
+WAIT_LIST_BOX_SELECT = "after_listboxselect_wait"
+WAITS = (WAIT_CLICK, WAIT_BUTTON_CLICK, WAIT_LIST_BOX_SELECT)
+
+
+class AutomationTimings:
+    """
+    Per-action wait times of pywinauto. The defaults of pywinauto are tuned for the
+    slowest machine, the calibrated waits are the measured latency of CATIA with a
+    safety margin. The waits are stored in the appdata config.
+    """
+
+    def __init__(self, stored: Dict[str, float]) -> None:
+        """Inits the class.
+
+        Args:
+            stored (Dict[str, float]): The stored waits by their pywinauto name, e.g. \
+                the timings of the appdata config. Updated by the calibration.
+        """
+        self._stored = stored
+
+    @property
+    def calibrated(self) -> bool:
+        """Returns wether calibrated waits are stored."""
+        return all(name in self._stored for name in WAITS)
+
+    def apply(self) -> None:
+        """Sets the stored waits in pywinauto."""
+        for name, value in self._stored.items():
+            if name in WAITS:
+                setattr(Timings, name, value)
+        log.info(f"Applied automation timings: {self._stored}.")
+
+    def calibrate(self, backend: MoveBackendProtocol) -> None:
+        """Measures the latency of the list box with all waits disabled, then stores
+        and applies the waits. Keeps the pywinauto defaults if the measurement fails.
+
+        Args:
+            backend (MoveBackendProtocol): The backend that uses the pywinauto waits.
+        """
+        defaults = {name: getattr(Timings, name) for name in WAITS}
+        for name in WAITS:
+            setattr(Timings, name, 0.0)
+
+        try:
+            latency = measure_latency(backend)
+        except TimeoutError as e:
+            log.warning(f"Failed to calibrate the automation timings: {e}")
+            latency = None
+
+        if latency is None:
+            for name, value in defaults.items():
+                setattr(Timings, name, value)
+            return
+
+        log.info(
+            f"Measured a latency of {latency.click:.3f}s per click and "
+            f"{latency.select:.3f}s per selection."
+        )
+        self._stored.update(
+            {
+                WAIT_CLICK: _clamp(latency.click * TIMING_MARGIN),
+                # The click wait covers the button as well.
+                WAIT_BUTTON_CLICK: 0.0,
+                WAIT_LIST_BOX_SELECT: _clamp(latency.select * TIMING_MARGIN),
+            }
+        )
+        self.apply()
+
+    def raise_waits(self, factor: float = TIMING_MARGIN) -> None:
+        """Raises the waits after a missed click. Stores the raised waits, so the
+        next run starts with them.
+
+        Args:
+            factor (float, optional): The factor for all waits. Defaults to the \
+                timing margin.
+        """
+        self._stored.update(
+            {
+                name: _clamp(getattr(Timings, name) * factor)
+                for name in (WAIT_CLICK, WAIT_LIST_BOX_SELECT)
+            }
+        )
+        self._stored.setdefault(WAIT_BUTTON_CLICK, Timings.after_button_click_wait)
+        log.warning("Raised the automation timings after a missed click.")
+        self.apply()
+
+
+def _clamp(value: float) -> float:
+    """Limits the wait to the minimum and maximum wait."""
+    return round(min(max(value, TIMING_MIN_WAIT), TIMING_MAX_WAIT), 4)
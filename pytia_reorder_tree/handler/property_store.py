@@ -0,0 +1,189 @@
+"""
+    Property store submodule.
+    Keeps the sort relevant properties of reference products on disk, so they
+    don't have to be read over COM again in the next run.
+"""
+
+import json
+import sqlite3
+import time
+from contextlib import closing
+from hashlib import sha1
+from pathlib import Path
+from typing import Collection
+from typing import Dict
+from typing import List
+from typing import Mapping
+from typing import Tuple
+
+from const import PROPERTY_CACHE_MAX_AGE
+
+# Increase the schema version if the table changes, old tables are dropped.
+SCHEMA_VERSION = 1
+
+StoredProperties = Tuple[int | None, Dict[str, str]]
+
+
+class PropertyStore:
+    """
+    SQLite cache of the reference product properties of a document. Entries are
+    keyed by the document path, the part number and the set of property names (a
+    different sort key needs other properties). Each entry holds a change
+    indicator of the reference product (e.g. the path and the modification time of
+    its file), an entry is only used if the indicator is the same.
+
+    All entries of the document are loaded at once, new entries are written in a
+    single transaction by `flush`. Entries that haven't been used for `max_age`
+    seconds are evicted. The store never fails the task: If the database can't be
+    used, the store stays empty and `error` is set.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        document: str,
+        names: Collection[str],
+        max_age: float = PROPERTY_CACHE_MAX_AGE,
+    ) -> None:
+        """Inits the class. Evicts stale entries and loads the entries of the
+        document.
+
+        Args:
+            path (Path): The path of the database file.
+            document (str): The full path of the document.
+            names (Collection[str]): The names of the cached properties.
+            max_age (float, optional): Entries not used for this many seconds are \
+                evicted. Defaults to PROPERTY_CACHE_MAX_AGE.
+        """
+        self._path = path
+        self._document = document.lower()
+        self._names = sha1("\n".join(sorted(names)).encode("utf8")).hexdigest()
+        self._max_age = max_age
+        self._rows: Dict[str, Tuple[str, int | None, Dict[str, str]]] = {}
+        self._pending: Dict[str, Tuple[str, int | None, Dict[str, str]]] = {}
+        self._used: List[str] = []
+        self.error: str | None = None
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get(self, part_number: str, indicator: str) -> StoredProperties | None:
+        """Returns the stored source and properties of the reference product.
+
+        Args:
+            part_number (str): The part number of the reference product.
+            indicator (str): The current change indicator of the reference product.
+
+        Returns:
+            StoredProperties | None: The source and the properties, None if they \
+                are not stored or the indicator has changed.
+        """
+        row = self._rows.get(part_number)
+        if row is None or row[0] != indicator:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._used.append(part_number)
+        return row[1], dict(row[2])
+
+    def put(
+        self,
+        part_number: str,
+        indicator: str,
+        source: int | None,
+        properties: Mapping[str, str],
+    ) -> None:
+        """Stores the source and the properties of the reference product. Written
+        to the database by `flush`.
+
+        Args:
+            part_number (str): The part number of the reference product.
+            indicator (str): The change indicator of the reference product.
+            source (int | None): The source of the reference product.
+            properties (Mapping[str, str]): The properties.
+        """
+        row = (indicator, source, dict(properties))
+        self._rows[part_number] = self._pending[part_number] = row
+
+    def flush(self) -> None:
+        """Writes the new entries and the usage of the loaded entries."""
+        if self.error is not None or not (self._pending or self._used):
+            return
+        now = time.time()
+        try:
+            with closing(self._connect()) as connection, connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO properties VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            self._document,
+                            part_number,
+                            self._names,
+                            indicator,
+                            source,
+                            json.dumps(properties),
+                            now,
+                        )
+                        for part_number, (indicator, source, properties) in (
+                            self._pending.items()
+                        )
+                    ],
+                )
+                connection.executemany(
+                    "UPDATE properties SET used = ? "
+                    "WHERE document = ? AND part_number = ? AND names = ?",
+                    [
+                        (now, self._document, part_number, self._names)
+                        for part_number in self._used
+                    ],
+                )
+        except (sqlite3.Error, OSError) as e:
+            self.error = str(e)
+        self._pending.clear()
+        self._used.clear()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Opens the database. A connection is opened per operation, so the store
+        can be used from any thread."""
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        return sqlite3.connect(self._path, timeout=5.0)
+
+    def _load(self) -> None:
+        """Creates the table, evicts stale entries and loads the entries of the
+        document."""
+        try:
+            with closing(self._connect()) as connection, connection:
+                version = connection.execute("PRAGMA user_version").fetchone()[0]
+                if version != SCHEMA_VERSION:
+                    connection.execute("DROP TABLE IF EXISTS properties")
+                    connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS properties ("
+                    "document TEXT NOT NULL, "
+                    "part_number TEXT NOT NULL, "
+                    "names TEXT NOT NULL, "
+                    "indicator TEXT NOT NULL, "
+                    "source INTEGER, "
+                    "properties TEXT NOT NULL, "
+                    "used REAL NOT NULL, "
+                    "PRIMARY KEY (document, part_number, names))"
+                )
+                connection.execute(
+                    "DELETE FROM properties WHERE used < ?",
+                    (time.time() - self._max_age,),
+                )
+                rows = connection.execute(
+                    "SELECT part_number, indicator, source, properties "
+                    "FROM properties WHERE document = ? AND names = ?",
+                    (self._document, self._names),
+                ).fetchall()
+        except (sqlite3.Error, OSError) as e:
+            self.error = str(e)
+            return
+        self._rows = {
+            part_number: (indicator, source, json.loads(properties))
+            for part_number, indicator, source, properties in rows
+        }
@@ -5,6 +5,8 @@
 
 from pycatia.in_interfaces.application import Application
 from pywinauto import Desktop
+from pywinauto.timings import Timings
+from pywinauto.timings import wait_until_passes
 
 
 class BaseWindow:
@@ -34,3 +36,15 @@ class BaseWindow:
                 window.set_focus()
                 self._window = window
         assert self._window is not None
+
+    def _wait_for_window(self) -> None:
+        """
+        Polls all open windows until the window exists, instead of waiting a fixed
+        time after the command has been issued.
+        """
+        wait_until_passes(
+            timeout=Timings.window_find_timeout,
+            retry_interval=Timings.window_find_retry,
+            func=self._get_window,
+            exceptions=AssertionError,
+        )
@@ -3,7 +3,6 @@
     This module handles the properties window of product tree nodes.
 """
 
-from time import sleep
 from tkinter import messagebox as tkmsg
 
 from exceptions import WindowNotConnectedError
@@ -53,8 +52,7 @@ class PropertyWindow(BaseWindow, WindowProtocol):
             log.info(f"Command {resource.applied_keywords.props_cmd_name!r} issued.")
 
             log.info("Connecting to 'properties' window...")
-            sleep(1)  # TODO: Make this not depending on sleep
-            self._get_window()
+            self._wait_for_window()
             self._get_window_children()
 
             log.info(
@@ -3,14 +3,24 @@
     This module handles the graph tree window command.
 """
 
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
 from time import sleep
+from typing import Callable
 
 from app.vars import Variables
+from const import CANCEL_POLL_INTERVAL
 from exceptions import WindowNotConnectedError
+from handler.move_backend.message_backend import MessageBackend
+from handler.move_backend.pywinauto_backend import PywinautoBackend
+from handler.move_backend.timings import AutomationTimings
 from handler.window_handler import BaseWindow
+from protocols.move_backend_protocol import MoveBackendProtocol
 from protocols.window_protocol import WindowProtocol
 from pycatia.in_interfaces.application import Application
 from pytia.log import log
+from pywinauto import handleprops
 from pywinauto.controls.win32_controls import ButtonWrapper
 from pywinauto.controls.win32_controls import ListBoxWrapper
 from resources import resource
@@ -38,6 +48,10 @@ class ReorderWindow(BaseWindow, WindowProtocol):
         self._btn_down: ButtonWrapper | None = None
         self._list_box: ListBoxWrapper | None = None
 
+        self._connecting: Future | None = None
+        self._started = 0.0
+        self._connect_duration: float | None = None
+
     def connect(self) -> None:
         """Connects to the reorder graph tree window.
 
@@ -49,25 +63,119 @@ class ReorderWindow(BaseWindow, WindowProtocol):
             WindowNotConnectedError: Raised then no connection to the window can be
             established.
         """
+        self._start_command()
+        self._connect_window()
+
+    def connect_in_background(self) -> None:
+        """Issues the reorder command, and connects to the window in a background
+        thread while CATIA opens it. The caller goes on, `join` waits for the
+        connection. The background thread only uses the windows API, neither COM
+        nor the UI of the app.
+
+        Requires:
+            The product tree nodes must be selected (CATIA.Document.Selection) before
+            calling this method.
+
+        Raises:
+            WindowNotConnectedError: Raised when the command can't be issued.
+        """
+        self._start_command()
+        executor = ThreadPoolExecutor(max_workers=1)
+        self._connecting = executor.submit(self._connect_window)
+        # The thread ends with the connection, the executor doesn't wait for it.
+        executor.shutdown(wait=False)
+
+    def join(self, poll: Callable[[], None] | None = None) -> None:
+        """Waits until the background thread has connected to the window.
+
+        Args:
+            poll (Callable[[], None] | None, optional): Called while waiting, e.g. \
+                to process the UI events. Exceptions of the poll are raised, the \
+                connection goes on in the background. Defaults to None.
+
+        Raises:
+            WindowNotConnectedError: Raised then no connection to the window can be
+            established.
+        """
+        assert self._connecting is not None
+        while poll is not None and not self._connecting.done():
+            poll()
+            sleep(CANCEL_POLL_INTERVAL)
+        self._connecting.result()
+
+    @property
+    def handle(self) -> int:
+        """Returns the handle of the connected window."""
+        assert self._window is not None
+        return self._window.handle
+
+    @property
+    def exists(self) -> bool:
+        """Returns wether the connected window is still open. The user can close it
+        at any time, e.g. with the escape key."""
+        return self._window is not None and bool(
+            handleprops.iswindow(self._window.handle)
+        )
+
+    def close(self, apply: bool) -> bool:
+        """Closes the window, if it's still open.
+
+        Args:
+            apply (bool): Wether to apply the order of the list box and close the \
+                window with OK. Clicks abort otherwise.
+
+        Returns:
+            bool: Wether the window has been closed, False if it had already been \
+                closed.
+        """
+        if not self.exists:
+            log.info("The reorder window has already been closed.")
+            return False
+        if apply:
+            self.btn_apply.click()
+            self.btn_ok.click()
+        else:
+            self.btn_abort.click()
+        return True
+
+    @property
+    def connect_duration(self) -> float | None:
+        """Returns the seconds from the command until the connection to the window,
+        None if not connected."""
+        return self._connect_duration
+
+    def _start_command(self) -> None:
+        """Issues the reorder command, CATIA opens the window asynchronously."""
+        self._started = perf_counter()
         try:
             self._caa.start_command(resource.applied_keywords.reorder_cmd_name)
             log.info(f"Command {resource.applied_keywords.reorder_cmd_name!r} issued.")
-
             self._vars.status.set("Connecting to 'reorder graph tree' window...")
-            sleep(1)  # TODO: Make this not depending on sleep
-            self._get_window()
-            self._get_window_children()
+        except Exception as e:
+            raise self._not_connected() from e
 
-            log.info(
-                f"Connected to {resource.applied_keywords.reorder_window_name!r} window."
-            )
+    def _connect_window(self) -> None:
+        """Waits for the window and assigns its controls."""
+        try:
+            self._wait_for_window()
+            self._get_window_children()
         except Exception as e:
-            raise WindowNotConnectedError(
-                f"Failed to connect to {resource.applied_keywords.reorder_window_name!r} "
-                "window. This may be caused by an inactive window or a timeout in the "
-                "connection.",
-                with_trace=False,
-            ) from e
+            raise self._not_connected() from e
+        self._connect_duration = perf_counter() - self._started
+        log.info(
+            f"Connected to {resource.applied_keywords.reorder_window_name!r} window "
+            f"after {self._connect_duration:.1f}s."
+        )
+
+    @staticmethod
+    def _not_connected() -> WindowNotConnectedError:
+        """Returns the error for a failed connection."""
+        return WindowNotConnectedError(
+            f"Failed to connect to {resource.applied_keywords.reorder_window_name!r} "
+            "window. This may be caused by an inactive window or a timeout in the "
+            "connection.",
+            with_trace=False,
+        )
 
     def _get_window_children(self) -> None:
         """Assigns the window elements to the appropriate properties."""
@@ -96,6 +204,40 @@ class ReorderWindow(BaseWindow, WindowProtocol):
             ]
         )
 
+    def create_move_backend(self) -> MoveBackendProtocol:
+        """Returns the backend that moves the rows of the list box, as set in the
+        settings (tree.move_backend)."""
+        if resource.settings.tree.move_backend == "message":
+            log.info("Using window messages to move the tree items.")
+            return MessageBackend(
+                list_box=self.list_box,
+                btn_up=self.btn_up,
+                btn_down=self.btn_down,
+                btn_apply=self.btn_apply,
+            )
+        if not resource.settings.tree.calibrate_timings:
+            return PywinautoBackend(
+                list_box=self.list_box,
+                btn_up=self.btn_up,
+                btn_down=self.btn_down,
+                btn_apply=self.btn_apply,
+            )
+
+        timings = AutomationTimings(stored=resource.appdata.timings)
+        backend = PywinautoBackend(
+            list_box=self.list_box,
+            btn_up=self.btn_up,
+            btn_down=self.btn_down,
+            btn_apply=self.btn_apply,
+            timings=timings,
+        )
+        if timings.calibrated:
+            timings.apply()
+        else:
+            self._vars.status.set("Calibrating automation timings...")
+            timings.calibrate(backend=backend)
+        return backend
+
     @property
     def btn_ok(self) -> ButtonWrapper:
         assert self._btn_ok is not None
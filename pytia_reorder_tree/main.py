@@ -5,6 +5,7 @@
     Main module for the app.
 """
 
+import argparse
 import atexit
 import os
 
@@ -18,14 +19,38 @@ from dependencies import deps
 def main() -> None:
     """Application entry point."""
 
+    parser = argparse.ArgumentParser(description="PYTIA Reorder Tree")
+    parser.add_argument(
+        "--dry-run",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="FILE",
+        help=(
+            "Plans the reorder without modifying the document, and writes the plan "
+            "to the given JSON file (to the export folder if omitted)."
+        ),
+    )
+    parser.add_argument(
+        "--selection",
+        action="store_true",
+        help=(
+            "Sorts only the selected nodes into the tree, which must be sorted "
+            "otherwise. Much faster for a few new nodes in a large assembly."
+        ),
+    )
+    args = parser.parse_args()
+
     # For the apps auto-install-feature, all required dependencies must be
     # imported after they have been checked.
     # So: First check if all required dependencies are installed.
     # Afterwards import those modules which depend on third party modules.
     deps.install_dependencies()
 
+    from algorithm.collation import set_collation_locale  # pylint: disable=C0415
     from gui import GUI  # pylint: disable=C0415
     from pytia.log import log  # pylint: disable=C0415
+    from resources import resource  # pylint: disable=C0415
 
     with open(PID_FILE, "w", encoding="utf8") as f:
         f.write(str(PID))
@@ -36,7 +61,13 @@ def main() -> None:
     log.set_level_warning()
     log.info(f"Running PYTIA Reorder Tree {APP_VERSION}, PID={PID}")
 
-    gui = GUI()
+    # The collation locale is process-wide, it's set once before any sort runs.
+    try:
+        set_collation_locale(resource.settings.tree.collation_locale)
+    except ValueError as e:
+        log.warning(f"Failed to set the collation locale: {e}")
+
+    gui = GUI(dry_run=args.dry_run, selection=args.selection)
     gui.run()
 
 
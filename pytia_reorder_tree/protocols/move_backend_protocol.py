@@ -0,0 +1,49 @@
+"""
+    Move-Backend-Protocol submodule.
+"""
+
+from typing import List
+from typing import Protocol
+
+
+class MoveBackendProtocol(Protocol):
+    """
+    Protocol for the backends that move rows in the reorder list box.
+
+    The sort algorithm depends only on this protocol, so the fastest backend can be
+    chosen per site, and the algorithm can be tested with a simulated list box.
+    """
+
+    @property
+    def multi_selection(self) -> bool:
+        """Returns wether the list box allows to select multiple rows."""
+        ...
+
+    def item_texts(self) -> List[str]:
+        """Returns the text of all rows of the list box."""
+        ...
+
+    def select(self, row: int, count: int = 1) -> None:
+        """Selects `count` rows, starting at `row`. Deselects all other rows."""
+        ...
+
+    def selected_rows(self) -> List[int]:
+        """Returns the rows the list box shows as selected."""
+        ...
+
+    def move_up(self) -> None:
+        """Clicks the `move up` button once."""
+        ...
+
+    def move_down(self) -> None:
+        """Clicks the `move down` button once."""
+        ...
+
+    def apply(self) -> None:
+        """Applies the current order of the list box to the product tree."""
+        ...
+
+    def out_of_sync(self) -> None:
+        """Called when the list box differs from the expected rows, e.g. after a
+        missed click. Backends with wait times raise them."""
+        ...
@@ -21,6 +21,8 @@ from typing import List
 from typing import Literal
 from typing import Optional
 from typing import Protocol
+from typing import get_args
+from typing import get_origin
 
 from const import APP_VERSION
 from const import APPDATA
@@ -87,6 +89,22 @@ class SettingsGroupsItem:
     source: int
 
 
+@dataclass(slots=True, kw_only=True, frozen=True)
+class SettingsSortKey:
+    """Dataclass for a sort key column (settings.json)."""
+
+    field: Literal["source", "part_number", "name", "property"]
+    property: str | None = None
+    sources: List[int] | None = None
+    descending: bool = False
+    missing: Literal["empty", "first", "last"] = "empty"
+    collation: str | None = None
+    section: bool = False
+
+    def __post_init__(self) -> None:
+        _check_literals(self, "tree.sort_keys")
+
+
 @dataclass(slots=True, kw_only=True, frozen=True)
 class SettingsTree:
     """Dataclass for tree options (settings.json)."""
@@ -96,8 +114,27 @@ class SettingsTree:
     group_postfix: str
     IN_delimiter: str
     IN_position: int
+    node_label: str | None = None
+    sort_keys: List[SettingsSortKey] | None = None
+    collation: Literal["plain", "natural", "locale", "natural_locale"] = "plain"
+    collation_locale: str | None = None
     renumber: bool
     start_index: int
+    verify_interval: int = 100
+    block_moves: bool = True
+    time_budget_seconds: float | None = None
+    on_cancel: Literal["abort", "apply"] = "abort"
+    repair_attempts: int = 3
+    journal_interval: int = 500
+    engine: Literal["auto", "window", "api"] = "window"
+    move_backend: Literal["pywinauto", "message"] = "pywinauto"
+    calibrate_timings: bool = True
+    property_cache: bool = True
+    reader_threads: int = 1
+    prefetch: bool = True
+
+    def __post_init__(self) -> None:
+        _check_literals(self, "tree")
 
 
 @dataclass(slots=True, kw_only=True, frozen=True)
@@ -134,7 +171,10 @@ class Settings:  # pylint: disable=R0902
         self.paths = SettingsPaths(**dict(self.paths))  # type: ignore
         self.files = SettingsFiles(**dict(self.files))  # type: ignore
         # self.groups = [SettingsGroupsItem(**dict(i)) for i in self.groups]  # type: ignore
-        self.tree = SettingsTree(**dict(self.tree))  # type: ignore
+        tree = dict(self.tree)  # type: ignore
+        if tree.get("sort_keys") is not None:
+            tree["sort_keys"] = [SettingsSortKey(**dict(i)) for i in tree["sort_keys"]]
+        self.tree = SettingsTree(**tree)
         self.urls = SettingsUrls(**dict(self.urls))  # type: ignore
         self.mails = SettingsMails(**dict(self.mails))  # type: ignore
 
@@ -181,6 +221,7 @@ class KeywordElements:
     props_node_apply: str
     props_node_close: str
     props_node_bom: str
+    search_product: str
 
 
 @dataclass
@@ -227,6 +268,7 @@ class AppData:
     version: str = field(default=APP_VERSION)
     counter: int = 0
     disable_volume_warning: bool = False
+    timings: Dict[str, float] = field(default_factory=dict)
 
     def __post_init__(self) -> None:
         self.version = (
@@ -235,6 +277,24 @@ class AppData:
         self.counter += 1
 
 
+def _check_literals(instance: DataclassProtocol, section: str) -> None:
+    """Checks the values of all fields that allow only a fixed set of values.
+
+    Raises:
+        ValueError: Raised when a field has a value that isn't allowed.
+    """
+    for item in fields(instance):  # type: ignore
+        if get_origin(item.type) is not Literal:
+            continue
+        if (value := getattr(instance, item.name)) not in (
+            options := get_args(item.type)
+        ):
+            raise ValueError(
+                f"Invalid value {value!r} for {section}.{item.name} in "
+                f"{CONFIG_SETTINGS}, must be one of {', '.join(map(repr, options))}."
+            )
+
+
 class Resources:  # pylint: disable=R0902
     """Class for handling resource files."""
 
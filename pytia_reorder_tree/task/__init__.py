@@ -2,13 +2,55 @@
     App submodule. Handles the workflow.
 """
 
+from pathlib import Path
+from time import perf_counter
 from tkinter import Tk
 from tkinter import messagebox as tkmsg
+from typing import Collection
+from typing import List
+from typing import Sequence
+from typing import Tuple
 
+from algorithm.cost_model import ENGINE_API
+from algorithm.cost_model import ENGINE_AUTO
+from algorithm.cost_model import ENGINE_WINDOW
+from algorithm.cost_model import EngineCost
+from algorithm.cost_model import api_conflicts
+from algorithm.cost_model import api_cost
+from algorithm.cost_model import choose_engine
+from algorithm.cost_model import window_cost
+from algorithm.plan import PlanNode
+from algorithm.plan import build_plan
+from algorithm.plan import write_plan
+from algorithm.planner import readded_rows
+from algorithm.sort_keys import DEFAULT_SORT_KEYS
+from algorithm.sort_keys import SortKeyColumn
 from app.vars import Variables
+from const import APP_VERSION
+from const import COST_CLICK
+from const import COST_MESSAGE
+from const import COST_SELECT
 from const import ISO_VIEW
+from const import JOURNALS
+from const import PROP_GROUP_IDENTIFIER
+from const import PROP_NO_BOM
+from const import PROPERTY_CACHE
 from const import STEPS
+from const import TEMP_EXPORT
 from exceptions import WarningError
+from exceptions import WindowNotConnectedError
+from handler.cancel import CancelToken
+from handler.cancel import Cancelled
+from handler.concurrent_reader import ComApartment
+from handler.concurrent_reader import ConcurrentReader
+from handler.journal import STAGE_GROUPS
+from handler.journal import STAGE_RENUMBER
+from handler.journal import STAGE_SORT
+from handler.journal import STAGE_VIEW
+from handler.journal import Journal
+from handler.move_backend.timings import WAIT_CLICK
+from handler.move_backend.timings import WAIT_LIST_BOX_SELECT
+from handler.property_store import PropertyStore
 from handler.utils import get_ui_language
 from handler.window_handler.reorder_window import ReorderWindow
 from pycatia import catia
@@ -19,16 +61,29 @@ from pytia.framework import framework
 from pytia.log import log
 from pytia_ui_tools.handlers.workspace_handler import Workspace
 from resources import resource
+from task.api_reorder import ApiReorder
 from task.groups import Groups
 from task.permissions import Permissions
 from task.renumbering import Renumbering
+from task.snapshot import TreeSnapshot
 from task.sort import Sort
 
 
 class Task:
-    def __init__(self, root: Tk, vars: Variables) -> None:
+    def __init__(
+        self,
+        root: Tk,
+        vars: Variables,
+        dry_run: str | None = None,
+        selection: bool = False,
+        cancel: CancelToken | None = None,
+    ) -> None:
         self.root = root
         self.vars = vars
+        self.dry_run = dry_run
+        self.cancel = cancel or CancelToken(poll=root.update)
+        self.unfinished = False
+        self._constraints: bool | None = None
 
         self.caa = catia()
         self.document = ProductDocument(self.caa.active_document.com_object)
@@ -38,32 +93,172 @@ class Task:
         self.product = Product(self.document.product.com_object)
 
         self.selection = ProductDocument(self.caa.active_document.com_object).selection
+        # The selection must be read before it's cleared.
+        self.selected = self._read_selection() if selection else []
         self.selection.clear()
 
-        self.workspace = Workspace(
-            path=self.product.path(),
-            filename=resource.settings.files.workspace,
-            allow_outside_workspace=resource.settings.restrictions.allow_outside_workspace,
+        # All stages share the snapshot, the tree is read on first use. The properties
+        # of the tree are prefetched in the background while the checks run.
+        names = Sort.required_properties(self._sort_key_columns()) | {
+            resource.props.group
+        }
+        self.snapshot = TreeSnapshot(
+            product=self.product,
+            names=names,
+            store=self._create_store(names),
+            reader=self._create_reader(),
+            lazy=bool(self.selected),
         )
-        self.workspace.read_yaml()
+        # The selection mode only reads the properties of the nodes it needs.
+        if resource.settings.tree.prefetch and not self.selected:
+            self.snapshot.prefetch(apartment=ComApartment())
 
-        permissions = Permissions(workspace=self.workspace)
-        permissions.check_user_permissions()
-        permissions.check_editor_permissions()
-        permissions.check_workspace_permissions()
+        try:
+            self.workspace = Workspace(
+                path=self.product.path(),
+                filename=resource.settings.files.workspace,
+                allow_outside_workspace=resource.settings.restrictions.allow_outside_workspace,
+            )
+            self.workspace.read_yaml()
 
-        language = get_ui_language(product=self.product)
-        resource.apply_language(language)  # type: ignore
+            permissions = Permissions(workspace=self.workspace)
+            permissions.check_user_permissions()
+            permissions.check_editor_permissions()
+            permissions.check_workspace_permissions()
 
-    def run(self) -> None:
-        """Runs all tasks."""
-        self._create_groups()
-        self._sort_nodes()
-        self._renumber_nodes()
-        self._set_view()
+            language = get_ui_language(product=self.product)
+            resource.apply_language(language)  # type: ignore
+        except Exception:
+            # Discards the prefetched properties, if the user may not edit the tree.
+            self.snapshot.cancel_prefetch()
+            raise
 
+        self.journal = Journal(folder=JOURNALS, document=str(self.product.path()))
+
+    def run(self) -> None:
+        """Runs all tasks. Stages that have finished in an interrupted run on the
+        same document are skipped. Plans all tasks instead, if this is a dry run.
+        Stops at the next checkpoint, if the task gets cancelled."""
+        try:
+            if self.dry_run is not None:
+                self._plan()
+            else:
+                self._run_stages()
+        except Cancelled as e:
+            log.warning(f"{e} The journal is kept, the next run continues from there.")
+        self.snapshot.flush()
         self.root.destroy()
 
+    def _run_stages(self) -> None:
+        """Runs all stages, records the finished stages in the journal. The groups
+        are always reconciled, they don't change a tree with complete groups."""
+        kept = self.journal.check(self._fingerprint())
+        if self.journal.resumed and not kept:
+            log.info(
+                "The tree or the sort settings have changed since the interrupted "
+                f"run, the journal at {self.journal.path!r} is discarded."
+            )
+        elif self.journal.resumed:
+            log.info(
+                f"Found the journal of an interrupted run at {self.journal.path!r}, "
+                f"finished stages: {self.journal.stages}."
+            )
+
+        stages = (
+            (STAGE_GROUPS, self._create_groups, 1, False),
+            (STAGE_SORT, self._sort_nodes, 2, True),
+            (STAGE_RENUMBER, self._renumber_nodes, 1, True),
+            (STAGE_VIEW, self._set_view, 1, True),
+        )
+        if self.selected:
+            # New groups would have to be sorted into the whole tree.
+            self._update_info("Skipped groups, only the selection is sorted.")
+            stages = stages[1:]
+        for stage, run_stage, steps, resumable in stages:
+            self.cancel.raise_if_cancelled()
+            if resumable and self.journal.finished(stage):
+                log.info(f"Skipping stage {stage!r}, finished in the previous run.")
+                for _ in range(steps):
+                    self._update_info("Skipped, finished in the previous run.")
+                continue
+            start = perf_counter()
+            run_stage()
+            log.info(f"Stage {stage!r} took {perf_counter() - start:.1f}s.")
+            if self.unfinished:
+                # Renumbering would rename the rows of the reorder window, so the
+                # next run couldn't continue from the target order in the journal.
+                log.warning(
+                    "The sort is unfinished, skipped the remaining stages. The next "
+                    "run continues from the journal."
+                )
+                return
+            self.journal.finish(stage, fingerprint=self._fingerprint())
+
+        self.journal.delete()
+
+    def _fingerprint(self) -> str:
+        """Returns the fingerprint of the tree and the settings of the target order,
+        so the journal of a run with other sort settings is discarded."""
+        tree = resource.settings.tree
+        spec = repr(
+            (
+                list(self._sort_key_columns()),
+                tree.collation,
+                tree.collation_locale,
+                sorted(self.selected or ()),
+            )
+        )
+        return self.snapshot.fingerprint(spec=spec)
+
+    def _create_store(self, names: Collection[str]) -> PropertyStore | None:
+        """Returns the on-disk property cache, None if it's disabled or can't be
+        used."""
+        if not resource.settings.tree.property_cache:
+            return None
+        store = PropertyStore(
+            path=PROPERTY_CACHE, document=str(self.product.path()), names=names
+        )
+        if store.error is not None:
+            log.warning(f"The property cache is not available: {store.error}")
+            return None
+        log.info(f"Loaded {len(store)} reference products from the property cache.")
+        return store
+
+    @staticmethod
+    def _create_reader() -> ConcurrentReader | None:
+        """Returns the concurrent reader of the snapshot, None if the properties are
+        read sequentially."""
+        threads = resource.settings.tree.reader_threads
+        if threads < 2:
+            return None
+        return ConcurrentReader(threads=threads, apartment=ComApartment())
+
+    def _read_selection(self) -> List[str]:
+        """Returns the instance names of the selected children of the product, for
+        the range mode.
+
+        Raises:
+            WarningError: Raised when no child of the product is selected.
+        """
+        names: List[str] = []
+        for index in range(1, self.selection.count + 1):
+            element = self.selection.item(index)
+            if element.type != "Product":
+                continue
+            # The parent of an instance is the products collection of its father.
+            # COM objects compare by identity, names aren't unique in the tree.
+            father = element.value.com_object.Parent.Parent
+            if father == self.product.com_object:
+                names.append(element.value.name)
+
+        if not names:
+            raise WarningError(
+                "Select the nodes to sort in the tree. Only the children of the "
+                "active product can be sorted."
+            )
+        log.info(f"Sorting the selected items only: {names}.")
+        return names
+
     def _update_info(self, text: str) -> None:
         self.vars.task.set(self.vars.task.get() + 1)
         self.vars.status.set(f"Step {self.vars.task.get()} of {STEPS}: {text}")
@@ -76,7 +271,9 @@ class Task:
         groups: Groups | None = None
         if resource.settings.tree.create_groups:
             try:
-                groups = Groups(caa=self.caa, product=self.product)
+                groups = Groups(
+                    caa=self.caa, product=self.product, snapshot=self.snapshot
+                )
                 groups.create()
                 groups.exclude_from_bom()
             except Exception as e:
@@ -88,44 +285,321 @@ class Task:
                 raise WarningError(msg) from e
 
     def _sort_nodes(self) -> None:
-        self._update_info("Connecting to graph tree window...")
+        # Sorting is done prior by analyzing the graph tree (not the items in the
+        # reorder graph tree window). If the reorder window is used in any case, CATIA
+        # opens it while the sort keys are computed. The tree is read before, so no
+        # COM call competes with the opening window.
+        start = perf_counter()
+        window: ReorderWindow | None = None
+        try:
+            self.snapshot.read()
+            if self._window_engine_certain():
+                window = self._open_window()
+            sort = self._create_sort()
+            order = sort.order()
+            engine, costs = self._choose_engine(order=order, sort=sort)
+            sort.set_estimate(order=order, plan=costs[0].plan)
+        except Exception as e:
+            if window is not None:
+                self._abort_window(window)
+            if isinstance(e, (Cancelled, WindowNotConnectedError)):
+                raise
+            msg = f"Failed to sort nodes: {e}"
+            log.error(msg)
+            raise WarningError(msg) from e
+        prepared = perf_counter() - start
+
+        if engine == ENGINE_API:
+            self._sort_nodes_by_api(sort=sort)
+        else:
+            self._update_info("Connecting to graph tree window...")
+            if window is None:
+                log.info(f"Prepared the sort in {prepared:.1f}s.")
+                window = self._open_window()
+                self._join_window(window)
+            else:
+                self._join_window(window)
+                self._log_overlap(window, start=start, prepared=prepared)
+            self._sort_nodes_by_window(sort=sort, graph_tree_window=window)
+        # Only the order of the children has changed.
+        try:
+            self.snapshot.resync()
+        except ValueError as e:
+            # The reorder has finished, but the children differ from the snapshot.
+            log.warning(f"{e} Reading the tree again.")
+            self.snapshot.reload()
 
-        # Select the main product and start the reorder graph tree window
+    def _window_engine_certain(self) -> bool:
+        """Returns wether the reorder window is used, without estimating the cost of
+        the engines. Always False in the selection mode, its keys are computed from
+        properties that are read on use."""
+        if self.selected:
+            return False
+        return resource.settings.tree.engine == ENGINE_WINDOW or self._has_constraints()
+
+    def _has_constraints(self) -> bool:
+        """Returns wether the product has assembly constraints. Read only once."""
+        if self._constraints is None:
+            self._constraints = ApiReorder(product=self.product).has_constraints()
+        return self._constraints
+
+    def _open_window(self) -> ReorderWindow:
+        """Selects the main product and starts the reorder graph tree window. The
+        connection to the window is established in the background."""
         self.selection.clear()
         self.selection.add(self.product)
-        graph_tree_window = ReorderWindow(caa=self.caa, vars=self.vars)
-        graph_tree_window.connect()
+        window = ReorderWindow(caa=self.caa, vars=self.vars)
+        window.connect_in_background()
+        return window
+
+    def _join_window(self, window: ReorderWindow) -> None:
+        """Waits for the connection to the reorder window, the task can be cancelled
+        meanwhile."""
+        try:
+            window.join(poll=self.cancel.raise_if_cancelled)
+        except Cancelled:
+            self._abort_window(window)
+            raise
         self.selection.clear()
+        # The reorder window has the focus while the rows are moved. It closes
+        # itself on the escape key, so only the pause key cancels there.
+        self.cancel.watch(window.handle)
 
-        # Sort the items of the graph tree window
-        # Sorting is done prior by analyzing the graph tree (not the items in the reorder
-        # graph tree window)
+    def _abort_window(self, window: ReorderWindow) -> None:
+        """Closes the reorder window without changes, as soon as it's connected."""
         try:
-            sort = Sort(caa=self.caa)
-            sort.set_products(products=self.product.products)
-            sort.set_list_box(list_box=graph_tree_window.list_box)
-            sort.set_up_button(button=graph_tree_window.btn_up)
+            window.join()
+            window.close(apply=False)
+        except WindowNotConnectedError:
+            pass
+        self.selection.clear()
+
+    @staticmethod
+    def _log_overlap(window: ReorderWindow, start: float, prepared: float) -> None:
+        """Logs how much of the preparation of the sort has been done while CATIA
+        opened the reorder window."""
+        connected = window.connect_duration or 0.0
+        hidden = prepared + connected - (perf_counter() - start)
+        log.info(
+            f"Prepared the sort in {prepared:.1f}s while CATIA opened the reorder "
+            f"window in {connected:.1f}s, {max(hidden, 0.0):.1f}s overlapped."
+        )
+
+    def _create_sort(self, exclude: Collection[str] = ()) -> Sort:
+        """Returns the sort instance, set up from the settings."""
+        sort = Sort(caa=self.caa)
+        sort.set_sort_keys(
+            columns=self._sort_key_columns(),
+            collation=resource.settings.tree.collation,
+            locale_name=resource.settings.tree.collation_locale,
+        )
+        sort.set_snapshot(snapshot=self.snapshot, exclude=exclude)
+        if self.selected:
+            sort.set_selection(names=self.selected)
+        sort.set_journal(journal=self.journal)
+        sort.set_cancel_token(token=self.cancel)
+        if resource.settings.tree.node_label:
+            sort.set_node_label(template=resource.settings.tree.node_label)
+        else:
             sort.set_delimiter(
                 delimiter=resource.settings.tree.IN_delimiter,
                 position=resource.settings.tree.IN_position,
             )
+        return sort
+
+    def _sort_nodes_by_window(
+        self, sort: Sort, graph_tree_window: ReorderWindow
+    ) -> None:
+        # Sort the items of the graph tree window
+        try:
+            sort.set_backend(backend=graph_tree_window.create_move_backend())
             self._update_info("Sorting all nodes in the graph tree...")
             sort.sort()
+            self.unfinished = not sort.finished
 
-            graph_tree_window.btn_apply.click()
-            graph_tree_window.btn_ok.click()
+            if not graph_tree_window.close(apply=True):
+                raise Cancelled(
+                    "The reorder window has been closed, the order isn't applied."
+                )
+        except Cancelled:
+            graph_tree_window.close(apply=False)
+            raise
         except Exception as e:
+            if not graph_tree_window.exists:
+                # Closed by the user, e.g. with the escape key.
+                raise Cancelled(
+                    "The reorder window has been closed, the sort is cancelled."
+                ) from e
             msg = f"Failed to sort nodes: {e}"
             log.error(msg)
-            graph_tree_window.btn_abort.click()
+            graph_tree_window.close(apply=False)
             raise WarningError(msg) from e
 
+    def _sort_nodes_by_api(self, sort: Sort) -> None:
+        self._update_info("Skipped the graph tree window...")
+        self._update_info("Sorting all nodes in the product structure...")
+        try:
+            ApiReorder(product=self.product).reorder(
+                products=sort.products, order=sort.order(), cancel=self.cancel.check
+            )
+        except Cancelled:
+            raise
+        except Exception as e:
+            msg = f"Failed to sort nodes: {e}"
+            log.error(msg)
+            raise WarningError(msg) from e
+
+    def _choose_engine(
+        self, order: Sequence[int], sort: Sort
+    ) -> Tuple[str, List[EngineCost]]:
+        """Returns the reorder engine from the settings and the estimated cost of
+        both engines, the window engine first with its planned moves. Returns the
+        cheaper engine, if the engine is set to `auto`.
+        Returns the window engine, if the api engine would lose instance data."""
+        if resource.settings.tree.move_backend == "message":
+            click = select = COST_MESSAGE
+        elif (
+            timings := resource.appdata.timings
+        ) and resource.settings.tree.calibrate_timings:
+            click = timings.get(WAIT_CLICK, COST_CLICK) + COST_MESSAGE
+            select = timings.get(WAIT_LIST_BOX_SELECT, COST_SELECT) + COST_MESSAGE
+        else:
+            click, select = COST_CLICK, COST_SELECT
+        costs = [
+            window_cost(
+                order,
+                block_moves=resource.settings.tree.block_moves,
+                click=click,
+                select=select,
+            ),
+            api_cost(order),
+        ]
+
+        engine = resource.settings.tree.engine
+        if engine != ENGINE_WINDOW and self._has_constraints():
+            log.info("The product has constraints, using the reorder window.")
+            engine = ENGINE_WINDOW
+        elif engine != ENGINE_WINDOW and (
+            conflicts := api_conflicts(order, sort.identifier)
+        ):
+            log.info(
+                f"The api engine would re-add {len(conflicts)} group identifiers, "
+                "which would lose their BOM exclusion. Using the reorder window."
+            )
+            engine = ENGINE_WINDOW
+        elif engine != ENGINE_WINDOW and (
+            instances := ApiReorder(product=self.product).instance_data(
+                products=sort.products, rows=readded_rows(order)
+            )
+        ):
+            log.info(
+                f"The api engine would re-add {len(instances)} instances with "
+                "instance properties or publications, which would be lost. Using the "
+                "reorder window."
+            )
+            engine = ENGINE_WINDOW
+        elif engine == ENGINE_AUTO:
+            engine = choose_engine(*costs).engine
+
+        log.info(
+            f"Estimated cost of the reorder engines: {', '.join(map(str, costs))}. "
+            f"Using the {engine} engine."
+        )
+        return engine, costs
+
+    def _plan(self) -> None:
+        """Plans all stages without modifying the document, and writes the plan to
+        a JSON file (dry run)."""
+        self._update_info("Planning groups...")
+        removed: List[str] = []
+        renamed: List[Tuple[str, str]] = []
+        virtual: List[PlanNode] = []
+        if resource.settings.tree.create_groups and not self.selected:
+            groups = Groups(caa=self.caa, product=self.product, snapshot=self.snapshot)
+            changes = groups.reconcile()
+            removed = [node.name for node in changes.remove]
+            renamed = [(node.name, name) for node, name in changes.renames]
+            virtual = [
+                PlanNode(
+                    name=group.instance_name,
+                    part_number=group.name,
+                    source=group.source,
+                    properties={PROP_GROUP_IDENTIFIER: "1", PROP_NO_BOM: "1"}
+                    | ({resource.props.group: group.value} if group.value else {}),
+                    identifier=True,
+                    virtual=True,
+                )
+                for group in changes.create
+            ]
+
+        self.cancel.raise_if_cancelled()
+        self._update_info("Planning the sort order...")
+        sort = self._create_sort(exclude=removed)
+        sort.set_virtual_nodes(virtual)
+        order = sort.order()
+
+        self.cancel.raise_if_cancelled()
+        self._update_info("Planning moves...")
+        engine, costs = self._choose_engine(order=order, sort=sort)
+        moves = costs[0].plan
+        plan = {
+            "version": APP_VERSION,
+            "document": str(self.product.path()),
+        } | build_plan(
+            nodes=sort.nodes(),
+            order=order,
+            moves=moves,  # type: ignore
+            costs=costs,
+            engine=engine,
+            removed=removed,
+            renamed=renamed,
+            renumber=resource.settings.tree.renumber,
+            start_index=resource.settings.tree.start_index,
+        )
+
+        path = (
+            Path(self.dry_run)
+            if self.dry_run
+            else Path(TEMP_EXPORT, f"{self.product.part_number}.plan.json")
+        )
+        write_plan(plan, path)
+        log.info(f"Wrote the plan of the dry run to {str(path)!r}.")
+        tkmsg.showinfo(
+            title=resource.settings.title,
+            message=(
+                f"Dry run of {len(order)} nodes: {len(moves.moves)} moves with "
+                f"{moves.clicks} clicks, {len(plan['renames'])} renames.\n\n"
+                f"Estimated duration with the {engine} engine: "
+                f"{plan['estimated_seconds']}s.\n\nThe plan has been saved to:\n{path}"
+            ),
+        )
+
+    @staticmethod
+    def _sort_key_columns() -> Sequence[SortKeyColumn]:
+        """Returns the sort key columns from the settings, or the default columns."""
+        if resource.settings.tree.sort_keys is None:
+            return DEFAULT_SORT_KEYS
+        return [
+            SortKeyColumn(
+                field=column.field,
+                property=column.property,
+                sources=tuple(column.sources) if column.sources is not None else None,
+                descending=column.descending,
+                missing=column.missing,
+                collation=column.collation,
+                section=column.section,
+            )
+            for column in resource.settings.tree.sort_keys
+        ]
+
     def _renumber_nodes(self) -> None:
         self._update_info("Renumbering all nodes...")
 
         # Renumber all nodes in the product tree.
         try:
-            renumbering = Renumbering(caa=self.caa, product=self.product)
+            renumbering = Renumbering(
+                caa=self.caa, product=self.product, snapshot=self.snapshot
+            )
             renumbering.renumber_all_nodes()
         except Exception as e:
             msg = f"Failed to renumber nodes: {e}"
@@ -0,0 +1,128 @@
+"""
+    API reorder submodule.
+    Rebuilds the order of the children of a product with the Products collection.
+"""
+
+from typing import Callable
+from typing import List
+from typing import Sequence
+from typing import Tuple
+
+from algorithm.planner import readded_rows
+from handler.cancel import Cancelled
+from pycatia.product_structure_interfaces.product import Product
+from pytia.log import log
+
+
+class ApiReorder:
+    """
+    Reorders the children of a product without the reorder window. CATIA appends
+    new components at the end of the tree, so all children behind the stable prefix
+    of the target order are added again (as new instance of the same reference
+    product, with the position, name and description of the old instance) in target
+    order, and the old instances are removed.
+
+    Limitations: Everything else on the old instance (activation and representation
+    state, instance properties, the BOM exclusion) and everything that references
+    it (assembly constraints, publications) is lost. Don't use this engine on
+    products with constraints, on instances with data of their own (see
+    `instance_data`), and don't re-add group identifiers (see `api_conflicts`).
+    """
+
+    def __init__(self, product: Product) -> None:
+        """Inits the class.
+
+        Args:
+            product (Product): The product which children to reorder.
+        """
+        self._product = product
+
+    def has_constraints(self) -> bool:
+        """Returns wether the product has assembly constraints."""
+        try:
+            constraints = self._product.com_object.Connections("CATIAConstraints")
+            return constraints.Count > 0
+        except Exception as e:  # pylint: disable=W0703
+            log.warning(f"Cannot read the constraints of the product: {e}")
+            return True
+
+    def instance_data(
+        self, products: Sequence[Product], rows: Sequence[int]
+    ) -> List[str]:
+        """Returns the names of the instances, that have data of their own which a
+        new instance wouldn't get: Instance properties or publications. Instances
+        that can't be read count as having data.
+
+        Args:
+            products (Sequence[Product]): The children in tree order.
+            rows (Sequence[int]): The rows of the children to check, e.g. the \
+                re-added children (see `readded_rows`).
+
+        Returns:
+            List[str]: The names of the instances with data.
+        """
+        names: List[str] = []
+        for row in rows:
+            instance = products[row].com_object
+            try:
+                if instance.UserRefProperties.Count or instance.Publications.Count:
+                    names.append(instance.Name)
+            except Exception as e:  # pylint: disable=W0703
+                log.warning(f"Cannot read the instance data of row {row}: {e}")
+                names.append(str(row))
+        return names
+
+    def reorder(
+        self,
+        products: Sequence[Product],
+        order: Sequence[int],
+        cancel: Callable[[], bool] | None = None,
+    ) -> int:
+        """Brings the children into the target order.
+
+        Args:
+            products (Sequence[Product]): The children in tree order.
+            order (Sequence[int]): The target index of each child.
+            cancel (Callable[[], bool] | None, optional): Called before every new \
+                component. If it returns True, the new components are removed \
+                again. A partial result can't be applied, because the old and the \
+                new instances exist side by side. Defaults to None.
+
+        Raises:
+            Cancelled: Raised when the reorder has been cancelled.
+
+        Returns:
+            int: The number of re-added components.
+        """
+        moving = readded_rows(order)
+        log.info(
+            f"Re-adding {len(moving)} of {len(order)} components, the first "
+            f"{len(order) - len(moving)} stay in place."
+        )
+
+        collection = self._product.products
+        copies: List[Tuple[Product, Product]] = []
+        for index in moving:
+            if cancel is not None and cancel():
+                for _, new in copies:
+                    collection.remove(new.name)
+                raise Cancelled(
+                    f"The reorder has been cancelled, removed {len(copies)} new "
+                    "components again."
+                )
+            old = products[index]
+            new = collection.add_component(old.reference_product)
+            new.position.set_components(old.position.get_components())
+            new.description_instance = old.description_instance
+            copies.append((old, new))
+
+        # Names must be unique, the new instances get the old names after the old
+        # instances are gone.
+        names = [old.name for old, _ in copies]
+        for name in names:
+            collection.remove(name)
+        for name, (_, new) in zip(names, copies):
+            new.name = name
+
+        log.info(f"Re-added {len(copies)} components in target order.")
+        return len(copies)
@@ -3,8 +3,12 @@
     Handles the documents product flagged as group identifier.
 """
 
+from dataclasses import dataclass
+from dataclasses import field
 from typing import Dict
 from typing import List
+from typing import Set
+from typing import Tuple
 
 from const import PROP_GROUP_IDENTIFIER
 from const import PROP_NO_BOM
@@ -16,26 +20,117 @@ from pycatia.product_structure_interfaces.product_document import ProductDocumen
 from pytia.log import log
 from pytia.wrapper.properties import PyProperties
 from resources import resource
+from task.snapshot import TreeNode
+from task.snapshot import TreeSnapshot
+
+
+@dataclass(slots=True, kw_only=True, frozen=True)
+class PlannedGroup:
+    """Dataclass for a group identifier that will be created."""
+
+    name: str
+    value: str | None
+    source: int
+    index: int
+
+    @property
+    def instance_name(self) -> str:
+        """Returns the instance name of the group identifier, which is used as
+        separator in the tree."""
+        return f"{' - '*(70-len(self.name))}.{self.index}"
+
+
+@dataclass(slots=True, kw_only=True)
+class GroupChanges:
+    """Dataclass for the changes that bring the group identifiers in line with the
+    groups of the product."""
+
+    keep: List[Tuple[TreeNode, PlannedGroup]] = field(default_factory=list)
+    remove: List[TreeNode] = field(default_factory=list)
+    create: List[PlannedGroup] = field(default_factory=list)
+
+    @property
+    def renames(self) -> List[Tuple[TreeNode, str]]:
+        """Returns the kept identifiers with a new instance name, and the new name.
+        The index of a group changes if groups before it are added or removed."""
+        return [
+            (node, group.instance_name)
+            for node, group in self.keep
+            if node.name != group.instance_name
+        ]
 
 
 class Groups:
     """Groups class."""
 
-    def __init__(self, caa: Application, product: Product) -> None:
+    def __init__(
+        self, caa: Application, product: Product, snapshot: TreeSnapshot
+    ) -> None:
         """Inits the class.
 
         Args:
             caa (Application): The catia application instance.
             product (Product): The catia product in which to create the groups.
+            snapshot (TreeSnapshot): The snapshot of the product. Must contain the \
+                group property.
         """
         self._caa = caa
         self._product = product
+        self._snapshot = snapshot
         self._created_groups: List[Product] = []
 
     def create(self) -> None:
-        """Creates the groups by the group property of every child in the product."""
-        self._remove()
+        """Creates the groups by the group property of every child in the product.
+        Group identifiers that match a group are kept, only the missing ones are
+        created and the obsolete ones are removed."""
+        changes = self.reconcile()
+        log.info(
+            f"Keeping {len(changes.keep)}, removing {len(changes.remove)} and "
+            f"creating {len(changes.create)} group identifiers."
+        )
+        self._remove(changes.remove)
+        self._rename(changes.renames)
+        self._created_groups = [
+            self._create(
+                name=group.name,
+                value=group.value,
+                source=group.source,
+                index=group.index,
+            )
+            for group in changes.create
+        ]
+
+    def reconcile(self) -> GroupChanges:
+        """Compares the existing group identifiers with the planned groups, without
+        modifying the product. An identifier matches a group by its part number,
+        source and group value. Each group keeps at most one identifier.
 
+        Returns:
+            GroupChanges: The identifiers to keep and to remove, and the groups to \
+                create.
+        """
+        # Identifiers of empty group values have no group property.
+        planned = {
+            (group.name, group.source, group.value or None): group
+            for group in self.plan()
+        }
+        changes = GroupChanges()
+        for node in self.identifiers():
+            value = node.get(resource.props.group) or None
+            key = (node.part_number, node.source, value)
+            if (group := planned.pop(key, None)) is None:
+                changes.remove.append(node)
+            else:
+                changes.keep.append((node, group))
+        changes.create.extend(planned.values())
+        return changes
+
+    def plan(self) -> List[PlannedGroup]:
+        """Returns the groups that `create` creates, without modifying the product.
+
+        Returns:
+            List[PlannedGroup]: The planned groups, in the order of creation.
+        """
         groups: Dict[str, int] = {"NO GROUP": 2}
         # The groups dict contains the group name as key and the respective CATIA
         # source as value (0 = unknown, 1 = made, 2 = bought).
@@ -43,16 +138,15 @@ class Groups:
         # nodes at the end of the product tree. So items with no group assigned will
         # be positioned last.
 
-        self._created_groups = []
-
         log.info("Reading existing groups from properties...")
-        for node in self._product.products:
-            props = PyProperties(node.reference_product)
-            if props.exists(resource.props.group):
-                groups[props.get_by_name(resource.props.group).value] = node.source
+        for node in self._snapshot.nodes:
+            # Existing group identifiers are removed before the groups are created.
+            group = node.get(resource.props.group)
+            if group is not None and not node.identifier:
+                groups[group] = node.source  # type: ignore
 
-        for index, group in enumerate(groups):
-            group_product = self._create(
+        return [
+            PlannedGroup(
                 name=resource.settings.tree.group_prefix
                 + str(group).upper()
                 + resource.settings.tree.group_postfix,
@@ -60,7 +154,8 @@ class Groups:
                 source=groups[group],
                 index=index,
             )
-            self._created_groups.append(group_product)
+            for index, group in enumerate(groups)
+        ]
 
     def exclude_from_bom(self) -> None:
         """Excludes all selected items from the bill of material.
@@ -69,6 +164,10 @@ class Groups:
             All product that shall be excluded from the bill of material must be
             selected first (CATIA.Document.Selection).
         """
+        if not self._created_groups:
+            log.info("No group identifiers created, skipped the properties window.")
+            return
+
         selection = ProductDocument(self._caa.active_document.com_object).selection
         selection.clear()
         for group_product in self._created_groups:
@@ -98,28 +197,117 @@ class Groups:
         """
         product = self._product.products.add_new_product(name)
         product.source = source
-        product.name = f"{' - '*(70-len(name))}.{index}"
+        product.name = instance_name = PlannedGroup(
+            name=name, value=value, source=source, index=index
+        ).instance_name
 
-        props = PyProperties(product.reference_product)
-        props.create(name=PROP_GROUP_IDENTIFIER, value="1")
-        props.create(name=PROP_NO_BOM, value="1")
+        properties = {PROP_GROUP_IDENTIFIER: "1", PROP_NO_BOM: "1"}
         if value:
-            props.create(name=resource.props.group, value=value)
+            properties[resource.props.group] = value
+        props = PyProperties(product.reference_product)
+        for prop_name, prop_value in properties.items():
+            props.create(name=prop_name, value=prop_value)
+        self._snapshot.add(
+            product,
+            name=instance_name,
+            part_number=name,
+            source=source,
+            properties=properties,
+        )
 
         log.info(f"Created new product {name!r}.")
         return product
 
-    def _remove(self) -> None:
-        """Removes all products flagged as group identifier from the parent product."""
-        nodes: List[Product] = []
+    def identifiers(self) -> List[TreeNode]:
+        """Returns all nodes flagged as group identifier.
 
+        The identifiers are found with a single selection search on the group
+        identifier property, so the properties of the other nodes aren't read.
+        Nodes which properties have already been read are checked as well. If the
+        search fails, the property of every node is checked.
+        """
         log.info("Indexing existing group identifiers...")
-        for node in self._product.products:
-            props = PyProperties(node.reference_product)
-            if props.exists(PROP_GROUP_IDENTIFIER):
-                nodes.append(node)
-
-        for node in nodes:
-            node_name = node.part_number
-            self._product.products.remove(node.product)
-            log.info(f"Removed group identifier {node_name!r}.")
+        try:
+            names = self._search_identifiers()
+        except Exception as e:  # pylint: disable=W0703
+            log.warning(f"Failed to search the group identifiers: {e}")
+            return [node for node in self._snapshot.nodes if node.identifier]
+        return [
+            node
+            for node in self._snapshot.nodes
+            if node.name in names or (node.loaded is not None and node.identifier)
+        ]
+
+    def _search_identifiers(self) -> Set[str]:
+        """Returns the instance names of the children of the product that are
+        flagged as group identifier, found by a selection search."""
+        selection = ProductDocument(self._caa.active_document.com_object).selection
+        selection.clear()
+        try:
+            selection.add(self._product)
+            selection.search(
+                f"{resource.applied_keywords.search_product}."
+                f"'{PROP_GROUP_IDENTIFIER}'=1,in"
+            )
+            names: Set[str] = set()
+            for index in range(1, selection.count + 1):
+                element = selection.item(index)
+                if element.type != "Product":
+                    continue
+                # The search also finds the identifiers of the sub products. The
+                # parent of an instance is the products collection of its father.
+                father = element.value.com_object.Parent.Parent
+                if father == self._product.com_object:
+                    names.add(element.value.name)
+        finally:
+            selection.clear()
+        log.info(f"Found {len(names)} group identifiers with the selection search.")
+        return names
+
+    def _rename(self, renames: List[Tuple[TreeNode, str]]) -> None:
+        """Sets the new instance names of the kept group identifiers, see
+        `GroupChanges.renames`."""
+        if not renames:
+            return
+        names = {node.name for node in self._snapshot.nodes}
+        if any(name in names for _, name in renames):
+            # The instance names must be unique, another identifier may still have
+            # the new name.
+            for node, name in renames:
+                self._snapshot.rename(node, f"{name}~")
+        for node, name in renames:
+            self._snapshot.rename(node, name)
+        log.info(f"Renamed {len(renames)} group identifiers.")
+
+    def _remove(self, nodes: List[TreeNode]) -> None:
+        """Removes the group identifiers from the parent product.
+
+        The identifiers are deleted with a single selection. Removing them by name
+        from the products collection looks up every name in the whole collection,
+        which is only done if the selection fails.
+
+        Args:
+            nodes (List[TreeNode]): The group identifiers to remove.
+        """
+        if not nodes:
+            return
+
+        selection = ProductDocument(self._caa.active_document.com_object).selection
+        try:
+            selection.clear()
+            for node in nodes:
+                selection.add(node.product)
+        except Exception as e:  # pylint: disable=W0703
+            log.warning(f"Failed to select the group identifiers: {e}")
+            selection.clear()
+            for node in nodes:
+                self._snapshot.remove(node)
+                log.info(f"Removed group identifier {node.part_number!r}.")
+            return
+
+        selection.delete()
+        self._snapshot.discard(nodes)
+        log.info(
+            f"Removed {len(nodes)} group identifiers: "
+            f"{', '.join(repr(node.part_number) for node in nodes)}."
+        )
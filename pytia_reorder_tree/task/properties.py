@@ -0,0 +1,211 @@
+"""
+    Properties submodule.
+    Reads the user properties of reference products once per reference.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Any
+from typing import Collection
+from typing import Dict
+from typing import Sequence
+from typing import Tuple
+
+from handler.concurrent_reader import ConcurrentReader
+from handler.property_store import PropertyStore
+from pycatia.product_structure_interfaces.product import Product
+from pycatia.product_structure_interfaces.products import Products
+from pytia.log import log
+from type_collections import PartNumber
+
+
+@dataclass(slots=True, frozen=True)
+class ReferenceProperties:
+    """Dataclass for the sort relevant data of a reference product."""
+
+    part_number: str
+    source: int | None
+    properties: Dict[str, str]
+
+    def get(self, name: str) -> str | None:
+        """Returns the value of the user property, None if it doesn't exist."""
+        return self.properties.get(name)
+
+
+class PropertyCache:
+    """
+    Memoizes the user properties of reference products. All instances of a part
+    share the same reference product, so the properties are read once per part.
+    Reference products are identified by their part number, which is unique within
+    a CATIA session.
+
+    If a store is given, the properties of saved reference products are taken from
+    the store instead of being read over COM, as long as their file hasn't changed.
+    """
+
+    def __init__(
+        self,
+        names: Collection[str] | None = None,
+        source: bool = True,
+        store: PropertyStore | None = None,
+    ) -> None:
+        """Inits the class.
+
+        Args:
+            names (Collection[str] | None, optional): The names of the properties to \
+                read. Reads all properties if None. Defaults to None.
+            source (bool, optional): Wether to read the source of the reference \
+                product. Defaults to True.
+            store (PropertyStore | None, optional): The on-disk cache of the \
+                properties, must be created for the same names. Defaults to None.
+        """
+        self._names = frozenset(names) if names is not None else None
+        self._source = source
+        self._store = store
+        self._references: Dict[PartNumber, ReferenceProperties] = {}
+
+    def __len__(self) -> int:
+        return len(self._references)
+
+    @property
+    def stored(self) -> int:
+        """Returns how many reference products have been taken from the store."""
+        return self._store.hits if self._store is not None else 0
+
+    def clear(self) -> None:
+        """Discards the properties that have been read."""
+        self._references.clear()
+
+    def flush(self) -> None:
+        """Writes the newly read properties to the store."""
+        if self._store is not None:
+            self._store.flush()
+
+    def get(
+        self, product: Product, part_number: str | None = None
+    ) -> ReferenceProperties:
+        """Returns the properties of the reference product of the given instance.
+
+        Args:
+            product (Product): The product instance.
+            part_number (str | None, optional): The part number of the product, if \
+                it has already been read. Defaults to None.
+
+        Returns:
+            ReferenceProperties: The properties of the reference product.
+        """
+        if part_number is None:
+            part_number = product.part_number
+        if (reference := self._references.get(part_number)) is None:
+            indicator = _indicator(product) if self._store is not None else None
+            reference = self._lookup(part_number, indicator)
+            if reference is None:
+                reference = self._read(product, part_number)
+                self._put(part_number, indicator, reference)
+            self._references[part_number] = reference
+        return reference
+
+    def read_missing(
+        self,
+        products: Sequence[Product],
+        part_numbers: Sequence[str],
+        root: Any,
+        reader: ConcurrentReader,
+    ) -> None:
+        """Reads the reference products of the instances, that are neither cached
+        nor in the store, with the reader. The store is only used in the calling
+        thread, the workers read from CATIA.
+
+        Args:
+            products (Sequence[Product]): The instances, in the order of the \
+                products collection.
+            part_numbers (Sequence[str]): The part numbers of the instances.
+            root (Any): The COM object of the products collection.
+            reader (ConcurrentReader): The reader.
+        """
+        pending: Dict[PartNumber, Tuple[int, str | None]] = {}
+        for index, (product, part_number) in enumerate(zip(products, part_numbers)):
+            if part_number in self._references or part_number in pending:
+                continue
+            indicator = _indicator(product) if self._store is not None else None
+            if (reference := self._lookup(part_number, indicator)) is not None:
+                self._references[part_number] = reference
+            else:
+                pending[part_number] = (index, indicator)
+
+        references = reader.read(
+            root, [index for index, _ in pending.values()], self._read_item
+        )
+        for (part_number, (_, indicator)), reference in zip(
+            pending.items(), references
+        ):
+            self._put(part_number, indicator, reference)
+            self._references[part_number] = reference
+
+    def _lookup(
+        self, part_number: str, indicator: str | None
+    ) -> ReferenceProperties | None:
+        """Returns the properties from the store, None if they're not stored or the
+        reference product has changed."""
+        if indicator is None or self._store is None:
+            return None
+        stored = self._store.get(part_number, indicator)
+        if stored is None or (stored[0] is None and self._source):
+            return None
+        return ReferenceProperties(
+            part_number=part_number,
+            source=stored[0] if self._source else None,
+            properties=stored[1],
+        )
+
+    def _put(
+        self, part_number: str, indicator: str | None, reference: ReferenceProperties
+    ) -> None:
+        """Writes the properties to the store, if the reference product has an
+        indicator."""
+        if indicator is not None and self._store is not None:
+            self._store.put(
+                part_number,
+                indicator,
+                source=reference.source,
+                properties=reference.properties,
+            )
+
+    def _read_item(self, root: Any, index: int) -> ReferenceProperties:
+        """Reads the reference product of the child at the (zero based) index of the
+        products collection. Can be called from any thread."""
+        product = Products(root).item(index + 1)
+        return self._read(product, product.part_number)
+
+    def _read(self, product: Product, part_number: str) -> ReferenceProperties:
+        """Reads the required user properties of the reference product in one sweep.
+        Skips the sweep if no property is required."""
+        properties: Dict[str, str] = {}
+        if self._names is None or self._names:
+            props = product.reference_product.user_ref_properties
+            for index in range(1, props.count + 1):
+                item = props.item(index)
+                name = item.name
+                if self._names is None or name in self._names:
+                    properties[name] = item.value_as_string()
+
+        log.debug(f"Read {len(properties)} properties of {part_number!r}.")
+        return ReferenceProperties(
+            part_number=part_number,
+            source=product.source if self._source else None,
+            properties=properties,
+        )
+
+
+def _indicator(product: Product) -> str | None:
+    """Returns the change indicator of the reference product: The path and the
+    modification time of its document. None if the document has unsaved changes,
+    or no file of its own (e.g. components)."""
+    try:
+        document = product.reference_product.com_object.Parent
+        if not document.Saved:
+            return None
+        path = document.FullName
+        return f"{path}|{os.stat(path).st_mtime_ns}"
+    except Exception:  # pylint: disable=W0703
+        return None
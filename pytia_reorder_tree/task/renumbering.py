@@ -3,31 +3,32 @@
     Handles the documents product flagged as group identifier.
 """
 
-from typing import Dict
 from typing import List
 
-from const import PROP_GROUP_IDENTIFIER
+from algorithm.renumbering import instance_names
 from pycatia.in_interfaces.application import Application
 from pycatia.product_structure_interfaces.product import Product
 from pytia.log import log
-from pytia.wrapper.properties import PyProperties
 from resources import resource
-from type_collections import InstanceIndex
-from type_collections import PartNumber
+from task.snapshot import TreeSnapshot
 
 
 class Renumbering:
     """Renumbering class."""
 
-    def __init__(self, caa: Application, product: Product) -> None:
+    def __init__(
+        self, caa: Application, product: Product, snapshot: TreeSnapshot
+    ) -> None:
         """Inits the class.
 
         Args:
             caa (Application): The catia application instance.
             product (Product): The catia product which nodes to renumber.
+            snapshot (TreeSnapshot): The snapshot of the product, in tree order.
         """
         self._caa = caa
         self._product = product
+        self._snapshot = snapshot
         self._created_groups: List[Product] = []
 
     def renumber_all_nodes(self) -> None:
@@ -50,15 +51,14 @@ class Renumbering:
             make_hash (bool): If true, all instance number will be set to the hash \
                 value of the correct new instance number.
         """
-        node_index: Dict[PartNumber, InstanceIndex] = {}
-        for node in self._product.products:
-            props = PyProperties(node.reference_product)
-
-            if node.part_number in node_index:
-                node_index[node.part_number] += 1
-            else:
-                node_index[node.part_number] = resource.settings.tree.start_index
-
-            if not props.exists(PROP_GROUP_IDENTIFIER):
-                node_name = f"{node.part_number}.{node_index[node.part_number]}"
-                node.name = str(hash(node_name)) if make_hash else node_name
+        nodes = self._snapshot.nodes
+        names = instance_names(
+            part_numbers=[node.part_number for node in nodes],
+            skip=[node.identifier for node in nodes],
+            start_index=resource.settings.tree.start_index,
+        )
+        for node, node_name in zip(nodes, names):
+            if node_name is not None:
+                self._snapshot.rename(
+                    node, str(hash(node_name)) if make_hash else node_name
+                )
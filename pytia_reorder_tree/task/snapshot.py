@@ -0,0 +1,359 @@
+"""
+    Snapshot submodule.
+    Reads the children of the product once, and shares them between all stages.
+"""
+
+from dataclasses import dataclass
+from dataclasses import field
+from threading import Event
+from threading import Thread
+from time import perf_counter
+from typing import Any
+from typing import Collection
+from typing import Dict
+from typing import List
+from typing import Mapping
+
+from const import PROP_GROUP_IDENTIFIER
+from handler.concurrent_reader import Apartment
+from handler.concurrent_reader import ConcurrentReader
+from handler.journal import tree_fingerprint
+from handler.property_store import PropertyStore
+from pycatia.product_structure_interfaces.product import Product
+from pytia.log import log
+from task.properties import PropertyCache
+from task.properties import ReferenceProperties
+
+
+@dataclass(slots=True, kw_only=True)
+class TreeNode:
+    """
+    Dataclass for a child of the product. The reference properties are shared by
+    all instances of the same part number. If they haven't been loaded with the
+    node, they are read from the cache on first use.
+    """
+
+    product: Product
+    name: str
+    part_number: str
+    processable: bool
+    loaded: ReferenceProperties | None = None
+    cache: PropertyCache | None = field(default=None, repr=False)
+
+    @property
+    def reference(self) -> ReferenceProperties:
+        """Returns the properties of the reference product. Reads them on the first
+        call, if they haven't been loaded with the node."""
+        if self.loaded is None:
+            assert self.cache is not None
+            self.loaded = self.cache.get(self.product, self.part_number)
+        return self.loaded
+
+    @property
+    def source(self) -> int | None:
+        """Returns the source of the reference product."""
+        return self.reference.source
+
+    @property
+    def properties(self) -> Dict[str, str]:
+        """Returns the user properties of the reference product, which have been
+        read for the snapshot."""
+        return self.reference.properties
+
+    @property
+    def identifier(self) -> bool:
+        """Returns wether the node is a group identifier."""
+        return PROP_GROUP_IDENTIFIER in self.reference.properties
+
+    def get(self, name: str) -> str | None:
+        """Returns the value of the user property, None if it doesn't exist."""
+        return self.reference.properties.get(name)
+
+
+class TreeSnapshot:
+    """
+    Reads the children of the product in a single walk: instance name, part number,
+    source and the required user properties (once per reference product). All
+    stages read the children from the snapshot, and modify the tree through it, so
+    the snapshot stays in sync without reading the tree again. A lazy snapshot reads
+    the source and the user properties of a node on first use.
+    """
+
+    def __init__(
+        self,
+        product: Product,
+        names: Collection[str],
+        store: PropertyStore | None = None,
+        reader: ConcurrentReader | None = None,
+        lazy: bool = False,
+    ) -> None:
+        """Inits the class.
+
+        Args:
+            product (Product): The product which children to read.
+            names (Collection[str]): The names of the user properties to read. The \
+                group identifier is always read.
+            store (PropertyStore | None, optional): The on-disk cache of the \
+                properties of the previous runs. Defaults to None.
+            reader (ConcurrentReader | None, optional): Reads the properties of the \
+                reference products with a pool of threads. Defaults to None \
+                (sequential).
+            lazy (bool, optional): Reads the properties of a node on first use, \
+                instead of all properties with the tree (e.g. if only a few nodes \
+                are sorted). The reader isn't used then. Defaults to False.
+        """
+        self._product = product
+        self._properties = PropertyCache(
+            names=frozenset(names) | {PROP_GROUP_IDENTIFIER}, source=True, store=store
+        )
+        self._reader = reader
+        self._lazy = lazy
+        self._nodes: List[TreeNode] | None = None
+        self._prefetch: Thread | None = None
+        self._prefetch_cancelled = Event()
+        self._prefetch_error: Exception | None = None
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def nodes(self) -> List[TreeNode]:
+        """Returns the children in tree order. Reads the tree on the first call."""
+        self.read()
+        assert self._nodes is not None
+        return list(self._nodes)
+
+    def read(self) -> None:
+        """Reads the tree, if it hasn't been read yet."""
+        if self._nodes is None:
+            self._nodes = self._read()
+
+    def fingerprint(self, spec: str = "") -> str:
+        """Returns the fingerprint of the children, from their instance names and
+        part numbers, and the spec of the target order. Reads the tree on the first
+        call."""
+        return tree_fingerprint(
+            ((node.name, node.part_number) for node in self.nodes), spec=spec
+        )
+
+    def prefetch(self, apartment: Apartment) -> None:
+        """Reads the properties of the reference products in a background thread,
+        while the task runs its checks. The thread uses its own apartment, into
+        which the product is marshalled. The product handles of the thread can't
+        be used by the task, the snapshot reads them when the tree is read, but
+        takes the properties from the prefetch.
+
+        Args:
+            apartment (Apartment): The threading model of the product.
+        """
+        try:
+            token = apartment.marshal(self._product.com_object)
+        except Exception as e:  # pylint: disable=W0703
+            log.warning(f"Cannot prefetch the tree: {e}")
+            return
+        self._prefetch = Thread(
+            target=self._run_prefetch,
+            args=(apartment, token),
+            name="prefetch",
+            daemon=True,
+        )
+        self._prefetch.start()
+
+    def cancel_prefetch(self) -> None:
+        """Stops the prefetch at the next child, and discards its properties."""
+        if self._prefetch is None:
+            return
+        self._prefetch_cancelled.set()
+        self._prefetch.join()
+        self._prefetch = None
+        self._properties.clear()
+        log.info("Cancelled the prefetch of the tree.")
+
+    def _run_prefetch(self, apartment: Apartment, token: Any) -> None:
+        """Reads the properties of all children, in the prefetch thread."""
+        apartment.initialize()
+        try:
+            self._prefetch_children(Product(apartment.unmarshal(token)))
+        except Exception as e:  # pylint: disable=W0703
+            self._prefetch_error = e
+        finally:
+            apartment.uninitialize()
+
+    def _prefetch_children(self, product: Product) -> None:
+        """Reads the properties of the children of the product. All references to
+        the products are released on return, before the apartment is left."""
+        for child in product.products:
+            if self._prefetch_cancelled.is_set():
+                return
+            self._properties.get(child)
+
+    def _join_prefetch(self) -> None:
+        """Waits for the prefetch to finish."""
+        if self._prefetch is None:
+            return
+        start = perf_counter()
+        self._prefetch.join()
+        self._prefetch = None
+        if self._prefetch_error is not None:
+            log.warning(
+                "Failed to prefetch the tree, reading the remaining properties: "
+                f"{self._prefetch_error}"
+            )
+        log.info(
+            f"Prefetched the properties of {len(self._properties)} reference "
+            f"products, waited {perf_counter() - start:.1f}s for the prefetch."
+        )
+
+    def _read(self) -> List[TreeNode]:
+        """Walks the children of the product."""
+        self._join_prefetch()
+        log.info("Reading the tree of the product...")
+        products = list(self._product.products)
+        part_numbers = [product.part_number for product in products]
+        if self._reader is not None and not self._lazy:
+            self._read_concurrently(products, part_numbers)
+        nodes = [
+            TreeNode(
+                product=product,
+                name=product.name,
+                part_number=part_number,
+                processable=product.is_catproduct() or product.is_catpart(),
+                loaded=(
+                    None if self._lazy else self._properties.get(product, part_number)
+                ),
+                cache=self._properties,
+            )
+            for product, part_number in zip(products, part_numbers)
+        ]
+        if self._lazy:
+            log.info(f"Read {len(nodes)} nodes, their properties are read on use.")
+            return nodes
+        self._properties.flush()
+        log.info(
+            f"Read {len(nodes)} nodes and the properties of {len(self._properties)} "
+            f"reference products, {self._properties.stored} from the property cache."
+        )
+        return nodes
+
+    def flush(self) -> None:
+        """Writes the properties that have been read on use to the property cache."""
+        self._properties.flush()
+
+    def _read_concurrently(
+        self, products: List[Product], part_numbers: List[str]
+    ) -> None:
+        """Reads the properties of the reference products with the reader, before
+        the nodes are created. The product handles stay in this thread, the
+        workers get the products collection marshalled into their apartment."""
+        assert self._reader is not None
+        self._properties.read_missing(
+            products,
+            part_numbers,
+            root=self._product.products.com_object,
+            reader=self._reader,
+        )
+        if self._reader.error is not None:
+            log.warning(
+                "Failed to read the properties concurrently, read them "
+                f"sequentially: {self._reader.error}"
+            )
+        elif self._reader.speedup is not None:
+            mode = "concurrently" if self._reader.concurrent else "sequentially"
+            log.info(
+                f"Concurrent reads with {self._reader.threads} threads are "
+                f"{self._reader.speedup:.1f}x as fast as sequential reads, read the "
+                f"properties {mode}."
+            )
+
+    def add(
+        self,
+        product: Product,
+        name: str,
+        part_number: str,
+        source: int,
+        properties: Mapping[str, str],
+    ) -> TreeNode:
+        """Adds a product that has been created at the end of the tree, without
+        reading it again.
+
+        Args:
+            product (Product): The new product.
+            name (str): The instance name of the new product.
+            part_number (str): The part number of the new product.
+            source (int): The source of the new product.
+            properties (Mapping[str, str]): The user properties of the new product.
+
+        Returns:
+            TreeNode: The node of the new product.
+        """
+        node = TreeNode(
+            product=product,
+            name=name,
+            part_number=part_number,
+            processable=True,
+            loaded=ReferenceProperties(
+                part_number=part_number, source=source, properties=dict(properties)
+            ),
+        )
+        if self._nodes is None:
+            self._nodes = self._read()
+        self._nodes.append(node)
+        return node
+
+    def remove(self, node: TreeNode) -> None:
+        """Removes the node from the product and from the snapshot.
+
+        Args:
+            node (TreeNode): The node to remove.
+        """
+        self._product.products.remove(node.name)
+        assert self._nodes is not None
+        self._nodes.remove(node)
+
+    def discard(self, nodes: Collection[TreeNode]) -> None:
+        """Removes the nodes from the snapshot, after they have been deleted from
+        the product by other means (e.g. by a selection).
+
+        Args:
+            nodes (Collection[TreeNode]): The deleted nodes.
+        """
+        assert self._nodes is not None
+        deleted = {id(node) for node in nodes}
+        self._nodes = [node for node in self._nodes if id(node) not in deleted]
+
+    def rename(self, node: TreeNode, name: str) -> None:
+        """Sets the instance name of the node.
+
+        Args:
+            node (TreeNode): The node to rename.
+            name (str): The new instance name.
+        """
+        node.product.name = name
+        node.name = name
+
+    def reload(self) -> None:
+        """Discards the nodes, the tree is read again on the next use. The
+        properties of the reference products are kept."""
+        self._nodes = None
+
+    def resync(self) -> None:
+        """Reads the instance names of the children again, and restores the tree
+        order from them. Only the names are read, the nodes are kept. Required
+        after the tree has been reordered (by the reorder window, or by adding the
+        components again).
+
+        Raises:
+            ValueError: Raised when the children of the product have changed.
+        """
+        if self._nodes is None:
+            return
+        by_name = {node.name: node for node in self._nodes}
+        nodes: List[TreeNode] = []
+        for product in self._product.products:
+            if (node := by_name.pop(product.name, None)) is None:
+                raise ValueError(f"The node {product.name!r} is not in the snapshot.")
+            node.product = product
+            nodes.append(node)
+        if by_name:
+            raise ValueError(f"The nodes {sorted(by_name)} have been removed.")
+        self._nodes = nodes
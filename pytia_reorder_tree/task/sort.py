@@ -2,18 +2,42 @@
     Sort submodule.
 """
 
+from time import perf_counter
+from typing import Collection
+from typing import Dict
+from typing import FrozenSet
 from typing import List
-
+from typing import Sequence
+from typing import Tuple
+
+from algorithm.collation import COLLATION_PLAIN
+from algorithm.insertion import plan_insertion
+from algorithm.matching import MatchResult
+from algorithm.matching import delimiter_key
+from algorithm.matching import match_items
+from algorithm.node_label import FIELD_INSTANCE_NAME
+from algorithm.node_label import FIELD_PART_NUMBER
+from algorithm.node_label import NodeLabelTemplate
+from algorithm.plan import PlanNode
+from algorithm.planner import MovePlan
+from algorithm.reorder import OutOfSyncError
+from algorithm.reorder import Reorder
+from algorithm.sort_keys import DEFAULT_SORT_KEYS
+from algorithm.sort_keys import SortKey
+from algorithm.sort_keys import SortKeyColumn
 from const import PROP_GROUP_IDENTIFIER
 from exceptions import WarningError
+from handler.cancel import ON_CANCEL_ABORT
+from handler.cancel import CancelToken
+from handler.cancel import Cancelled
+from handler.journal import Journal
 from pycatia.in_interfaces.application import Application
-from pycatia.knowledge_interfaces.str_param import StrParam
 from pycatia.product_structure_interfaces.product import Product
-from pycatia.product_structure_interfaces.products import Products
+from protocols.move_backend_protocol import MoveBackendProtocol
 from pytia.log import log
-from pywinauto.controls.win32_controls import ButtonWrapper
-from pywinauto.controls.win32_controls import ListBoxWrapper
 from resources import resource
+from task.snapshot import TreeNode
+from task.snapshot import TreeSnapshot
 
 
 class Sort:
@@ -21,44 +45,242 @@ class Sort:
 
     def __init__(self, caa: Application) -> None:
         self._caa = caa
-        self._list_box: ListBoxWrapper | None = None
-        self._btn_up: ButtonWrapper | None = None
+        self._backend: MoveBackendProtocol | None = None
+        self._journal: Journal | None = None
+        self._cancel: CancelToken | None = None
         self._delimiter: str | None = None
         self._position: int = 0
-        self._products: List[Product] = []
-
-    def set_products(self, products: Products) -> None:
-        """Gathers all processable nodes from the graph tree.
+        self._node_label: NodeLabelTemplate | None = None
+        self._sort_key = SortKey(DEFAULT_SORT_KEYS, aliases=_property_aliases())
+        self._nodes: List[TreeNode] = []
+        self._virtual_nodes: List[PlanNode] = []
+        self._order: List[int] | None = None
+        self._selection: FrozenSet[str] = frozenset()
+        self._estimate: Tuple[List[int], MovePlan] | None = None
+        self._finished = False
+
+    def set_snapshot(
+        self, snapshot: TreeSnapshot, exclude: Collection[str] = ()
+    ) -> None:
+        """Gathers all processable nodes from the snapshot of the graph tree.
 
         Args:
-            products (Products): The products instance from the graph tree object to
-            be sorted.
+            snapshot (TreeSnapshot): The snapshot of the product to be sorted. Must \
+                contain the properties of `Sort.required_properties`.
+            exclude (Collection[str], optional): The names of nodes to skip, e.g. \
+                group identifiers that would be removed. Defaults to ().
         """
         log.info("Gathering processable products from assembly...")
-        for product in products:
-            if product.is_catproduct() or product.is_catpart():
-                self._products.append(product)
+        self._nodes = [
+            node
+            for node in snapshot.nodes
+            if node.processable and node.name not in exclude
+        ]
+        self._order = None
 
         if resource.settings.debug:
-            msg = "\n - ".join(p.name for p in self._products)
+            msg = "\n - ".join(node.name for node in self._nodes)
             log.debug(f"Processable items:\n - {msg}")
 
-    def set_list_box(self, list_box: ListBoxWrapper) -> None:
-        """Sets the list box object.
+    def set_virtual_nodes(self, nodes: Sequence[PlanNode]) -> None:
+        """Sets nodes that don't exist yet, e.g. the groups of a dry run. Virtual
+        nodes are sorted after the products, as if they were created at the end of
+        the tree. For planning only, the window can't sort virtual nodes.
+
+        Args:
+            nodes (Sequence[PlanNode]): The virtual nodes.
+        """
+        self._virtual_nodes = list(nodes)
+        self._order = None
+
+    def set_selection(self, names: Collection[str]) -> None:
+        """Limits the sort to the selected nodes (range mode). All other nodes are
+        expected to be sorted already, and keep their order. Only the keys of the
+        selected nodes and of the neighbours that are probed to find their place
+        are computed.
+
+        Args:
+            names (Collection[str]): The instance names of the selected nodes.
+        """
+        self._selection = frozenset(names)
+        self._order = None
+
+    def nodes(self) -> List[PlanNode]:
+        """Returns all nodes in tree order, the virtual nodes last."""
+        nodes = [
+            PlanNode(
+                name=node.name,
+                part_number=node.part_number,
+                source=node.source,
+                properties=node.properties,
+                identifier=node.identifier,
+            )
+            for node in self._nodes
+        ]
+        return nodes + self._virtual_nodes
+
+    def identifier(self, index: int) -> bool:
+        """Returns wether the node at the index is a group identifier. The index is
+        in tree order, the virtual nodes last."""
+        if index < len(self._nodes):
+            return self._nodes[index].identifier
+        return self._virtual_nodes[index - len(self._nodes)].identifier
+
+    @property
+    def products(self) -> List[Product]:
+        """Returns the processable products in tree order."""
+        return [node.product for node in self._nodes]
+
+    def order(self) -> List[int]:
+        """Sorts the products once and returns the target index of each product, in
+        tree order.
+
+        Returns:
+            List[int]: The target indices.
+        """
+        if self._order is None and self._selection:
+            self._order = self._insertion_order()
+        if self._order is None:
+            log.info("Pre-sorting items from assembly...")
+            keys = []
+            for node in self._nodes:
+                if self._cancel is not None:
+                    self._cancel.raise_if_cancelled()
+                keys.append(self._key(node))
+            keys += [self._key(node) for node in self._virtual_nodes]
+            indices = sorted(range(len(keys)), key=keys.__getitem__)
+            self._order = [0] * len(indices)
+            for target, index in enumerate(indices):
+                self._order[index] = target
+            log.info(f"Pre-sorted {len(keys)} items from assembly.")
+        return list(self._order)
+
+    def _insertion_order(self) -> List[int]:
+        """Returns the target indices of the products, if only the selected products
+        are out of place.
+
+        Raises:
+            WarningError: Raised when the products outside the selection are not \
+                sorted.
+        """
+        assert not self._virtual_nodes
+        selected = [
+            index
+            for index, node in enumerate(self._nodes)
+            if node.name in self._selection
+        ]
+        if missing := len(self._selection) - len(selected):
+            log.warning(
+                f"Ignored {missing} selected items, which are not processable "
+                "children of the product."
+            )
+
+        log.info(f"Placing {len(selected)} selected items...")
+        try:
+            plan = plan_insertion(
+                count=len(self._nodes),
+                selected=selected,
+                key=lambda index: self._key(self._nodes[index]),
+            )
+        except ValueError as e:
+            raise WarningError(
+                f"{e} Sort the whole tree first, without a selection."
+            ) from e
+        log.info(
+            f"Placed the selected items, {plan.affected} of {len(plan.order)} rows "
+            f"are affected, computed {plan.keys} sort keys."
+        )
+        return plan.order
+
+    def set_backend(self, backend: MoveBackendProtocol) -> None:
+        """Sets the backend that moves the rows of the reorder list box.
+
+        Args:
+            backend (MoveBackendProtocol): The backend from which to fetch the
+            sort-items and which moves them.
+        """
+        self._backend = backend
+
+    def set_estimate(self, order: Sequence[int], plan: MovePlan | None) -> None:
+        """Sets the plan of the cost estimate, so the sort doesn't plan the same
+        moves again. The plan is only used, if the rows of the list box lead to the
+        same order.
 
         Args:
-            list_box (ListBoxWrapper): The list box object from which to fetch the
-            sort-items.
+            order (Sequence[int]): The order the plan has been made for.
+            plan (MovePlan | None): The planned moves, see `window_cost`.
         """
-        self._list_box = list_box
+        self._estimate = (list(order), plan) if plan is not None else None
 
-    def set_up_button(self, button: ButtonWrapper) -> None:
-        """Sets the up button object.
+    def set_journal(self, journal: Journal) -> None:
+        """Sets the journal, which records the target order and the confirmed rows.
 
         Args:
-            button (ButtonWrapper): The button which triggers the up command.
+            journal (Journal): The journal of the document.
         """
-        self._btn_up = button
+        self._journal = journal
+
+    def set_cancel_token(self, token: CancelToken) -> None:
+        """Sets the token, that is checked between the clicks and while the keys are
+        computed.
+
+        Args:
+            token (CancelToken): The cancel token of the task.
+        """
+        self._cancel = token
+
+    def set_sort_keys(
+        self,
+        columns: Sequence[SortKeyColumn],
+        collation: str = COLLATION_PLAIN,
+        locale_name: str | None = None,
+    ) -> None:
+        """Sets the columns of the sort key. Properties are referenced by their name
+        or by their key in the properties.json (e.g. `group`).
+
+        Args:
+            columns (Sequence[SortKeyColumn]): The sort key columns.
+            collation (str, optional): The collation of text columns. Defaults to \
+                `plain`.
+            locale_name (str | None, optional): The locale for locale aware \
+                collations. Defaults to None (locale of the user).
+
+        Raises:
+            WarningError: Raised when a column is invalid.
+        """
+        try:
+            self._sort_key = SortKey(
+                columns,
+                aliases=_property_aliases(),
+                collation=collation,
+                locale_name=locale_name,
+            )
+        except ValueError as e:
+            raise WarningError(f"Invalid sort key in the settings: {e}") from e
+        log.info(
+            f"Sort key has {len(columns)} columns and requires the properties "
+            f"{sorted(self._sort_key.properties)}."
+        )
+
+    @staticmethod
+    def required_properties(columns: Sequence[SortKeyColumn]) -> FrozenSet[str]:
+        """Returns the names of the properties the sort needs from the snapshot.
+
+        Args:
+            columns (Sequence[SortKeyColumn]): The sort key columns.
+
+        Raises:
+            WarningError: Raised when a column is invalid.
+
+        Returns:
+            FrozenSet[str]: The property names. Always contains the group \
+                identifier, it marks the separators of the tree.
+        """
+        try:
+            sort_key = SortKey(columns, aliases=_property_aliases())
+        except ValueError as e:
+            raise WarningError(f"Invalid sort key in the settings: {e}") from e
+        return sort_key.properties | {PROP_GROUP_IDENTIFIER}
 
     def set_delimiter(self, delimiter: str, position: int) -> None:
         """Sets the delimiter for the instance number (#IN#) of the graph tree.
@@ -75,180 +297,258 @@ class Sort:
         self._delimiter = delimiter
         self._position = position
 
+    def set_node_label(self, template: str) -> None:
+        """Sets the node label template of the graph tree. Replaces the delimiter.
+
+        Args:
+            template (str): The node label template as set in the CATIA options, \
+                e.g. `#PN# | #IN# | #SO#`. Must contain the instance number (#IN#).
+
+        Raises:
+            WarningError: Raised when the template is invalid.
+        """
+        try:
+            node_label = NodeLabelTemplate(template)
+        except ValueError as e:
+            raise WarningError(str(e)) from e
+        if FIELD_INSTANCE_NAME not in node_label.fields:
+            raise WarningError(
+                f"The node label template {template!r} has no instance number (#IN#)."
+            )
+        self._node_label = node_label
+
+    @property
+    def finished(self) -> bool:
+        """Returns wether the last sort has finished within the time budget."""
+        return self._finished
+
     def sort(self) -> None:
         """
         This requires that the CATIA tree has at least the setting for the
         exemplar name enabled:  #IN#
         enabled in the Infrastructure/Product Structure/Nodes options.
+
+        If a time budget is set, the sections of the tree are sorted first, and the
+        sort stops when the budget is used up. The order of the list box is
+        consistent in any case, see `finished`. The same applies to a cancelled
+        sort, if the setting `on_cancel` is `apply`.
+
+        Raises:
+            Cancelled: Raised when the sort has been cancelled and the setting \
+                `on_cancel` is `abort`.
         """
+        budget = resource.settings.tree.time_budget_seconds
+        deadline = perf_counter() + budget if budget else None
 
-        assert self._products is not None
-        assert self._list_box is not None
-        assert self._btn_up is not None
+        assert self._backend is not None
+        assert not self._virtual_nodes
 
-        if self._delimiter is None:
+        if self._delimiter is None and self._node_label is None:
             log.warning(
                 "No delimiter for tree nodes set. "
                 "This may cause inconsistent results."
             )
 
-        log.info("Pre-sorting items from assembly...")
-        self._products.sort(
-            key=lambda x: (Filter.default(x) is None, Filter.default(x))
+        unsorted_tree_items = self._backend.item_texts()
+        resumed = self._resume(unsorted_tree_items)
+        if resumed is None:
+            sorted_tree_items, sections = self._target(unsorted_tree_items)
+            if self._journal is not None:
+                self._journal.set_target(sorted_tree_items, sections=sections)
+        else:
+            sorted_tree_items, sections = resumed
+
+        reorder = Reorder(
+            backend=self._backend,
+            items=unsorted_tree_items,
+            target=sorted_tree_items,
+            verify_interval=resource.settings.tree.verify_interval,
+            block_moves=resource.settings.tree.block_moves,
+            repair_attempts=resource.settings.tree.repair_attempts,
+            checkpoint_interval=resource.settings.tree.journal_interval,
+            # Applying the checkpoints would commit partial orders, which a
+            # cancelled run with `on_cancel` `abort` couldn't undo.
+            on_checkpoint=(
+                self._checkpoint
+                if self._journal is not None
+                and resource.settings.tree.on_cancel != ON_CANCEL_ABORT
+                else None
+            ),
+            sections=sections if deadline is not None else None,
+            estimate=self._estimate,
+        )
+        block_moves = reorder.block_moves
+        log.info(
+            f"Planned {len(reorder.plan.moves)} {'block ' if block_moves else ''}moves "
+            f"with {reorder.plan.clicks} clicks, {reorder.plan.stable} of "
+            f"{len(sorted_tree_items)} items stay in place."
         )
-        log.info("Pre-sorted items from assembly.")
-
-        unsorted_tree_items = [item for item in self._list_box.item_texts()]
-        sorted_tree_items = [None] * len(unsorted_tree_items)
-
-        if len(self._products) != len(sorted_tree_items):
-            raise WarningError("Cannot assign all items from assembly to the listbox.")
-
-        for product_index, product_item in enumerate(self._products):
-            for tree_index, tree_item in enumerate(unsorted_tree_items):
-                if self._delimiter is None:
-                    if product_item.name in tree_item:
-                        sorted_tree_items[product_index] = unsorted_tree_items[
-                            tree_index
-                        ]
-                else:
-                    instance_number = str(tree_item).split(self._delimiter)[
-                        self._position
-                    ]
-                    if instance_number == product_item.name:
-                        sorted_tree_items[product_index] = unsorted_tree_items[
-                            tree_index
-                        ]
-
-        log.info("Assigned product items to the appropriate tree items.")
-
-        # print([i.name for i in self._products])
-        # print([item for item in sorted_tree_items])
 
         log.info("Reordering tree items...")
-        for index, value in enumerate(sorted_tree_items):
-            self._list_box.select(value)
-            current_position = self._list_box.item_texts().index(value)
-            target_position = index
-            for _ in range(current_position - target_position):
-                self._btn_up.click()
-
+        try:
+            reorder.run(
+                deadline=deadline,
+                cancel=self._cancel.check if self._cancel is not None else None,
+            )
+        except OutOfSyncError as e:
+            raise WarningError(str(e)) from e
+        self._finished = reorder.finished
+        if block_moves and not reorder.block_moves:
+            log.warning(
+                "The reorder window doesn't move multiple rows at once, "
+                "fell back to single row moves."
+            )
+        if reorder.repairs:
+            log.warning(
+                f"The reorder window was out of sync {reorder.repairs} times, "
+                "repaired the order from the actual rows."
+            )
+        log.debug(f"Reordered with {reorder.moves} moves and {reorder.clicks} clicks.")
+
+        if not reorder.finished:
+            left = f"{reorder.remaining} of {len(reorder.plan.moves)} moves are left"
+            if (
+                reorder.cancelled
+                and resource.settings.tree.on_cancel == ON_CANCEL_ABORT
+            ):
+                raise Cancelled(f"The sort has been cancelled, {left}.")
+            if self._journal is not None:
+                self._journal.confirm(self._backend.item_texts())
+            reason = (
+                "The sort has been cancelled"
+                if reorder.cancelled
+                else f"The time budget of {budget}s is used up"
+            )
+            log.warning(
+                f"{reason}, {left}. The order so far is applied, run the app again "
+                "to continue."
+            )
+            return
         log.info("Successfully reordered graph tree items.")
 
-    def _filter(self, product: Product) -> tuple | None:
-        return (
-            (product.source, product.name) if isinstance(product.source, int) else None
-        )
+    def _target(self, texts: List[str]) -> Tuple[List[str], List[int] | None]:
+        """Sorts the products and returns the rows of the list box in target order.
 
+        Args:
+            texts (List[str]): The rows of the list box.
 
-class Filter:
-    """Filter class for the sort algorithm."""
+        Raises:
+            WarningError: Raised when the products cannot be assigned to the rows.
 
-    @staticmethod
-    def default(product: Product):
-        """
-        The default filter for the sort algorithm.
-        Filters by the following logic:
-
-        - Source of the tree node
-        - Group property of the tree node (if the node has the property "group")
-        - Group identifier (the empty CATProduct which is used as separator)
-        - Filter property
-        - Part number
-        - Instance number
-        """
-        filter_property: StrParam | None = None
-        props = product.reference_product.user_ref_properties
-
-        def _exists(name: str):
-            for i in range(1, props.count + 1):
-                if props.item(i).name == name:
-                    return True
-            return False
-
-        filter_property = (
-            StrParam(props.item(resource.props.filter).com_object)
-            if _exists(resource.props.filter)
-            else None
+        Returns:
+            Tuple[List[str], List[int] | None]: The rows in target order, and the \
+                section of each row (None if the sort key has no sections).
+        """
+        order = self.order()
+        nodes: List[TreeNode | None] = [None] * len(order)
+        for index, target in enumerate(order):
+            nodes[target] = self._nodes[index]
+
+        match = self._match(nodes=nodes, texts=texts)  # type: ignore
+        if not match.ok:
+            raise WarningError(
+                "Cannot assign all items from assembly to the listbox.\n\n"
+                + match.describe(texts)
+            )
+        log.info("Assigned product items to the appropriate tree items.")
+        return (
+            [texts[row] for row in match.rows],  # type: ignore
+            (
+                self._sections(nodes)  # type: ignore
+                # The sections would require the keys of all products.
+                if self._sort_key.has_sections and not self._selection
+                else None
+            ),
         )
-        group_property = (
-            StrParam(props.item(resource.props.group).com_object)
-            if _exists(resource.props.group)
-            else None
+
+    def _sections(self, nodes: List[TreeNode]) -> List[int]:
+        """Returns the section of each node, in target order."""
+        sections: List[int] = []
+        previous = None
+        for node in nodes:
+            section = self._sort_key.section(
+                source=node.source,  # type: ignore
+                part_number=node.part_number,
+                name=node.name,
+                properties=node.properties,
+            )
+            if sections and section == previous:
+                sections.append(sections[-1])
+            else:
+                sections.append(sections[-1] + 1 if sections else 0)
+            previous = section
+        return sections
+
+    def _resume(self, texts: List[str]) -> Tuple[List[str], List[int] | None] | None:
+        """Returns the target order of an interrupted run from the journal, if it
+        contains the same rows as the list box. Skips sorting the products."""
+        if self._journal is None or self._journal.target is None:
+            return None
+        if (resumed := self._journal.resume(texts)) is None:
+            log.info("The tree has changed since the interrupted run, sorting again.")
+            return None
+        log.info(
+            f"Resuming the interrupted run, {self._journal.confirmed} of "
+            f"{len(resumed[0])} items have been confirmed."
         )
-        group_identifier = (
-            StrParam(props.item(PROP_GROUP_IDENTIFIER).com_object)
-            if _exists(PROP_GROUP_IDENTIFIER)
-            else None
+        return resumed
+
+    def _checkpoint(self, rows: List[str]) -> None:
+        """Applies the verified rows to the tree and records them in the journal,
+        so an interruption doesn't lose the moves done so far."""
+        assert self._backend is not None
+        assert self._journal is not None
+        self._backend.apply()
+        self._journal.confirm(rows)
+        log.debug(f"Checkpoint: {self._journal.confirmed} items confirmed.")
+
+    def _key(self, node: TreeNode | PlanNode) -> tuple:
+        """Returns the sort key of the node from the compiled sort key."""
+        return self._sort_key.key(
+            source=node.source,  # type: ignore
+            part_number=node.part_number,
+            name=node.name,
+            properties=node.properties,
         )
 
-        key = (
-            # Items are sorted by their source first
-            product.source,
-            # Items are then sorted by their group (items with no group are last)
-            1 if group_property else 2,
-            group_property.value if group_property else "",
-            # Group identifiers
-            1 if group_identifier else 2,
-            group_identifier.value if group_identifier else "",
-            # Bought items are then sorted by the filter property
-            filter_property.value if filter_property and product.source == 2 else "",
-            # Finally items are sorted by the partnumber and name
-            product.part_number,
-            product.name,
-        )
+    def _match(self, nodes: List[TreeNode], texts: List[str]) -> MatchResult:
+        """Assigns the nodes to the rows of the list box.
 
-        log.debug(f"Filter key: {key}")
-        return key
+        If a node label template is set, rows are matched by instance number and
+        part number (if the template contains the part number). Otherwise rows are
+        matched by the instance number found with the delimiter.
 
-    @staticmethod
-    def default_2(product: Product):
-        """Experimental default filter."""
-        filter_property: StrParam | None = None
-
-        for prop in product.parameters.all_parameters():
-            try:
-                prop = StrParam(prop.com_object)
-                if prop.name == resource.props.filter:
-                    filter_property = prop
-                    break
-            except Exception:
-                pass
-
-        if product.source == 2 and filter_property is not None:
-            key = (
-                product.source,
-                filter_property.value,
-                product.part_number,
-                product.name,
-            )
-        else:
-            key = (
-                product.source,
-                product.part_number,
-                product.name,
-            )
+        Args:
+            nodes (List[TreeNode]): The nodes in target order.
+            texts (List[str]): The rows of the list box.
 
-        # log.debug(f"Filter key: {key}")
-        return key
+        Returns:
+            MatchResult: The row of each node.
+        """
+        if self._node_label is not None:
+            fields = [FIELD_INSTANCE_NAME]
+            if FIELD_PART_NUMBER in self._node_label.fields:
+                fields.append(FIELD_PART_NUMBER)
+            return match_items(
+                names=[
+                    (n.name, n.part_number) if len(fields) > 1 else (n.name,)
+                    for n in nodes
+                ],
+                texts=texts,
+                key=self._node_label.row_key(fields),
+            )
 
-    @staticmethod
-    def source(product: Product):
-        return (
-            (product.source, product.name) if isinstance(product.source, int) else None
+        return match_items(
+            names=[node.name for node in nodes],
+            texts=texts,
+            key=(
+                delimiter_key(delimiter=self._delimiter, position=self._position)
+                if self._delimiter is not None
+                else None
+            ),
         )
 
-    @staticmethod
-    def unknown(product: Product):
-        """Filter by source: unknown."""
-        return (product.source, product.name) if product.source == 0 else None
 
-    @staticmethod
-    def made(product: Product):
-        """Filter by source: made."""
-        return (product.source, product.name) if product.source == 1 else None
-
-    @staticmethod
-    def bought(product: Product):
-        """Filter by source: bought."""
-        return (product.source, product.name) if product.source == 2 else None
+def _property_aliases() -> Dict[str, str]:
+    """Returns the property names of the properties.json by their key."""
+    return dict(zip(resource.props.keys, resource.props.values))
@@ -0,0 +1,61 @@
+"""
+    Test the latency measurement of the list box.
+"""
+
+from time import perf_counter
+from typing import List
+
+import pytest
+
+from pytia_reorder_tree.algorithm.calibration import measure_latency
+from pytia_reorder_tree.handler.move_backend.simulated_backend import SimulatedBackend
+
+
+def test_measure_latency():
+    backend = SimulatedBackend(["a", "b", "c"], latency=0.002)
+
+    latency = measure_latency(backend, samples=2)
+
+    assert latency is not None
+    assert latency.click >= 0.002
+    assert backend.clicks == 4
+    # The list box is left in its original order.
+    assert backend.items == ["a", "b", "c"]
+
+
+def test_measure_latency_waits_for_selection():
+    class SlowSelection(SimulatedBackend):
+        # The list box shows a selection a while after it has been set.
+        def select(self, row: int, count: int = 1) -> None:
+            super().select(row, count)
+            self.shown = perf_counter() + 0.005
+
+        def selected_rows(self) -> List[int]:
+            return super().selected_rows() if perf_counter() >= self.shown else []
+
+    latency = measure_latency(SlowSelection(["a", "b"]), samples=1)
+
+    assert latency is not None
+    assert latency.select >= 0.005
+
+
+def test_measure_latency_too_few_rows():
+    assert measure_latency(SimulatedBackend(["a"])) is None
+
+
+def test_measure_latency_timeout():
+    class DeadBackend(SimulatedBackend):
+        def move_down(self) -> None:
+            self.clicks += 1
+
+    with pytest.raises(TimeoutError):
+        measure_latency(DeadBackend(["a", "b"]), timeout=0.01)
+
+
+def test_measure_latency_selection_timeout():
+    class DeadSelection(SimulatedBackend):
+        def selected_rows(self) -> List[int]:
+            return []
+
+    with pytest.raises(TimeoutError):
+        measure_latency(DeadSelection(["a", "b"]), timeout=0.01)
@@ -0,0 +1,106 @@
+"""
+    Test the cooperative cancellation.
+"""
+
+import random
+
+import pytest
+
+from pytia_reorder_tree.algorithm.reorder import Reorder
+from pytia_reorder_tree.handler import cancel
+from pytia_reorder_tree.handler.cancel import CancelToken
+from pytia_reorder_tree.handler.cancel import Cancelled
+from pytia_reorder_tree.handler.move_backend.simulated_backend import SimulatedBackend
+
+
+def test_cancel_token():
+    polls = []
+    token = CancelToken(poll=lambda: polls.append(1), interval=0.0)
+    assert not token.check()
+    assert polls
+
+    token.cancel()
+    assert token.cancelled
+    with pytest.raises(Cancelled):
+        token.raise_if_cancelled()
+
+
+def test_cancel_token_interval():
+    polls = []
+    token = CancelToken(poll=lambda: polls.append(1), interval=60.0)
+    for _ in range(100):
+        token.check()
+    assert not polls
+
+
+def test_cancel_token_keys_in_foreground(monkeypatch: pytest.MonkeyPatch):
+    pressed = set()
+    # The key has been pressed since the last poll.
+    monkeypatch.setattr(
+        cancel,
+        "_key_state_function",
+        lambda: lambda key: 0x0001 if key in pressed else 0,
+    )
+    # The reorder window (handle 1) of another process is in the foreground.
+    monkeypatch.setattr(cancel, "_foreground_function", lambda: lambda: (1, 0))
+    token = CancelToken(interval=0.0)
+
+    pressed.add(cancel.VK_PAUSE)
+    assert not token.check()
+
+    # The reorder window closes itself on escape, escape doesn't cancel there.
+    token.watch(1)
+    pressed = {cancel.VK_ESCAPE}
+    assert not token.check()
+
+    pressed = {cancel.VK_PAUSE}
+    assert token.check()
+
+
+def test_cancel_token_escape_in_app(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(
+        cancel,
+        "_key_state_function",
+        lambda: lambda key: 0x0001 if key == cancel.VK_ESCAPE else 0,
+    )
+    # A window of the app is in the foreground.
+    monkeypatch.setattr(
+        cancel, "_foreground_function", lambda: lambda: (2, cancel.os.getpid())
+    )
+    token = CancelToken(interval=0.0)
+
+    assert token.check()
+
+
+def test_reorder_cancelled_within_move():
+    target = [f"Part.{i}" for i in range(20)]
+    items = target[1:] + target[:1]
+    backend = SimulatedBackend(items, multi_selection=False)
+
+    # Cancels after the fifth click of the single move (19 clicks).
+    reorder = Reorder(backend=backend, items=items, target=target)
+    reorder.run(cancel=lambda: backend.clicks >= 5)
+
+    assert reorder.cancelled
+    assert not reorder.finished
+    assert reorder.remaining == 1
+    assert backend.clicks == reorder.clicks == 5
+
+    # The mirror stayed in sync, a new run finishes from the actual rows.
+    resumed = Reorder(backend=backend, items=backend.items, target=target)
+    resumed.run()
+    assert backend.items == target
+
+
+def test_reorder_cancelled_between_moves():
+    rng = random.Random(2)
+    target = [f"Part.{i}" for i in range(40)]
+    items = rng.sample(target, len(target))
+    backend = SimulatedBackend(items)
+
+    reorder = Reorder(backend=backend, items=items, target=target)
+    reorder.run(cancel=lambda: True)
+
+    assert reorder.cancelled
+    assert reorder.remaining == len(reorder.plan.moves)
+    assert backend.items == items
@@ -0,0 +1,54 @@
+"""
+    Test the collation of text values.
+"""
+
+import locale
+
+import pytest
+
+from pytia_reorder_tree.algorithm.collation import Collator
+from pytia_reorder_tree.algorithm.collation import set_collation_locale
+
+
+def test_plain():
+    collator = Collator("plain")
+
+    assert sorted(["P-9", "P-10"], key=collator.key) == ["P-10", "P-9"]
+    assert len(collator) == 0
+
+
+def test_natural():
+    collator = Collator("natural")
+    values = ["P-10", "P-9", "P-9a", "P-09", "P", "P-100.2", "P-100.10"]
+
+    assert sorted(values, key=collator.key) == [
+        "P",
+        "P-09",
+        "P-9",
+        "P-9a",
+        "P-10",
+        "P-100.2",
+        "P-100.10",
+    ]
+    # Every value is computed once.
+    assert len(collator) == len(values)
+    assert collator.key("P-10") is collator.key("P-10")
+
+
+def test_locale():
+    set_collation_locale("C")
+    collator = Collator("locale", locale_name="C")
+
+    assert sorted(["b", "a"], key=collator.key) == ["a", "b"]
+    assert locale.setlocale(locale.LC_COLLATE) == "C"
+    # The locale is set once per process, not per sort.
+    with pytest.raises(ValueError):
+        Collator("locale", locale_name="POSIX")
+    assert locale.setlocale(locale.LC_COLLATE) == "C"
+
+
+def test_invalid():
+    with pytest.raises(ValueError):
+        Collator("unknown")
+    with pytest.raises(ValueError):
+        Collator("locale", locale_name="xx_INVALID")
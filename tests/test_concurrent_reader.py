@@ -0,0 +1,115 @@
+"""
+    Test the concurrent reader against a stand-in object model.
+"""
+
+import threading
+import time
+
+from pytia_reorder_tree.handler.concurrent_reader import Apartment
+from pytia_reorder_tree.handler.concurrent_reader import ConcurrentReader
+
+
+class Collection:
+    """Stand-in for a COM collection. Reading an item takes a while, a serialized
+    collection handles one read at a time (like a single threaded COM server)."""
+
+    def __init__(self, count: int, serialized: bool = False) -> None:
+        self.items = [f"Part.{index}" for index in range(count)]
+        self.lock = threading.Lock() if serialized else None
+        self.threads = set()
+
+    def item(self, index: int) -> str:
+        self.threads.add(threading.get_ident())
+        if self.lock is None:
+            time.sleep(0.002)
+            return self.items[index]
+        with self.lock:
+            time.sleep(0.002)
+            return self.items[index]
+
+
+class Proxy:
+    """Stand-in for an interface that has been marshalled into another thread."""
+
+    def __init__(self, collection: Collection) -> None:
+        self.collection = collection
+
+    def item(self, index: int) -> str:
+        return self.collection.item(index)
+
+
+class RecordingApartment(Apartment):
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.initialized = 0
+        self.uninitialized = 0
+        self.tokens = []
+
+    def initialize(self) -> None:
+        self.initialized += 1
+
+    def uninitialize(self) -> None:
+        self.uninitialized += 1
+
+    def marshal(self, obj):
+        self.tokens.append(obj)
+        return len(self.tokens) - 1
+
+    def unmarshal(self, token):
+        if self.fail:
+            raise RuntimeError("Interface not registered.")
+        return Proxy(self.tokens[token])
+
+
+def _read(root, index: int) -> str:
+    return root.item(index)
+
+
+def test_concurrent_reader():
+    collection = Collection(400)
+    apartment = RecordingApartment()
+    reader = ConcurrentReader(threads=4, apartment=apartment, probe=8)
+    indices = list(range(399, -1, -2))
+
+    assert reader.read(collection, indices, _read) == [
+        f"Part.{index}" for index in indices
+    ]
+    assert reader.concurrent
+    assert reader.speedup > 1.3
+    assert len(collection.threads) > 1
+    # One apartment and one marshalled interface per chunk.
+    assert apartment.initialized == apartment.uninitialized == len(apartment.tokens)
+
+
+def test_concurrent_reader_falls_back():
+    collection = Collection(400, serialized=True)
+    reader = ConcurrentReader(threads=4, probe=8)
+
+    assert reader.read(collection, range(400), _read) == collection.items
+    assert not reader.concurrent
+    assert reader.speedup < 1.3
+
+
+def test_concurrent_reader_error():
+    collection = Collection(100)
+    apartment = RecordingApartment(fail=True)
+    reader = ConcurrentReader(threads=4, apartment=apartment, probe=8)
+
+    assert reader.read(collection, range(100), _read) == collection.items
+    assert not reader.concurrent
+    assert reader.error == "Interface not registered."
+    assert apartment.initialized == apartment.uninitialized
+
+
+def test_concurrent_reader_sequential():
+    collection = Collection(20)
+    apartment = RecordingApartment()
+
+    assert ConcurrentReader(threads=1).read(collection, range(20), _read) == (
+        collection.items
+    )
+    # Too few items to measure the throughput.
+    reader = ConcurrentReader(threads=4, apartment=apartment, probe=8)
+    assert reader.read(collection, range(20), _read) == collection.items
+    assert reader.speedup is None
+    assert apartment.initialized == 0
@@ -0,0 +1,67 @@
+"""
+    Test the cost model of the reorder engines.
+"""
+
+import random
+
+from pytia_reorder_tree.algorithm.cost_model import ENGINE_API
+from pytia_reorder_tree.algorithm.cost_model import ENGINE_WINDOW
+from pytia_reorder_tree.algorithm.cost_model import api_conflicts
+from pytia_reorder_tree.algorithm.cost_model import api_cost
+from pytia_reorder_tree.algorithm.cost_model import choose_engine
+from pytia_reorder_tree.algorithm.cost_model import window_cost
+from pytia_reorder_tree.algorithm.planner import readded_rows
+
+
+def test_sorted_tree_uses_no_operations():
+    order = list(range(100))
+
+    assert window_cost(order).operations == 0
+    assert api_cost(order).operations == 0
+    # Opening the window is never for free.
+    assert choose_engine(window_cost(order), api_cost(order)).engine == ENGINE_API
+
+
+def test_engine_choice():
+    # The first item is at the bottom: A single move in the window, but all other
+    # components have to be added again.
+    order = list(range(1, 500)) + [0]
+    window, api = window_cost(order, block_moves=False), api_cost(order)
+    assert window.operations == 499
+    assert api.operations == 499
+    assert choose_engine(window, api).engine == ENGINE_WINDOW
+
+    # Fast clicks make the window cheaper, slow clicks the api.
+    order = list(reversed(range(200)))
+    fast = window_cost(order, block_moves=False, click=0.001, select=0.001)
+    slow = window_cost(order, block_moves=False)
+    assert choose_engine(fast, api_cost(order)).engine == ENGINE_WINDOW
+    assert choose_engine(slow, api_cost(order)).engine == ENGINE_API
+
+
+def _api_reorder(order, instances):
+    """Re-adds the components like the api engine: New instances of the same
+    reference, which keep only the name."""
+    keep = len(order) - len(readded_rows(order))
+    kept = [instances[row] for row, target in enumerate(order) if target < keep]
+    return kept + [{"name": instances[row]["name"]} for row in readded_rows(order)]
+
+
+def test_identifiers_keep_bom_exclusion():
+    rng = random.Random(4)
+    for _ in range(200):
+        order = rng.sample(range(8), 8)
+        instances = [{"name": f"Part.{row}"} for row in range(8)]
+        for row in rng.sample(range(8), 2):
+            instances[row]["no_bom"] = True
+        identifiers = ["no_bom" in instance for instance in instances]
+
+        tree = _api_reorder(order, instances)
+        lost = sum(identifiers) - sum("no_bom" in instance for instance in tree)
+        # The api engine is refused exactly if identifiers would lose their BOM
+        # exclusion.
+        assert bool(api_conflicts(order, identifiers.__getitem__)) == bool(lost)
+
+    # The identifier in the stable prefix stays, the moved one is re-added.
+    assert api_conflicts([0, 2, 1], [True, False, False].__getitem__) == []
+    assert api_conflicts([0, 2, 1], [False, True, False].__getitem__) == [1]
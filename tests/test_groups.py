@@ -0,0 +1,244 @@
+"""
+    Test removing, renaming and finding the group identifiers, against a stand-in
+    product tree.
+"""
+
+from typing import Dict
+from typing import List
+
+import pytest
+
+from pytia_reorder_tree.const import PROP_GROUP_IDENTIFIER
+from pytia_reorder_tree.task import groups
+from pytia_reorder_tree.task.groups import Groups
+from pytia_reorder_tree.task.snapshot import TreeSnapshot
+
+
+class ComObject:
+    """Stand-in for the COM object of a product or a products collection."""
+
+    def __init__(self, parent: "ComObject | None") -> None:
+        self.Parent = parent
+
+
+class Property:
+    """Stand-in for a user property."""
+
+    def __init__(self, name: str, value: str) -> None:
+        self.name = name
+        self._value = value
+
+    def value_as_string(self) -> str:
+        return self._value
+
+
+class Properties:
+    """Stand-in for the user properties of a reference product, counts the sweeps."""
+
+    def __init__(self, values: Dict[str, str]) -> None:
+        self.values = values
+        self.sweeps = 0
+
+    @property
+    def count(self) -> int:
+        self.sweeps += 1
+        return len(self.values)
+
+    def item(self, index: int) -> Property:
+        return [Property(name, value) for name, value in self.values.items()][index - 1]
+
+
+class Child:
+    """Stand-in for a child of the product, records its instance names."""
+
+    def __init__(self, name: str, values: Dict[str, str], father: ComObject) -> None:
+        self.names = [name]
+        self.part_number = name.split(".")[0]
+        self.source = 1
+        self.reference_product = type(
+            "Reference", (), {"user_ref_properties": Properties(values)}
+        )()
+        self.com_object = ComObject(parent=ComObject(parent=father))
+
+    @property
+    def name(self) -> str:
+        return self.names[-1]
+
+    @name.setter
+    def name(self, value: str) -> None:
+        self.names.append(value)
+
+    def is_catproduct(self) -> bool:
+        return False
+
+    def is_catpart(self) -> bool:
+        return True
+
+
+class Products:
+    """Stand-in for the products collection, removes the children by name."""
+
+    def __init__(self) -> None:
+        self.items: List[Child] = []
+        self.removed: List[str] = []
+
+    def __iter__(self):
+        return iter(list(self.items))
+
+    def remove(self, name: str) -> None:
+        self.removed.append(name)
+        self.items = [child for child in self.items if child.name != name]
+
+
+class Product:
+    """Stand-in for the product which children are sorted."""
+
+    def __init__(self) -> None:
+        self.products = Products()
+        self.com_object = ComObject(parent=None)
+
+    def add(self, name: str, identifier: bool = False) -> Child:
+        values = {PROP_GROUP_IDENTIFIER: "1"} if identifier else {}
+        child = Child(name, values, father=self.com_object)
+        self.products.items.append(child)
+        return child
+
+
+class Element:
+    """Stand-in for a selected element."""
+
+    def __init__(self, value: Child) -> None:
+        self.type = "Product"
+        self.value = value
+
+
+class Selection:
+    """Stand-in for the selection of the document. The search finds all flagged
+    children of the selected product, the delete removes the selected children."""
+
+    def __init__(self, product: Product, fail: bool = False) -> None:
+        self._product = product
+        self._fail = fail
+        self._items: List[Child] = []
+        self.queries: List[str] = []
+        self.deleted = 0
+
+    @property
+    def count(self) -> int:
+        return len(self._items)
+
+    def item(self, index: int) -> Element:
+        return Element(self._items[index - 1])
+
+    def clear(self) -> None:
+        self._items = []
+
+    def add(self, product: Child | Product) -> None:
+        if self._fail:
+            raise RuntimeError("The selection failed.")
+        if isinstance(product, Child):
+            self._items.append(product)
+
+    def search(self, query: str) -> None:
+        self.queries.append(query)
+        self._items = [
+            child
+            for child in self._product.products.items
+            if PROP_GROUP_IDENTIFIER
+            in child.reference_product.user_ref_properties.values
+        ]
+
+    def delete(self) -> None:
+        self.deleted += 1
+        self._product.products.items = [
+            child for child in self._product.products.items if child not in self._items
+        ]
+        self._items = []
+
+
+def _groups(
+    monkeypatch: pytest.MonkeyPatch, product: Product, selection: Selection, lazy: bool
+) -> Groups:
+    groups.resource.apply_language("en")
+    document = type("Document", (), {"selection": selection})()
+    monkeypatch.setattr(groups, "ProductDocument", lambda com_object: document)
+    active_document = type("ActiveDocument", (), {"com_object": None})()
+    caa = type("Application", (), {"active_document": active_document})()
+    snapshot = TreeSnapshot(product=product, names=(), lazy=lazy)  # type: ignore
+    return Groups(caa=caa, product=product, snapshot=snapshot)  # type: ignore
+
+
+def test_remove_with_selection(monkeypatch: pytest.MonkeyPatch):
+    product = Product()
+    product.add("Part.1")
+    product.add("GROUP.1", identifier=True)
+    product.add("GROUP.2", identifier=True)
+    selection = Selection(product)
+    group = _groups(monkeypatch, product, selection, lazy=False)
+
+    group._remove(group.identifiers())
+
+    assert selection.deleted == 1
+    assert product.products.removed == []
+    assert [node.name for node in group._snapshot.nodes] == ["Part.1"]
+    assert [child.name for child in product.products] == ["Part.1"]
+
+
+def test_remove_without_selection(monkeypatch: pytest.MonkeyPatch):
+    product = Product()
+    product.add("GROUP.1", identifier=True)
+    product.add("Part.1")
+    selection = Selection(product, fail=True)
+    group = _groups(monkeypatch, product, selection, lazy=False)
+
+    # The search fails as well, the properties of the nodes are checked.
+    group._remove(group.identifiers())
+
+    assert selection.deleted == 0
+    assert product.products.removed == ["GROUP.1"]
+    assert [node.name for node in group._snapshot.nodes] == ["Part.1"]
+
+
+def test_rename():
+    product = Product()
+    first = product.add("GROUP.2", identifier=True)
+    second = product.add("GROUP.3", identifier=True)
+    snapshot = TreeSnapshot(product=product, names=())  # type: ignore
+    group = Groups(caa=None, product=product, snapshot=snapshot)  # type: ignore
+    nodes = snapshot.nodes
+
+    # No new name is taken: The identifiers are renamed directly.
+    group._rename([(nodes[1], "GROUP.4")])
+    assert second.names == ["GROUP.3", "GROUP.4"]
+
+    # The new name of the second identifier is still taken by the first one.
+    group._rename([(nodes[0], "GROUP.1"), (nodes[1], "GROUP.2")])
+    assert first.names == ["GROUP.2", "GROUP.1~", "GROUP.1"]
+    assert second.names == ["GROUP.3", "GROUP.4", "GROUP.2~", "GROUP.2"]
+    assert [node.name for node in snapshot.nodes] == ["GROUP.1", "GROUP.2"]
+
+
+def test_identifiers_from_search(monkeypatch: pytest.MonkeyPatch):
+    product = Product()
+    part = product.add("Part.1")
+    product.add("GROUP.1", identifier=True)
+    selection = Selection(product)
+    group = _groups(monkeypatch, product, selection, lazy=True)
+
+    assert [node.name for node in group.identifiers()] == ["GROUP.1"]
+    assert selection.queries == [
+        f"Product Structure.Product.'{PROP_GROUP_IDENTIFIER}'=1,in"
+    ]
+    assert selection.count == 0
+    # The properties of the other nodes aren't read.
+    assert part.reference_product.user_ref_properties.sweeps == 0
+
+
+def test_identifiers_of_children_only(monkeypatch: pytest.MonkeyPatch):
+    product = Product()
+    product.add("GROUP.1", identifier=True)
+    nested = product.add("GROUP.2", identifier=True)
+    nested.com_object = ComObject(parent=ComObject(parent=ComObject(parent=None)))
+    group = _groups(monkeypatch, product, Selection(product), lazy=True)
+
+    assert [node.name for node in group.identifiers()] == ["GROUP.1"]
@@ -0,0 +1,55 @@
+"""
+    Test the insertion of selected nodes into a sorted tree.
+"""
+
+import random
+
+import pytest
+
+from pytia_reorder_tree.algorithm.insertion import plan_insertion
+
+
+def _full_order(keys):
+    indices = sorted(range(len(keys)), key=keys.__getitem__)
+    order = [0] * len(keys)
+    for target, index in enumerate(indices):
+        order[index] = target
+    return order
+
+
+def test_plan_insertion():
+    rng = random.Random(4)
+    tree = sorted(rng.randrange(500) for _ in range(1000))
+    # Five new nodes, appended at the end of the tree.
+    tree += [rng.randrange(500) for _ in range(5)]
+    calls = []
+
+    def _key(index):
+        calls.append(index)
+        return tree[index]
+
+    plan = plan_insertion(count=len(tree), selected=range(1000, 1005), key=_key)
+
+    assert plan.order == _full_order(tree)
+    assert plan.keys == len(calls) == len(set(calls))
+    assert plan.keys < 100
+    assert plan.window.stop == len(tree)
+    assert all(plan.order[i] == i for i in range(len(tree)) if i not in plan.window)
+
+
+def test_plan_insertion_ties():
+    # Equal keys keep the tree order, like a stable sort.
+    tree = ["a", "b", "b", "c", "b"]
+    plan = plan_insertion(count=5, selected=[0, 4], key=tree.__getitem__)
+    assert plan.order == _full_order(tree)
+
+    plan = plan_insertion(count=3, selected=[], key=["a", "b", "c"].__getitem__)
+    assert plan.order == [0, 1, 2]
+    assert plan.affected == 0
+    assert plan.keys == 0
+
+
+def test_plan_insertion_unsorted():
+    tree = [5, 4, 3, 2, 1, 0]
+    with pytest.raises(ValueError):
+        plan_insertion(count=len(tree), selected=[5], key=tree.__getitem__)
@@ -0,0 +1,131 @@
+"""
+    Test the journal of interrupted runs.
+"""
+
+import json
+import random
+import time
+from pathlib import Path
+
+import pytest
+
+from pytia_reorder_tree.algorithm import reorder as reorder_module
+from pytia_reorder_tree.algorithm.reorder import Reorder
+from pytia_reorder_tree.handler.journal import STAGE_GROUPS
+from pytia_reorder_tree.handler.journal import STAGE_SORT
+from pytia_reorder_tree.handler.journal import Journal
+from pytia_reorder_tree.handler.journal import tree_fingerprint
+from pytia_reorder_tree.handler.move_backend.simulated_backend import SimulatedBackend
+
+DOCUMENT = "C:\\Projects\\Assembly.CATProduct"
+TREE = tree_fingerprint([("Part.1", "P-1"), ("Part.2", "P-2")])
+
+
+def test_journal_resume(tmp_path: Path):
+    journal = Journal(folder=tmp_path, document=DOCUMENT)
+    assert not journal.resumed
+    journal.finish(STAGE_GROUPS, fingerprint=TREE)
+    journal.set_target(["a", "b", "c", "d"])
+    journal.confirm(["a", "b", "d", "c"])
+
+    resumed = Journal(folder=tmp_path, document=DOCUMENT)
+    assert resumed.resumed
+    assert resumed.check(TREE)
+    assert resumed.finished(STAGE_GROUPS)
+    assert not resumed.finished(STAGE_SORT)
+    assert resumed.target == ["a", "b", "c", "d"]
+    assert resumed.confirmed == 2
+    assert resumed.sections is None
+
+    # Other documents have their own journal.
+    assert not Journal(folder=tmp_path, document="C:\\Other.CATProduct").resumed
+
+    resumed.delete()
+    assert not resumed.path.exists()
+    assert not Journal(folder=tmp_path, document=DOCUMENT).resumed
+
+
+def test_journal_tree_changed(tmp_path: Path):
+    journal = Journal(folder=tmp_path, document=DOCUMENT)
+    journal.finish(STAGE_GROUPS, fingerprint=TREE)
+    journal.finish(STAGE_SORT, fingerprint=TREE)
+    journal.set_target(["a", "b"])
+
+    # The order of the children doesn't change the fingerprint.
+    assert tree_fingerprint([("Part.2", "P-2"), ("Part.1", "P-1")]) == TREE
+
+    # A part has been added, all stages have to run again.
+    changed = tree_fingerprint([("Part.1", "P-1"), ("Part.2", "P-2"), ("X.1", "X")])
+    resumed = Journal(folder=tmp_path, document=DOCUMENT)
+    assert not resumed.check(changed)
+    assert not resumed.finished(STAGE_SORT)
+    assert resumed.target is None
+    assert resumed.check(changed)
+
+
+def test_journal_sort_settings_changed(tmp_path: Path):
+    journal = Journal(folder=tmp_path, document=DOCUMENT)
+    journal.check(TREE)
+    journal.set_target(["a", "b"])
+    journal.finish(STAGE_GROUPS, fingerprint=TREE)
+
+    # Same tree, other sort keys: The target order isn't resumed.
+    spec = tree_fingerprint([("Part.1", "P-1"), ("Part.2", "P-2")], spec="natural")
+    assert spec != TREE
+    resumed = Journal(folder=tmp_path, document=DOCUMENT)
+    assert not resumed.check(spec)
+    assert resumed.target is None
+
+
+def test_journal_sections(tmp_path: Path):
+    journal = Journal(folder=tmp_path, document=DOCUMENT)
+    journal.set_target(["a", "b", "c"], sections=[0, 0, 1])
+
+    assert Journal(folder=tmp_path, document=DOCUMENT).sections == [0, 0, 1]
+
+
+def test_journal_discarded(tmp_path: Path):
+    journal = Journal(folder=tmp_path, document=DOCUMENT)
+    journal.finish(STAGE_GROUPS, fingerprint=TREE)
+
+    # Old journals are discarded.
+    data = json.loads(journal.path.read_text(encoding="utf8"))
+    data["timestamp"] = time.time() - 3600
+    journal.path.write_text(json.dumps(data), encoding="utf8")
+    assert Journal(folder=tmp_path, document=DOCUMENT, max_age=7200).resumed
+    assert not Journal(folder=tmp_path, document=DOCUMENT, max_age=60).resumed
+
+    # Broken journals are discarded.
+    journal.path.write_text("{", encoding="utf8")
+    assert not Journal(folder=tmp_path, document=DOCUMENT).resumed
+
+
+def test_journal_budget_stop_and_resume(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    rng = random.Random(6)
+    target = [f"P-{i} | Part.{i}" for i in range(60)]
+    items = rng.sample(target, len(target))
+    backend = SimulatedBackend(items)
+    # The time budget is used up after 20 clicks.
+    monkeypatch.setattr(reorder_module, "perf_counter", lambda: backend.clicks)
+
+    journal = Journal(folder=tmp_path, document=DOCUMENT)
+    journal.check(TREE)
+    journal.set_target(target)
+    reorder = Reorder(backend=backend, items=items, target=target)
+    reorder.run(deadline=20)
+    assert not reorder.finished
+    journal.confirm(backend.item_texts())
+
+    # Renamed instances change the rows, the target order couldn't be used.
+    renumbered = [text.replace("Part.", "Part.0") for text in backend.item_texts()]
+    assert Journal(folder=tmp_path, document=DOCUMENT).resume(renumbered) is None
+
+    # The next run continues from the rows the stopped run has left behind.
+    resumed = Journal(folder=tmp_path, document=DOCUMENT)
+    assert resumed.check(TREE)
+    assert resumed.resume(backend.item_texts()) == (target, None)
+    reorder = Reorder(backend=backend, items=backend.item_texts(), target=target)
+    reorder.run()
+    assert backend.items == target
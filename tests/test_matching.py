@@ -0,0 +1,62 @@
+"""
+    Test the matching of product nodes and reorder list box rows.
+"""
+
+from pytia_reorder_tree.algorithm.matching import delimiter_key
+from pytia_reorder_tree.algorithm.matching import match_items
+
+
+def test_match_by_delimiter():
+    texts = ["P-2 | P-2.1 | Made", "P-1 | P-1.1 | Made", "P-1 | P-1.2 | Made"]
+    result = match_items(
+        names=["P-1.1", "P-1.2", "P-2.1"],
+        texts=texts,
+        key=delimiter_key(delimiter=" | ", position=1),
+    )
+
+    assert result.ok
+    assert result.rows == [1, 2, 0]
+
+
+def test_duplicate_rows():
+    texts = ["P-1 | P-1.1", "P-2 | P-1.1", "P-3 | P-3.1"]
+    result = match_items(
+        names=["P-1.1", "P-3.1"],
+        texts=texts,
+        key=delimiter_key(delimiter=" | ", position=1),
+    )
+
+    assert not result.ok
+    assert result.duplicates == {"P-1.1": [0, 1]}
+    assert result.unassigned == []
+    assert "P-1.1" in result.describe(texts)
+
+
+def test_missing_and_unassigned():
+    texts = ["P-1 | P-1.1", "P-2"]
+    result = match_items(
+        names=["P-1.1", "P-2.1"],
+        texts=texts,
+        key=delimiter_key(delimiter=" | ", position=1),
+    )
+
+    assert result.missing == ["P-2.1"]
+    assert result.unassigned == [1]
+
+
+def test_match_without_delimiter():
+    # `Part.1` is a substring of `Part.10`, but `Part.10` can only be in row 0.
+    texts = ["Part.10 (Part)", "Part.1 (Part)", "Part.2"]
+    result = match_items(names=["Part.1", "Part.10", "Part.2"], texts=texts, key=None)
+
+    assert result.ok
+    assert result.rows == [1, 0, 2]
+
+
+def test_ambiguous_without_delimiter():
+    texts = ["Part.1 (A)", "Part.1 (B)"]
+    result = match_items(names=["Part.1"], texts=texts, key=None)
+
+    assert not result.ok
+    assert result.ambiguous == {"Part.1": [0, 1]}
+    assert result.unassigned == []
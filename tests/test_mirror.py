@@ -0,0 +1,51 @@
+"""
+    Test the mirrored list box of the reorder window.
+"""
+
+import pytest
+
+from pytia_reorder_tree.algorithm.mirror import ListBoxMirror
+
+
+def test_moves():
+    mirror = ListBoxMirror(["a", "b", "c", "d"])
+
+    assert mirror.move_up(2) == 1
+    assert mirror.items == ["a", "c", "b", "d"]
+    assert mirror.row("c") == 1
+    assert mirror.row("b") == 2
+
+    assert mirror.move_down(1) == 2
+    assert mirror.move_down(2) == 3
+    assert mirror.items == ["a", "b", "d", "c"]
+
+    # Clicks at the borders of the list box don't move the row.
+    assert mirror.move_up(0) == 0
+    assert mirror.move_down(3) == 3
+    assert mirror.item(3) == "c"
+
+
+def test_block_moves():
+    mirror = ListBoxMirror(["a", "b", "c", "d", "e"])
+
+    assert mirror.move_up(2, count=2) == 1
+    assert mirror.items == ["a", "c", "d", "b", "e"]
+    assert mirror.move_down(1, count=2) == 2
+    assert mirror.items == ["a", "b", "c", "d", "e"]
+    assert [mirror.row(i) for i in "abcde"] == [0, 1, 2, 3, 4]
+
+    # The block can't move beyond the last row.
+    assert mirror.move_down(3, count=2) == 3
+
+
+def test_mismatches():
+    mirror = ListBoxMirror(["a", "b", "c"])
+
+    assert mirror.mismatches(["a", "b", "c"]) == []
+    assert mirror.mismatches(["a", "c", "b"]) == [1, 2]
+    assert mirror.mismatches(["a", "b"]) == [0, 1, 2]
+
+
+def test_unique_rows():
+    with pytest.raises(ValueError):
+        ListBoxMirror(["a", "a"])
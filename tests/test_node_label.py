@@ -0,0 +1,39 @@
+"""
+    Test the node label template parser.
+"""
+
+import pytest
+
+from pytia_reorder_tree.algorithm.node_label import NodeLabelTemplate
+
+
+def test_parse():
+    template = NodeLabelTemplate("#PN# | #IN# | #SO#")
+
+    assert template.fields == ("PN", "IN", "SO")
+    assert template.parse("P-1 | P-1.1 | Made") == {
+        "PN": "P-1",
+        "IN": "P-1.1",
+        "SO": "Made",
+    }
+    assert template.parse("P-1 (P-1.1)") is None
+
+
+def test_parse_all():
+    template = NodeLabelTemplate("#IN# (#PN#)")
+    rows = ["A.1 (A)", "B.2 (B (old))", "invalid"]
+
+    assert template.parse_all(rows, fields=["IN", "PN"]) == [
+        ("A.1", "A"),
+        ("B.2", "B (old)"),
+        None,
+    ]
+
+
+def test_invalid_templates():
+    with pytest.raises(ValueError):
+        NodeLabelTemplate("no fields")
+    with pytest.raises(ValueError):
+        NodeLabelTemplate("#IN# #IN#")
+    with pytest.raises(ValueError):
+        NodeLabelTemplate("#PN#").row_key(["IN"])
@@ -0,0 +1,91 @@
+"""
+    Test the plan of a dry run.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from pytia_reorder_tree.algorithm.cost_model import api_cost
+from pytia_reorder_tree.algorithm.cost_model import window_cost
+from pytia_reorder_tree.algorithm.plan import PlanNode
+from pytia_reorder_tree.algorithm.plan import build_plan
+from pytia_reorder_tree.algorithm.plan import write_plan
+from pytia_reorder_tree.algorithm.planner import plan_moves
+from pytia_reorder_tree.algorithm.renumbering import instance_names
+
+
+def test_instance_names():
+    names = instance_names(
+        part_numbers=["A", "B", "A", "SEP", "A"],
+        skip=[False, False, False, True, False],
+        start_index=1,
+    )
+    assert names == ["A.1", "B.1", "A.2", None, "A.3"]
+    assert instance_names(["A", "A"], [False, False], start_index=0) == ["A.0", "A.1"]
+
+
+def test_build_plan(tmp_path: Path):
+    nodes = [
+        PlanNode(name="B.1", part_number="B", source=1),
+        PlanNode(name="A.7", part_number="A", source=1),
+        PlanNode(name="A.3", part_number="A", source=1),
+        PlanNode(
+            name="--- GROUP.0",
+            part_number="GROUP",
+            source=1,
+            identifier=True,
+            virtual=True,
+        ),
+    ]
+    order = [3, 1, 2, 0]
+    moves = plan_moves(order)
+    costs = [window_cost(order), api_cost(order)]
+
+    plan = build_plan(
+        nodes=nodes,
+        order=order,
+        moves=moves,
+        costs=costs,
+        engine="window",
+        removed=["--- OLD.0"],
+        renamed=[("--- KEPT.2", "--- KEPT.1")],
+    )
+
+    assert plan["groups"] == {
+        "remove": ["--- OLD.0"],
+        "create": ["--- GROUP.0"],
+        "rename": [{"name": "--- KEPT.2", "new_name": "--- KEPT.1"}],
+    }
+    assert [node["name"] for node in plan["target_order"]] == [
+        "--- GROUP.0",
+        "A.7",
+        "A.3",
+        "B.1",
+    ]
+    assert plan["clicks"] == moves.clicks
+    assert len(plan["moves"]) == len(moves.moves)
+    assert plan["renames"] == [
+        {"name": "A.7", "new_name": "A.1"},
+        {"name": "A.3", "new_name": "A.2"},
+    ]
+    assert plan["estimated_seconds"] == round(costs[0].seconds, 1)
+
+    path = Path(tmp_path, "plans", "plan.json")
+    write_plan(plan, path)
+    assert json.loads(path.read_text(encoding="utf8")) == plan
+
+
+def test_build_plan_unknown_engine():
+    order = [1, 0]
+    nodes = [PlanNode(name=f"A.{i}", part_number="A", source=1) for i in order]
+
+    with pytest.raises(ValueError):
+        build_plan(
+            nodes=nodes,
+            order=order,
+            moves=plan_moves(order),
+            costs=[window_cost(order), api_cost(order)],
+            engine="fast",
+        )
@@ -0,0 +1,164 @@
+"""
+    Test the move planner of the reorder task.
+"""
+
+import random
+
+import pytest
+
+from pytia_reorder_tree.algorithm.planner import longest_increasing_subsequence
+from pytia_reorder_tree.algorithm.planner import plan_block_moves
+from pytia_reorder_tree.algorithm.planner import plan_moves
+from pytia_reorder_tree.algorithm.planner import stable_prefix
+
+
+def _apply(order, plan):
+    rows = list(order)
+    for move in plan.moves:
+        assert rows[move.source] == move.item
+        block = rows[move.source : move.source + move.count]
+        del rows[move.source : move.source + move.count]
+        rows[move.target : move.target] = block
+    return rows
+
+
+def _inversions(order):
+    return sum(
+        1 for i, left in enumerate(order) for right in order[i + 1 :] if left > right
+    )
+
+
+def test_lis():
+    values = [3, 1, 4, 0, 5, 2, 6]
+    positions = longest_increasing_subsequence(values)
+    subsequence = [values[i] for i in positions]
+
+    assert subsequence == sorted(subsequence)
+    assert len(subsequence) == 4
+    assert longest_increasing_subsequence([]) == []
+
+
+def test_sorted_order_has_no_moves():
+    plan = plan_moves(list(range(10)))
+
+    assert plan.moves == []
+    assert plan.clicks == 0
+    assert plan.stable == 10
+
+
+def test_single_item_uses_shorter_direction():
+    # The last item must go to the top: one move, all clicks upwards.
+    plan = plan_moves([1, 2, 3, 4, 0])
+    assert len(plan.moves) == 1
+    assert plan.moves[0].up
+    assert plan.clicks == 4
+
+    # The first item must go to the bottom: one move downwards.
+    plan = plan_moves([4, 0, 1, 2, 3])
+    assert len(plan.moves) == 1
+    assert not plan.moves[0].up
+    assert plan.clicks == 4
+
+
+def test_random_orders():
+    generator = random.Random(42)
+    for size in (2, 7, 50, 300):
+        order = list(range(size))
+        generator.shuffle(order)
+        plan = plan_moves(order)
+
+        assert _apply(order, plan) == list(range(size))
+        assert len(plan.moves) == size - plan.stable
+        assert plan.clicks == _inversions(order)
+
+
+def test_large_order():
+    generator = random.Random(3)
+    order = list(range(20000))
+    generator.shuffle(order)
+    plan = plan_moves(order)
+
+    assert _apply(order, plan) == list(range(20000))
+    assert len(plan.moves) == 20000 - plan.stable
+    assert plan.stable == len(longest_increasing_subsequence(order))
+
+
+def test_invalid_order():
+    with pytest.raises(ValueError):
+        plan_moves([0, 0, 1])
+
+
+def test_block_moves():
+    # Three new items at the end belong right after the first item.
+    order = [0, 4, 5, 6, 1, 2, 3]
+    plan = plan_block_moves(order)
+
+    assert len(plan.moves) == 1
+    assert plan.moves[0].count == 3
+    assert plan.clicks == 3
+    assert plan.stable == 4
+    assert _apply(order, plan) == list(range(7))
+
+    single = plan.expand()
+    assert len(single.moves) == 3
+    assert single.clicks == 9
+    assert _apply(order, single) == list(range(7))
+
+
+def test_random_block_moves():
+    generator = random.Random(7)
+    for size in (5, 40, 200):
+        order = list(range(size))
+        for _ in range(size // 10 + 1):
+            start = generator.randrange(size)
+            length = generator.randrange(1, 5)
+            block = order[start : start + length]
+            del order[start : start + length]
+            target = generator.randrange(len(order) + 1)
+            order[target:target] = block
+        plan = plan_block_moves(order)
+
+        assert _apply(order, plan) == list(range(size))
+        assert _apply(order, plan.expand()) == list(range(size))
+        assert plan.clicks <= plan_moves(order).clicks
+
+
+def test_large_block_moves():
+    generator = random.Random(11)
+    order = list(range(20000))
+    for _ in range(2000):
+        start = generator.randrange(len(order))
+        block = order[start : start + generator.randrange(1, 20)]
+        del order[start : start + len(block)]
+        target = generator.randrange(len(order) + 1)
+        order[target:target] = block
+    plan = plan_block_moves(order)
+
+    assert _apply(order, plan) == list(range(20000))
+    assert plan.stable == 20000 - sum(move.count for move in plan.moves)
+
+
+@pytest.mark.parametrize(
+    "order, expected",
+    [
+        ([], 0),
+        ([0], 1),
+        ([0, 1, 2], 3),
+        ([2, 1, 0], 1),
+        ([0, 3, 1, 2], 3),
+        ([1, 0, 2, 3], 1),
+    ],
+)
+def test_stable_prefix(order, expected):
+    assert stable_prefix(order) == expected
+
+
+def test_random_stable_prefix():
+    rng = random.Random(3)
+    for _ in range(200):
+        order = rng.sample(range(12), 12)
+        keep = stable_prefix(order)
+        # Appending all other items in target order gives the target order.
+        rows = [item for item in order if item < keep]
+        rows += sorted(item for item in order if item >= keep)
+        assert rows == list(range(12))
@@ -0,0 +1,124 @@
+"""
+    Test the memoized reference product properties against stand-in products.
+"""
+
+from pathlib import Path
+from typing import Dict
+
+from pytia_reorder_tree.handler.property_store import PropertyStore
+from pytia_reorder_tree.task.properties import PropertyCache
+
+NAMES = ("pytia.group", "pytia.group_identifier")
+
+
+class Property:
+    """Stand-in for a user property."""
+
+    def __init__(self, name: str, value: str) -> None:
+        self.name = name
+        self._value = value
+
+    def value_as_string(self) -> str:
+        return self._value
+
+
+class Properties:
+    """Stand-in for the user properties of a reference product, counts the sweeps."""
+
+    def __init__(self, values: Dict[str, str]) -> None:
+        self._items = [Property(name, value) for name, value in values.items()]
+        self.sweeps = 0
+
+    @property
+    def count(self) -> int:
+        self.sweeps += 1
+        return len(self._items)
+
+    def item(self, index: int) -> Property:
+        return self._items[index - 1]
+
+
+class Document:
+    """Stand-in for the COM object of a product document."""
+
+    def __init__(self, path: Path) -> None:
+        self.FullName = str(path)
+        self.Saved = True
+
+
+class Reference:
+    """Stand-in for a reference product."""
+
+    def __init__(self, values: Dict[str, str], path: Path | None) -> None:
+        self.user_ref_properties = Properties(values)
+        self.com_object = type("ComObject", (), {"Parent": Document(path)})()
+
+
+class Instance:
+    """Stand-in for a product instance."""
+
+    def __init__(self, reference: Reference, part_number: str, source: int) -> None:
+        self.reference_product = reference
+        self.part_number = part_number
+        self.source = source
+
+
+def test_instances_share_the_reference():
+    reference = Reference({"pytia.group": "Frame", "other": "x"}, None)
+    first = Instance(reference, "P-1", source=1)
+    second = Instance(reference, "P-1", source=1)
+    cache = PropertyCache(names=NAMES)
+
+    assert cache.get(first).properties == {"pytia.group": "Frame"}
+    assert cache.get(second, "P-1") is cache.get(first)
+    assert reference.user_ref_properties.sweeps == 1
+    assert len(cache) == 1
+
+    cache.clear()
+    assert cache.get(second).get("pytia.group") == "Frame"
+    assert reference.user_ref_properties.sweeps == 2
+
+
+def test_properties_and_source():
+    reference = Reference({"pytia.group": "Frame", "other": "x"}, None)
+    product = Instance(reference, "P-1", source=2)
+
+    everything = PropertyCache().get(product)
+    assert everything.properties == {"pytia.group": "Frame", "other": "x"}
+    assert everything.source == 2
+
+    # No property required: The sweep is skipped.
+    nothing = PropertyCache(names=(), source=False).get(product)
+    assert nothing.properties == {}
+    assert nothing.source is None
+    assert reference.user_ref_properties.sweeps == 1
+
+
+def test_properties_from_store(tmp_path: Path):
+    path = Path(tmp_path, "Part.CATPart")
+    path.write_text("")
+    reference = Reference({"pytia.group": "Frame"}, path)
+    product = Instance(reference, "P-1", source=1)
+
+    store_path = Path(tmp_path, "properties.sqlite")
+    cache = PropertyCache(
+        names=NAMES,
+        store=PropertyStore(path=store_path, document="Assembly", names=NAMES),
+    )
+    cache.get(product)
+    cache.flush()
+    assert cache.stored == 0
+
+    cache = PropertyCache(
+        names=NAMES,
+        store=PropertyStore(path=store_path, document="Assembly", names=NAMES),
+    )
+    assert cache.get(product).properties == {"pytia.group": "Frame"}
+    assert cache.stored == 1
+    assert reference.user_ref_properties.sweeps == 1
+
+    # Unsaved changes: The store is bypassed.
+    reference.com_object.Parent.Saved = False
+    cache.clear()
+    cache.get(product)
+    assert reference.user_ref_properties.sweeps == 2
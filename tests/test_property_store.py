@@ -0,0 +1,75 @@
+"""
+    Test the on-disk property cache.
+"""
+
+import sqlite3
+import time
+from pathlib import Path
+
+from pytia_reorder_tree.handler.property_store import PropertyStore
+
+DOCUMENT = "C:\\Projects\\Assembly.CATProduct"
+NAMES = ("pytia.group", "pytia.group_identifier")
+
+
+def test_property_store(tmp_path: Path):
+    path = Path(tmp_path, "properties.sqlite")
+    store = PropertyStore(path=path, document=DOCUMENT, names=NAMES)
+    assert store.error is None
+    assert store.get("P-1", "a|1") is None
+    store.put("P-1", "a|1", source=1, properties={"pytia.group": "Frame"})
+    store.flush()
+
+    store = PropertyStore(path=path, document=DOCUMENT, names=NAMES)
+    assert len(store) == 1
+    assert store.get("P-1", "a|1") == (1, {"pytia.group": "Frame"})
+    # The reference product has changed.
+    assert store.get("P-1", "a|2") is None
+    assert (store.hits, store.misses) == (1, 1)
+
+    # Other documents and other property names have their own entries.
+    assert not PropertyStore(path=path, document="C:\\Other.CATProduct", names=NAMES)
+    assert not PropertyStore(path=path, document=DOCUMENT, names=NAMES[:1])
+
+
+def test_property_store_eviction(tmp_path: Path):
+    path = Path(tmp_path, "properties.sqlite")
+    store = PropertyStore(path=path, document=DOCUMENT, names=NAMES)
+    store.put("P-1", "a|1", source=1, properties={})
+    store.put("P-2", "b|1", source=2, properties={})
+    store.flush()
+
+    with sqlite3.connect(path) as connection:
+        connection.execute(
+            "UPDATE properties SET used = ? WHERE part_number = 'P-1'",
+            (time.time() - 3600,),
+        )
+    connection.close()
+
+    assert len(PropertyStore(path=path, document=DOCUMENT, names=NAMES)) == 2
+    store = PropertyStore(path=path, document=DOCUMENT, names=NAMES, max_age=60)
+    assert len(store) == 1
+    assert store.get("P-2", "b|1") == (2, {})
+
+
+def test_property_store_broken(tmp_path: Path):
+    path = Path(tmp_path, "properties.sqlite")
+    path.write_bytes(b"no database")
+
+    store = PropertyStore(path=path, document=DOCUMENT, names=NAMES)
+    assert store.error is not None
+    store.put("P-1", "a|1", source=1, properties={})
+    store.flush()
+
+
+def test_property_store_unavailable_folder(tmp_path: Path):
+    # The folder of the database can't be created, e.g. on a read-only share.
+    blocker = Path(tmp_path, "blocker")
+    blocker.write_bytes(b"")
+    path = Path(blocker, "cache", "properties.sqlite")
+
+    store = PropertyStore(path=path, document=DOCUMENT, names=NAMES)
+    assert store.error is not None
+    assert not store
+    store.put("P-1", "a|1", source=1, properties={})
+    store.flush()
@@ -0,0 +1,250 @@
+"""
+    Test the reorder algorithm with the simulated list box.
+"""
+
+import random
+from time import perf_counter
+
+import pytest
+
+from pytia_reorder_tree.algorithm import reorder as reorder_module
+from pytia_reorder_tree.algorithm.cost_model import window_cost
+from pytia_reorder_tree.algorithm.reorder import OutOfSyncError
+from pytia_reorder_tree.algorithm.reorder import Reorder
+from pytia_reorder_tree.handler.move_backend.simulated_backend import SimulatedBackend
+
+
+def test_simulated_backend():
+    backend = SimulatedBackend(["a", "b", "c", "d", "e"])
+
+    backend.select(1, 2)
+    backend.move_down()
+    backend.move_down()
+    assert backend.items == ["a", "d", "e", "b", "c"]
+    assert backend.selected == [3, 4]
+
+    # The selection stays at the border of the list box.
+    backend.move_down()
+    assert backend.items == ["a", "d", "e", "b", "c"]
+
+    backend.select(0)
+    backend.move_up()
+    assert backend.items == ["a", "d", "e", "b", "c"]
+    assert backend.clicks == 4
+
+    with pytest.raises(ValueError):
+        SimulatedBackend(["a", "b"], multi_selection=False).select(0, 2)
+
+
+@pytest.mark.parametrize("multi_selection", [True, False])
+def test_reorder(multi_selection: bool):
+    rng = random.Random(9)
+    target = [f"Part.{i}" for i in range(200)]
+    items = rng.sample(target, len(target))
+    backend = SimulatedBackend(items, multi_selection=multi_selection)
+
+    reorder = Reorder(backend=backend, items=items, target=target, verify_interval=7)
+    reorder.run()
+
+    assert backend.items == target
+    assert reorder.block_moves == multi_selection
+    assert backend.clicks == reorder.clicks == reorder.plan.clicks
+    assert reorder.moves == len(reorder.plan.moves)
+
+
+def test_reorder_block_fallback():
+    # Runs of rows that stay together, the window only moves the first selected row.
+    target = [f"Part.{i}" for i in range(30)]
+    items = target[20:] + target[10:20] + target[:10]
+    backend = SimulatedBackend(items, block_moves=False)
+
+    reorder = Reorder(backend=backend, items=items, target=target)
+    assert reorder.block_moves
+    reorder.run()
+
+    assert backend.items == target
+    assert not reorder.block_moves
+
+
+def test_reorder_out_of_sync():
+    target = ["a", "b", "c", "d"]
+    items = ["d", "c", "b", "a"]
+
+    class LosingBackend(SimulatedBackend):
+        """Loses every click after the first one."""
+
+        def move_up(self) -> None:
+            if self.clicks:
+                self.clicks += 1
+            else:
+                super().move_up()
+
+        def move_down(self) -> None:
+            if self.clicks:
+                self.clicks += 1
+            else:
+                super().move_down()
+
+    backend = LosingBackend(items, multi_selection=False)
+    reorder = Reorder(backend=backend, items=items, target=target)
+    with pytest.raises(OutOfSyncError):
+        reorder.run()
+    assert reorder.repairs == 3
+    assert backend.out_of_syncs == 4
+
+
+@pytest.mark.parametrize("verify_interval", [0, 5])
+def test_reorder_repair(verify_interval: int):
+    rng = random.Random(11)
+    target = [f"Part.{i}" for i in range(50)]
+    items = rng.sample(target, len(target))
+
+    class MissingBackend(SimulatedBackend):
+        """Misses the 10th and the 30th click."""
+
+        def move_up(self) -> None:
+            if self.clicks in (9, 29):
+                self.clicks += 1
+            else:
+                super().move_up()
+
+        def move_down(self) -> None:
+            if self.clicks in (9, 29):
+                self.clicks += 1
+            else:
+                super().move_down()
+
+    backend = MissingBackend(items, multi_selection=False)
+    reorder = Reorder(
+        backend=backend, items=items, target=target, verify_interval=verify_interval
+    )
+    reorder.run()
+
+    assert backend.items == target
+    assert 1 <= reorder.repairs <= 2
+    assert backend.out_of_syncs == reorder.repairs
+
+
+def test_reorder_checkpoints():
+    rng = random.Random(5)
+    target = [f"Part.{i}" for i in range(100)]
+    items = rng.sample(target, len(target))
+    backend = SimulatedBackend(items, multi_selection=False)
+    checkpoints = []
+
+    def _checkpoint(rows):
+        backend.apply()
+        checkpoints.append(rows)
+
+    reorder = Reorder(
+        backend=backend,
+        items=items,
+        target=target,
+        verify_interval=0,
+        checkpoint_interval=10,
+        on_checkpoint=_checkpoint,
+    )
+    reorder.run()
+
+    assert backend.items == target
+    assert len(checkpoints) == (reorder.moves - 1) // 10
+    assert backend.applied == checkpoints[-1]
+
+    # A new run from the applied order needs only the remaining moves.
+    resumed = Reorder(
+        backend=SimulatedBackend(backend.applied), items=backend.applied, target=target
+    )
+    assert len(resumed.plan.moves) < len(reorder.plan.moves)
+
+
+def test_reorder_sections_first():
+    rng = random.Random(3)
+    target = [f"Part.{i}" for i in range(60)]
+    sections = [i // 20 for i in range(60)]
+    section = dict(zip(target, sections))
+    items = rng.sample(target, len(target))
+
+    class RecordingBackend(SimulatedBackend):
+        """Records the sections of the rows after every click."""
+
+        def __init__(self, *args, **kwargs) -> None:
+            super().__init__(*args, **kwargs)
+            self.history = []
+
+        def move_up(self) -> None:
+            super().move_up()
+            self.history.append([section[item] for item in self.items])
+
+        def move_down(self) -> None:
+            super().move_down()
+            self.history.append([section[item] for item in self.items])
+
+    backend = RecordingBackend(items, multi_selection=False)
+    reorder = Reorder(backend=backend, items=items, target=target, sections=sections)
+    reorder.run()
+
+    assert backend.items == target
+    # Once the rows are in section order, they stay in section order.
+    first = next(i for i, rows in enumerate(backend.history) if rows == sections)
+    assert all(rows == sections for rows in backend.history[first:])
+    assert first < len(backend.history) - 1
+
+
+def test_reorder_deadline():
+    rng = random.Random(7)
+    target = [f"Part.{i}" for i in range(50)]
+    items = rng.sample(target, len(target))
+    backend = SimulatedBackend(items)
+
+    reorder = Reorder(backend=backend, items=items, target=target)
+    reorder.run(deadline=perf_counter())
+
+    assert not reorder.finished
+    assert reorder.remaining == len(reorder.plan.moves)
+    assert backend.items == items
+
+    reorder = Reorder(backend=backend, items=items, target=target)
+    reorder.run(deadline=perf_counter() + 60)
+    assert reorder.finished
+    assert backend.items == target
+
+
+def test_reorder_uses_estimate(monkeypatch: pytest.MonkeyPatch):
+    rng = random.Random(5)
+    target = [f"Part.{i}" for i in range(100)]
+    items = rng.sample(target, len(target))
+    order = [target.index(item) for item in items]
+    estimate = window_cost(order).plan
+    assert estimate is not None and estimate.blocks
+
+    planned = []
+    planner = reorder_module.plan_block_moves
+    monkeypatch.setattr(
+        reorder_module,
+        "plan_block_moves",
+        lambda order: planned.append(order) or planner(order),
+    )
+
+    backend = SimulatedBackend(items)
+    reorder = Reorder(
+        backend=backend, items=items, target=target, estimate=(order, estimate)
+    )
+    assert reorder.plan.moves == estimate.moves
+    assert planned == []
+    reorder.run()
+    assert backend.items == target
+
+    # The estimate of another order is planned again.
+    items = rng.sample(target, len(target))
+    Reorder(
+        backend=SimulatedBackend(items),
+        items=items,
+        target=target,
+        estimate=(order, estimate),
+    )
+    assert len(planned) == 1
+
+
+def test_reorder_invalid_target():
+    with pytest.raises(ValueError):
+        Reorder(backend=SimulatedBackend(["a", "b"]), items=["a", "b"], target=["a"])
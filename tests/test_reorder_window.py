@@ -0,0 +1,61 @@
+"""
+    Test closing the reorder window, against stand-in controls.
+"""
+
+from typing import List
+from typing import Tuple
+
+import pytest
+
+from pytia_reorder_tree.handler.window_handler import reorder_window
+from pytia_reorder_tree.handler.window_handler.reorder_window import ReorderWindow
+
+
+class Button:
+    """Stand-in for a button of the reorder window, records the clicks."""
+
+    def __init__(self, name: str, clicks: List[str]) -> None:
+        self._name = name
+        self._clicks = clicks
+
+    def click(self) -> None:
+        self._clicks.append(self._name)
+
+
+class Window:
+    """Stand-in for the connected reorder window."""
+
+    handle = 42
+
+
+def _window(
+    monkeypatch: pytest.MonkeyPatch, open_: bool
+) -> Tuple[ReorderWindow, List[str]]:
+    monkeypatch.setattr(
+        reorder_window.handleprops, "iswindow", lambda handle: open_ and handle == 42
+    )
+    window = object.__new__(ReorderWindow)
+    clicks: List[str] = []
+    window._window = Window()
+    window._btn_ok = Button("ok", clicks)  # type: ignore
+    window._btn_apply = Button("apply", clicks)  # type: ignore
+    window._btn_abort = Button("abort", clicks)  # type: ignore
+    return window, clicks
+
+
+def test_close_window(monkeypatch: pytest.MonkeyPatch):
+    window, clicks = _window(monkeypatch, open_=True)
+
+    assert window.exists
+    assert window.close(apply=True)
+    assert clicks == ["apply", "ok"]
+
+
+def test_close_window_already_closed(monkeypatch: pytest.MonkeyPatch):
+    # The user has closed the window, e.g. with the escape key.
+    window, clicks = _window(monkeypatch, open_=False)
+
+    assert not window.exists
+    assert not window.close(apply=True)
+    assert not window.close(apply=False)
+    assert clicks == []
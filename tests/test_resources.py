@@ -5,6 +5,7 @@
 import os
 from pathlib import Path
 
+import pytest
 import validators
 
 
@@ -37,12 +38,56 @@ def test_settings():
     assert isinstance(resource.settings.tree.group_postfix, str)
     assert isinstance(resource.settings.tree.IN_delimiter, str)
     assert isinstance(resource.settings.tree.IN_position, int)
+    if resource.settings.tree.node_label is not None:
+        assert "#IN#" in resource.settings.tree.node_label
+    assert isinstance(resource.settings.tree.verify_interval, int)
+    assert resource.settings.tree.collation in (
+        "plain",
+        "natural",
+        "locale",
+        "natural_locale",
+    )
+    assert resource.settings.tree.verify_interval >= 0
+    assert isinstance(resource.settings.tree.block_moves, bool)
+    assert resource.settings.tree.repair_attempts >= 0
+    assert (
+        resource.settings.tree.time_budget_seconds is None
+        or resource.settings.tree.time_budget_seconds > 0
+    )
+    assert resource.settings.tree.journal_interval >= 0
+    assert resource.settings.tree.on_cancel in ("abort", "apply")
+    assert resource.settings.tree.engine in ("auto", "window", "api")
+    assert resource.settings.tree.move_backend in ("pywinauto", "message")
+    assert isinstance(resource.settings.tree.calibrate_timings, bool)
+    assert isinstance(resource.settings.tree.property_cache, bool)
+    assert resource.settings.tree.reader_threads >= 1
+    assert isinstance(resource.settings.tree.prefetch, bool)
 
     if resource.settings.urls.help:
         assert validators.url(resource.settings.urls.help)  # type: ignore
     assert validators.email(resource.settings.mails.admin)  # type: ignore
 
 
+def test_invalid_settings():
+    from pytia_reorder_tree.resources import SettingsSortKey
+    from pytia_reorder_tree.resources import SettingsTree
+
+    tree = dict(
+        create_groups=True,
+        group_prefix="--- ",
+        group_postfix="",
+        IN_delimiter=".",
+        IN_position=1,
+        renumber=True,
+        start_index=1,
+    )
+    for name in ("engine", "on_cancel", "move_backend", "collation"):
+        with pytest.raises(ValueError, match=f"tree.{name}"):
+            SettingsTree(**tree, **{name: "unknown"})  # type: ignore
+    with pytest.raises(ValueError, match="tree.sort_keys.field"):
+        SettingsSortKey(field="unknown")  # type: ignore
+
+
 def test_properties():
     from pytia_reorder_tree.resources import resource
 
@@ -0,0 +1,90 @@
+"""
+    Test the compiled sort keys.
+"""
+
+import pytest
+
+from pytia_reorder_tree.algorithm.sort_keys import DEFAULT_SORT_KEYS
+from pytia_reorder_tree.algorithm.sort_keys import SortKey
+from pytia_reorder_tree.algorithm.sort_keys import SortKeyColumn
+
+ALIASES = {"group": "pytia.group", "filter": "pytia.manufacturer"}
+
+
+def test_default_sort_keys():
+    sort_key = SortKey(DEFAULT_SORT_KEYS, aliases=ALIASES)
+
+    assert sort_key.properties == {
+        "pytia.group",
+        "pytia.manufacturer",
+        "pytia.group_identifier",
+    }
+    assert sort_key.needs_source
+
+    # Source, group, group identifier, filter, part number and instance name.
+    assert sort_key.key(
+        source=2,
+        part_number="B-1",
+        name="B-1.1",
+        properties={"pytia.group": "G", "pytia.manufacturer": "ACME"},
+    ) == (2, 1, "G", 2, "", "ACME", "B-1", "B-1.1")
+    assert sort_key.key(
+        source=1,
+        part_number="M-1",
+        name="M-1.1",
+        properties={"pytia.manufacturer": "ACME"},
+    ) == (1, 2, "", 2, "", "", "M-1", "M-1.1")
+
+
+def test_sections():
+    sort_key = SortKey(DEFAULT_SORT_KEYS, aliases=ALIASES)
+    assert sort_key.has_sections
+
+    properties = {"pytia.group": "A", "pytia.manufacturer": "Bosch"}
+    assert sort_key.section(2, "P-1", "Part.1", properties) == (2, 1, "A", 2, "")
+    # Part number and name don't change the section.
+    assert sort_key.section(2, "P-1", "Part.1", properties) == sort_key.section(
+        2, "P-2", "Part.7", properties
+    )
+
+    plain = SortKey([SortKeyColumn(field="part_number")])
+    assert not plain.has_sections
+    assert plain.section(1, "P-1", "Part.1") == ()
+
+
+def test_simple_sort_keys_need_no_properties():
+    sort_key = SortKey([SortKeyColumn(field="part_number")])
+
+    assert sort_key.properties == frozenset()
+    assert not sort_key.needs_source
+    assert sort_key.key(source=0, part_number="A", name="A.1") == ("A",)
+
+
+def test_descending_and_missing():
+    sort_key = SortKey(
+        [
+            SortKeyColumn(field="property", property="group", missing="first"),
+            SortKeyColumn(field="part_number", descending=True),
+        ],
+        aliases=ALIASES,
+    )
+    nodes = [
+        ("A", {"pytia.group": "G"}),
+        ("B", {"pytia.group": "G"}),
+        ("C", {}),
+    ]
+    ordered = sorted(
+        nodes,
+        key=lambda n: sort_key.key(
+            source=1, part_number=n[0], name="", properties=n[1]
+        ),
+    )
+
+    assert [n[0] for n in ordered] == ["C", "B", "A"]
+
+
+def test_invalid_sort_keys():
+    with pytest.raises(ValueError):
+        SortKey([SortKeyColumn(field="unknown")])  # type: ignore
+    with pytest.raises(ValueError):
+        SortKey([SortKeyColumn(field="property")])